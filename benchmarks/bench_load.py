@@ -0,0 +1,29 @@
+"""
+Cold and warm listing benchmarks.
+
+Cold rounds drop every cached table first, so they measure reading the
+data files (JSON or compiled artifact) plus building the listing. Warm
+rounds measure the listing alone.
+"""
+
+import pytest
+
+from country_state_city import City, Country, State
+
+LISTINGS = {
+    'get_countries': Country.get_countries,
+    'get_states': State.get_states,
+    'get_cities': City.get_cities,
+}
+
+
+@pytest.mark.parametrize('method', list(LISTINGS))
+def bench_cold_listing(benchmark, registry, method):
+    benchmark.group = f'cold {method}'
+    benchmark.pedantic(LISTINGS[method], setup=registry.clear, rounds=5, warmup_rounds=0)
+
+
+@pytest.mark.parametrize('method', list(LISTINGS))
+def bench_warm_listing(benchmark, warm, method):
+    benchmark.group = 'warm listings'
+    benchmark(LISTINGS[method])
@@ -0,0 +1,48 @@
+"""
+Lookup and search benchmarks on a warm registry.
+
+Cold variants clear the registry before each round, so the first lookup
+includes loading the table it needs.
+"""
+
+import pytest
+
+from country_state_city import City, State, match, search
+
+LOOKUPS = {
+    'get_state_by_code': (State.get_state_by_code, ('US', 'CA')),
+    'get_states_of_country': (State.get_states_of_country, ('US',)),
+    'get_cities_of_state': (City.get_cities_of_state, ('US', 'CA')),
+    'get_cities_of_country': (City.get_cities_of_country, ('US',)),
+}
+
+SEARCHES = {
+    'search': (search, ('san', 'city')),
+    'search_in_country': (search, ('san', 'city', 'US')),
+    'match': (match, ('Califronia', 'state', 'US')),
+    'state_nearest': (State.nearest, (37.77, -122.42)),
+    'city_nearest': (City.nearest, (37.77, -122.42, 5)),
+    'city_within_radius': (City.within_radius, (37.77, -122.42, 50.0)),
+}
+
+
+@pytest.mark.parametrize('method', list(LOOKUPS))
+def bench_warm_lookup(benchmark, warm, method):
+    benchmark.group = 'warm lookups'
+    function, args = LOOKUPS[method]
+    benchmark(function, *args)
+
+
+@pytest.mark.parametrize('method', list(LOOKUPS))
+def bench_cold_lookup(benchmark, registry, method):
+    benchmark.group = f'cold {method}'
+    function, args = LOOKUPS[method]
+    benchmark.pedantic(function, args, setup=registry.clear, rounds=5, warmup_rounds=0)
+
+
+@pytest.mark.parametrize('method', list(SEARCHES))
+def bench_search(benchmark, warm, method):
+    benchmark.group = 'search'
+    function, args = SEARCHES[method]
+    function(*args)  # Build the index outside the timed rounds
+    benchmark(function, *args)
@@ -0,0 +1,50 @@
+"""
+Memory benchmarks.
+
+Each table is loaded once under tracemalloc. The timing is recorded like
+any other benchmark, and the memory figures are stored in the benchmark's
+extra_info, so they end up in the --benchmark-json output:
+
+    peak_bytes          high-water mark of Python allocations during the load
+    retained_bytes      allocations still held once the load returns
+    records             number of records in the table
+    bytes_per_record    retained_bytes / records
+    record_size         sys.getsizeof of a single record object
+    maxrss_bytes        process high-water resident set size afterwards
+"""
+
+import resource
+import sys
+import tracemalloc
+
+import pytest
+
+TABLES = ('countries', 'states', 'cities')
+
+
+def _load(registry, name):
+    registry.clear()
+    tracemalloc.start()
+    try:
+        table = getattr(registry, name)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return table, retained, peak
+
+
+@pytest.mark.parametrize('name', TABLES)
+def bench_table_memory(benchmark, registry, name):
+    benchmark.group = f'memory {name}'
+    table, retained, peak = benchmark.pedantic(_load, (registry, name), rounds=1, iterations=1)
+    records = len(table.records)
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    benchmark.extra_info.update({
+        'peak_bytes': peak,
+        'retained_bytes': retained,
+        'records': records,
+        'bytes_per_record': retained / records if records else None,
+        'record_size': sys.getsizeof(table.records[0]) if records else None,
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        'maxrss_bytes': maxrss if sys.platform == 'darwin' else maxrss * 1024,
+    })
@@ -0,0 +1,79 @@
+"""
+Fixtures for the benchmark suite.
+
+Benchmarks run against the installed data files. When no city data is
+installed, a synthetic city dataset of about the upstream size is
+generated once per session (CITIES_PER_STATE cities for every state), so
+the city benchmarks remain comparable across commits.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from country_state_city import dataset, shards
+from country_state_city.binary import compile_dataset
+from country_state_city.dataset import Registry
+
+CITIES_PER_STATE = 30
+
+
+def _has_city_data(data_dir):
+    return (shards.has_shards(data_dir)
+            or os.path.exists(os.path.join(data_dir, 'city.json')))
+
+
+def _synthetic_cities(states):
+    cities = []
+    for state in states:
+        latitude = float(state.get('latitude') or 0)
+        longitude = float(state.get('longitude') or 0)
+        for i in range(CITIES_PER_STATE):
+            cities.append({
+                'name': f"{state['name']} {i}",
+                'countryCode': state['countryCode'],
+                'stateCode': state['isoCode'],
+                'latitude': f'{latitude + (i % 7 - 3) * 0.1:.8f}',
+                'longitude': f'{longitude + (i // 7 - 2) * 0.1:.8f}',
+            })
+    return cities
+
+
+@pytest.fixture(scope='session')
+def data_dir():
+    """Directory with country, state and city data and a compiled artifact."""
+    directory = tempfile.mkdtemp()
+    for name in ('country.json', 'state.json', 'city.json', shards.SHARD_DIR):
+        source = os.path.join(dataset.DATA_DIR, name)
+        if os.path.isdir(source):
+            shutil.copytree(source, os.path.join(directory, name))
+        elif os.path.exists(source):
+            shutil.copy(source, directory)
+    if not _has_city_data(directory):
+        with open(os.path.join(directory, 'state.json'), encoding='utf-8') as f:
+            shards.write_shards(_synthetic_cities(json.load(f)), directory)
+    compile_dataset(directory)
+    yield directory
+    shutil.rmtree(directory)
+
+
+@pytest.fixture(params=['json', 'artifact'])
+def registry(request, data_dir, monkeypatch):
+    """A private registry reading JSON or the compiled artifact."""
+    registry = Registry(data_dir, use_artifact=request.param == 'artifact')
+    monkeypatch.setattr(dataset, '_registry', registry)
+    return registry
+
+
+@pytest.fixture
+def warm(data_dir, monkeypatch):
+    """A private registry with every table loaded from the artifact."""
+    registry = Registry(data_dir)
+    monkeypatch.setattr(dataset, '_registry', registry)
+    registry.countries
+    registry.states
+    registry.cities
+    return registry
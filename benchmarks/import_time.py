@@ -0,0 +1,140 @@
+"""
+Import-time and time-to-first-lookup benchmark.
+
+Each measurement runs in a fresh interpreter so that nothing is cached:
+`python -X importtime` reports the cost of `import country_state_city`
+and of every submodule it pulls in, and a timed script measures the
+first lookup through each of Country, State and City. Results are medians
+over several runs, printed as JSON.
+
+Usage:
+    python benchmarks/import_time.py [--runs N] [--output PATH]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = 'country_state_city'
+
+FIRST_LOOKUPS = {
+    'Country': "Country.get_country_by_code('US')",
+    'State': "State.get_states_of_country('US')",
+    'City': "City.get_cities_of_state('US', 'CA')",
+}
+
+_TIMED = """
+import time
+start = time.perf_counter()
+from country_state_city import {cls}
+imported = time.perf_counter()
+{call}
+done = time.perf_counter()
+print(imported - start, done - imported)
+"""
+
+
+def _run(args):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [os.path.join(ROOT, 'src'), env.get('PYTHONPATH')]))
+    return subprocess.run([sys.executable] + args, env=env, capture_output=True,
+                          text=True, check=True)
+
+
+def import_time():
+    """
+    Measure `import country_state_city` with -X importtime.
+
+    Returns:
+        dict: "total_us" for the package and "modules" mapping every
+            imported package module to its self time in microseconds
+    """
+    stderr = _run(['-X', 'importtime', '-c', f'import {PACKAGE}']).stderr
+    modules = {}
+    total = None
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        fields = [field.strip() for field in line[len('import time:'):].split('|')]
+        if not fields[0].isdigit():
+            continue
+        name = fields[2]
+        if name.split('.')[0] == PACKAGE:
+            modules[name] = int(fields[0])
+        if name == PACKAGE:
+            total = int(fields[1])
+    return {'total_us': total, 'modules': modules}
+
+
+def first_lookup(cls):
+    """
+    Measure importing one class and its first lookup in a fresh process.
+
+    Returns:
+        dict: "import_s" and "lookup_s", or "error" if the lookup failed
+            (e.g., city data is not installed)
+    """
+    try:
+        stdout = _run(['-c', _TIMED.format(cls=cls, call=FIRST_LOOKUPS[cls])]).stdout
+    except subprocess.CalledProcessError as e:
+        return {'error': e.stderr.strip().splitlines()[-1]}
+    imported, lookup = map(float, stdout.split())
+    return {'import_s': imported, 'lookup_s': lookup}
+
+
+def _median(samples, key):
+    values = [sample[key] for sample in samples if sample.get(key) is not None]
+    return statistics.median(values) if values else None
+
+
+def run(runs=5):
+    """
+    Run every measurement several times.
+
+    Returns:
+        dict: Median results per measurement
+    """
+    imports = [import_time() for _ in range(runs)]
+    results = {
+        'python': sys.version.split()[0],
+        'runs': runs,
+        'import': {
+            'total_us': _median(imports, 'total_us'),
+            'modules': sorted(imports[-1]['modules']),
+        },
+        'first_lookup': {},
+    }
+    for cls in FIRST_LOOKUPS:
+        samples = [first_lookup(cls) for _ in range(runs)]
+        errors = [sample['error'] for sample in samples if 'error' in sample]
+        if errors:
+            results['first_lookup'][cls] = {'error': errors[0]}
+            continue
+        results['first_lookup'][cls] = {
+            'import_s': _median(samples, 'import_s'),
+            'lookup_s': _median(samples, 'lookup_s'),
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='runs per measurement')
+    parser.add_argument('--output', help='write the JSON results to this file')
+    args = parser.parse_args(argv)
+
+    content = json.dumps(run(args.runs), indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(content + '\n')
+    print(content)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,4 +1,18 @@
+import os
+import sys
+
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
+
+
+class BuildPyWithDataset(build_py):
+    """Compile the JSON data files into the binary dataset artifact."""
+    def run(self):
+        super().run()
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+        from country_state_city.binary import compile_dataset
+        compile_dataset(os.path.join(self.build_lib, "country_state_city", "data"))
+
 
 setup(
     name="country_state_city",
@@ -13,13 +27,21 @@ setup(
     packages=find_packages(where="src"),
     include_package_data=True,
     package_data={
-        "country_state_city": ["data/*.json"],
+        "country_state_city": ["data/*.json", "data/cities/*.jsonl", "data/indexes/*.json",
+                               "data/boundaries/*.geojson"],
+    },
+    cmdclass={"build_py": BuildPyWithDataset},
+    extras_require={
+        "numpy": ["numpy"],
+        "arrow": ["numpy", "pyarrow"],
+        "pandas": ["numpy", "pandas"],
+        "benchmark": ["pytest", "pytest-benchmark"],
     },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.7",
     test_suite="tests",
 )
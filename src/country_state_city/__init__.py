@@ -24,6 +24,51 @@ Example:
 
     # Get cities in a state
     cities = City.get_cities_of_state('US', 'CA')
+
+    # Autocomplete place names
+    matches = search('cal', kind='state', country_code='US')
+
+    # Match misspelled names
+    matches = match('Califronia', kind='state', country_code='US')
+
+    # Country and state containing a point
+    country, state, exact = locate(37.77, -122.42)
+
+    # Load everything before a pre-forking server starts its workers
+    preload()
 """
 
-from .models import Country, State, City, Timezone
\ No newline at end of file
+import importlib
+
+# Public names and the submodules defining them. Submodules are imported on
+# first attribute access, so importing the package loads no data and no
+# optional dependencies.
+_EXPORTS = {
+    'Country': 'models',
+    'State': 'models',
+    'City': 'models',
+    'Timezone': 'models',
+    'search': 'autocomplete',
+    'match': 'fuzzy',
+    'lookup_many': 'batch',
+    'locate': 'regions',
+    'locate_many': 'regions',
+    'preload': 'warmup',
+    'memory_usage': 'warmup',
+    'apply_delta': 'delta',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
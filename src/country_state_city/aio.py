@@ -0,0 +1,144 @@
+"""
+Asyncio facade over the Country, State and City static methods.
+
+The first call that needs a table loads it on a background thread, so the
+event loop is never blocked by parsing the data files. The by-name lookups
+also build their name index there. Concurrent callers waiting for the same
+table share one load, and once a table is loaded the calls are answered
+directly from memory.
+
+Example:
+    from country_state_city import aio
+
+    async def handler(request):
+        states = await aio.get_states_of_country('US')
+        ...
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .dataset import get_registry
+from .models import Country, State, City
+
+_lock = threading.Lock()
+_executor = None
+_pending = {}
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='country_state_city')
+    return _executor
+
+
+# Kind of record held by each table
+_KINDS = {'countries': 'country', 'states': 'state', 'cities': 'city'}
+
+
+def _table(registry, name):
+    if isinstance(name, tuple):
+        return registry.cities_of_country(name[1])
+    return getattr(registry, name)
+
+
+def _is_loaded(registry, name, names=False):
+    if isinstance(name, tuple):
+        # A single city shard is covered by the full city table
+        loaded = registry.is_loaded('cities') or registry.is_loaded(name)
+    else:
+        loaded = registry.is_loaded(name)
+    if not loaded or not names:
+        return loaded
+    return 'names' in _table(registry, name).indexes
+
+
+def _load_table(registry, name, names=False):
+    from .models import _NAME_KEYS, _names_index
+    table = _table(registry, name)
+    if names:
+        _names_index(table, _NAME_KEYS[_KINDS[name[0] if isinstance(name, tuple) else name]])
+
+
+async def load(name, names=False):
+    """
+    Load a table without blocking the event loop.
+
+    Concurrent awaiters of the same table share a single background load.
+
+    Args:
+        name (str): "countries", "states" or "cities", or
+            ("cities", country_code) for one country's cities
+        names (bool): Also build the name index used by the by-name lookups
+    """
+    registry = get_registry()
+    if _is_loaded(registry, name, names):
+        return
+    key = (id(registry), name, names)
+    with _lock:
+        future = _pending.get(key)
+        if future is None:
+            future = _get_executor().submit(_load_table, registry, name, names)
+            _pending[key] = future
+            future.add_done_callback(lambda _: _pending.pop(key, None))
+    await asyncio.wrap_future(future)
+
+
+async def preload():
+    """Load the country and state tables in the background."""
+    await asyncio.gather(load('countries'), load('states'))
+
+
+async def run(func, *args, **kwargs):
+    """
+    Run any synchronous library call on the background executor.
+
+    Useful for calls that build an index on first use, such as
+    City.nearest or match.
+
+    Returns:
+        The return value of func(*args, **kwargs)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+def _wrap(cls, name, table, names=False):
+    # Look the method up on every call so that wrappers installed later,
+    # such as the result cache or instrumentation, are not bypassed
+    @functools.wraps(getattr(cls, name))
+    async def wrapper(*args, **kwargs):
+        await load(table, names)
+        return getattr(cls, name)(*args, **kwargs)
+    return wrapper
+
+
+def _wrap_by_country(cls, name, names=False):
+    @functools.wraps(getattr(cls, name))
+    async def wrapper(country_code, *args, **kwargs):
+        if country_code:
+            await load(('cities', country_code), names)
+        return getattr(cls, name)(country_code, *args, **kwargs)
+    return wrapper
+
+
+get_countries = _wrap(Country, 'get_countries', 'countries')
+get_country_by_code = _wrap(Country, 'get_country_by_code', 'countries')
+get_country_by_name = _wrap(Country, 'get_country_by_name', 'countries', names=True)
+get_countries_by_codes = _wrap(Country, 'get_countries_by_codes', 'countries')
+
+get_states = _wrap(State, 'get_states', 'states')
+get_states_of_country = _wrap(State, 'get_states_of_country', 'states')
+get_state_by_code = _wrap(State, 'get_state_by_code', 'states')
+get_state_by_name = _wrap(State, 'get_state_by_name', 'states', names=True)
+get_states_by_codes = _wrap(State, 'get_states_by_codes', 'states')
+
+get_cities = _wrap(City, 'get_cities', 'cities')
+get_cities_of_state = _wrap_by_country(City, 'get_cities_of_state')
+get_cities_of_country = _wrap_by_country(City, 'get_cities_of_country')
+get_city_by_name = _wrap_by_country(City, 'get_city_by_name', names=True)
@@ -0,0 +1,122 @@
+"""
+Prefix search over country, state and city names.
+
+Names are normalized with normalize_name and kept in sorted arrays, so a
+prefix query is a binary search followed by a scan of the matching run.
+Indexes are built on first use for each table and bucket, and reused
+until the dataset is reloaded.
+
+Example:
+    from country_state_city import search
+
+    search('cal', kind='state', country_code='US')
+    # [<State: California (CA)>]
+"""
+
+from bisect import bisect_left
+
+from . import indexes
+from .dataset import KINDS, get_registry
+from .models import normalize_name
+
+
+class PrefixIndex:
+    """
+    Sorted array of normalized names for prefix queries.
+
+    Attributes:
+        keys (list): Normalized names in sorted order
+        records (list): Records aligned with keys
+    """
+    def __init__(self, records):
+        entries = sorted((normalize_name(record.name), i) for i, record in enumerate(records))
+        self.keys = [key for key, _ in entries]
+        self.records = [records[i] for _, i in entries]
+
+    @classmethod
+    def from_keys(cls, records, keys, order):
+        """
+        Rebuild an index from previously computed keys and their order.
+
+        Args:
+            records (list): The records the index was built from
+            keys (list): Normalized names in sorted order
+            order (list): Positions in records aligned with keys
+
+        Returns:
+            PrefixIndex: An index equal to the original, without sorting
+        """
+        index = cls.__new__(cls)
+        index.keys = list(keys)
+        index.records = [records[i] for i in order]
+        return index
+
+    def __len__(self):
+        return len(self.keys)
+
+    def search(self, prefix, limit=None):
+        """
+        Find records whose normalized name starts with a normalized prefix.
+
+        Args:
+            prefix (str): An already normalized prefix
+            limit (int): Maximum number of results, or None for all
+
+        Returns:
+            list: Matching records in order of their normalized names
+        """
+        keys = self.keys
+        start = bisect_left(keys, prefix)
+        stop = start
+        end = len(keys) if limit is None else min(len(keys), start + limit)
+        while stop < end and keys[stop].startswith(prefix):
+            stop += 1
+        return self.records[start:stop]
+
+
+def _prefix_index(kind, country_code=None):
+    registry = get_registry()
+    table, records = registry.records_of(kind, country_code)
+
+    def build():
+        if country_code:
+            index = indexes.prebuilt(registry.data_dir, kind, country_code, records)
+            if index is not None:
+                names = index['names']
+                return PrefixIndex.from_keys(records, names['keys'], names['order'])
+        return PrefixIndex(records)
+    return table.derived(('prefix', country_code or None), build)
+
+
+def search(prefix, kind=None, country_code=None, limit=10):
+    """
+    Search places by name prefix.
+
+    Matching ignores case and accents. Results are ordered by normalized
+    name, so shorter and alphabetically earlier names come first.
+
+    Args:
+        prefix (str): Beginning of the name (e.g., "cal")
+        kind (str): "country", "state" or "city". None searches countries,
+            then states, then cities if city data is installed.
+        country_code (str): Restrict states and cities to this country
+        limit (int): Maximum number of results, or None for all
+
+    Returns:
+        list: Matching Country, State or City objects
+    """
+    key = normalize_name(prefix)
+    if not key:
+        return []
+    if kind is None:
+        # Without installed city data, search countries and states only
+        kinds = KINDS if get_registry().has_city_data() else KINDS[:2]
+    else:
+        kinds = (kind,)
+    results = []
+    for each in kinds:
+        remaining = None if limit is None else limit - len(results)
+        if remaining is not None and remaining <= 0:
+            break
+        results.extend(_prefix_index(each, country_code).search(key, remaining))
+    return results
@@ -0,0 +1,86 @@
+"""
+Batch lookups for enriching many rows at once.
+
+Each call resolves the index once and then maps every key with a single
+dictionary lookup, so the per-row cost is one hash probe. Keys can be
+given as lists, tuples, iterators or NumPy arrays; results are aligned
+with the input.
+
+Example:
+    from country_state_city import lookup_many
+
+    lookup_many('country', ['US', 'XX', 'IN'])
+    # [<Country: United States (US)>, None, <Country: India (IN)>]
+
+    lookup_many('state', [('US', 'CA'), ('IN', 'MH')], return_index=True)
+    # [1379, 3965]
+"""
+
+from .dataset import KINDS, get_registry, row_positions
+from .models import City
+
+
+def _key(key):
+    # Rows of 2-D arrays and lists are not hashable
+    if isinstance(key, (str, tuple)):
+        return key
+    try:
+        hash(key)
+    except TypeError:
+        return tuple(key)
+    return key
+
+
+def _city_lookup(keys, missing):
+    get_city_by_name = City.get_city_by_name
+    results = []
+    for key in keys:
+        city = get_city_by_name(*_key(key))
+        results.append(missing if city is None else city)
+    return results
+
+
+def lookup_many(kind, keys, missing=None, return_index=False):
+    """
+    Look up many records in one pass.
+
+    Args:
+        kind (str): "country", "state" or "city"
+        keys (iterable): For countries, ISO codes. For states,
+            (country_code, state_code) pairs. For cities,
+            (country_code, name) or (country_code, name, state_code)
+            tuples matched by normalized name.
+        missing: Value returned for keys that are not found
+        return_index (bool): Return row positions in the table instead of
+            records, with -1 for missing keys. Not supported for cities.
+
+    Returns:
+        list: Results aligned with keys. A NumPy array of positions when
+            return_index is set and keys is a NumPy array.
+    """
+    registry = get_registry()
+    if kind == 'country':
+        table = registry.countries
+    elif kind == 'state':
+        table = registry.states
+    elif kind == 'city':
+        if return_index:
+            raise ValueError("return_index is not supported for cities")
+        return _city_lookup(keys, missing)
+    else:
+        raise ValueError(f"kind must be one of {', '.join(KINDS)}, not {kind!r}")
+
+    as_array = type(keys).__module__ == 'numpy'
+    if kind == 'state':
+        # Pairs may arrive as lists or array rows
+        keys = map(_key, keys)
+
+    if return_index:
+        get = row_positions(table).get
+        positions = [get(key, -1) for key in keys]
+        if as_array:
+            import numpy
+            return numpy.asarray(positions, dtype=numpy.intp)
+        return positions
+    get = table.by_code.get
+    return [get(key, missing) for key in keys]
@@ -0,0 +1,459 @@
+"""
+Compact binary form of the dataset.
+
+The JSON data files are compiled into a single artifact that can be opened
+with mmap and read without decoding. The artifact is columnar: every field
+of every table is stored as a packed array, strings are replaced by indexes
+into a shared string table and coordinates are stored as float64 (NaN when
+missing). Offset tables describe the name-sorted per-country and per-state
+buckets, so listings can be served without sorting, and "*_row" columns
+hold the row of each state's and city's parent records. The SHA-256 of
+the JSON sources is stored too, so a stale artifact can be recognized from
+its content alone.
+
+Layout (little-endian):
+    header      magic b"CSCD", version (u16), reserved (u16), section count (u32)
+    directory   one (name, offset, length) entry per section
+    sections    8-byte aligned packed arrays
+
+Example:
+    from country_state_city.binary import compile_dataset, BinaryDataset
+
+    compile_dataset('data', 'data/dataset.bin')
+    dataset = BinaryDataset('data/dataset.bin')
+    print(dataset.string(dataset.column('country.name')[0]))
+"""
+
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from . import shards
+
+MAGIC = b'CSCD'
+VERSION = 1
+ARTIFACT_NAME = 'dataset.bin'
+
+# Parent row of records whose parent is not in the dataset
+NO_ROW = 0xFFFFFFFF
+
+_HEADER = struct.Struct('<4sHHI')
+_ENTRY = struct.Struct('<24sQQ')
+_ALIGN = 8
+
+# Column type codes used by array/memoryview for each section
+_UINT = 'I'
+_INT = 'i'
+_FLOAT = 'd'
+
+_SECTION_TYPES = {
+    'strings': 'B',
+    'sources.sha256': 'B',
+}
+
+
+def _section_type(name):
+    if name in _SECTION_TYPES:
+        return _SECTION_TYPES[name]
+    field = name.split('.', 1)[1]
+    if field in ('latitude', 'longitude'):
+        return _FLOAT
+    if field == 'gmt_offset':
+        return _INT
+    return _UINT
+
+
+def _to_float(value):
+    if value is None or value == '':
+        return math.nan
+    return float(value)
+
+
+class _Writer:
+    """Collects strings and columns for an artifact."""
+    def __init__(self):
+        self.strings = {}
+        self.sections = {}
+
+    def sid(self, value):
+        value = value or ''
+        sid = self.strings.get(value)
+        if sid is None:
+            sid = self.strings[value] = len(self.strings)
+        return sid
+
+    def column(self, name, values):
+        self.sections[name] = array(_section_type(name), values)
+
+    def string_columns(self, table, records, fields):
+        for field, key in fields:
+            self.column(f'{table}.{field}', [self.sid(r.get(key)) for r in records])
+
+    def float_columns(self, table, records):
+        self.column(f'{table}.latitude', [_to_float(r.get('latitude')) for r in records])
+        self.column(f'{table}.longitude', [_to_float(r.get('longitude')) for r in records])
+
+    def buckets(self, prefix, records, keys):
+        """
+        Write a name-sorted permutation of records and the offset table of
+        its buckets. keys maps a record to a tuple of string key fields.
+        """
+        order = sorted(range(len(records)), key=lambda i: (keys(records[i]), records[i].get('name') or ''))
+        starts = []
+        bucket_keys = []
+        previous = None
+        for position, row in enumerate(order):
+            key = keys(records[row])
+            if key != previous:
+                starts.append(position)
+                bucket_keys.append(key)
+                previous = key
+        starts.append(len(order))
+        self.column(f'{prefix}.order', order)
+        self.column(f'{prefix}.start', starts)
+        for i in range(len(bucket_keys[0]) if bucket_keys else 0):
+            self.column(f'{prefix}.key{i}', [self.sid(k[i]) for k in bucket_keys])
+
+    def finish(self):
+        blob = bytearray()
+        offsets = array(_UINT, [0])
+        for value in self.strings:
+            blob += value.encode('utf-8')
+            offsets.append(len(blob))
+        self.sections['strings'] = array('B', blob)
+        self.sections['string.offsets'] = offsets
+
+    def write(self, path):
+        self.finish()
+        names = sorted(self.sections)
+        position = _HEADER.size + _ENTRY.size * len(names)
+        entries = []
+        payloads = []
+        for name in names:
+            data = self.sections[name]
+            if sys.byteorder != 'little':
+                data = array(data.typecode, data)
+                data.byteswap()
+            payload = data.tobytes()
+            position += -position % _ALIGN
+            entries.append(_ENTRY.pack(name.encode('ascii'), position, len(payload)))
+            payloads.append((position, payload))
+            position += len(payload)
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, len(names)))
+            for entry in entries:
+                f.write(entry)
+            for offset, payload in payloads:
+                f.write(b'\0' * (offset - f.tell()))
+                f.write(payload)
+        os.replace(tmp_path, path)
+
+
+def source_digest(data_dir):
+    """
+    Compute the SHA-256 of the JSON sources of an artifact.
+
+    Covers country.json, state.json, city.json and the city shards, by
+    name and content, so it does not depend on file times.
+
+    Args:
+        data_dir (str): Directory containing the data files
+
+    Returns:
+        bytes: The 32-byte digest
+    """
+    names = ['country.json', 'state.json', 'city.json']
+    names += [
+        f'{shards.SHARD_DIR}/{code}{shards.SHARD_SUFFIX}' for code in shards.shard_countries(data_dir)
+    ]
+    digest = hashlib.sha256()
+    for name in names:
+        try:
+            with open(os.path.join(data_dir, *name.split('/')), 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            continue
+        digest.update(f'{name}\0{len(content)}\0'.encode('utf-8'))
+        digest.update(content)
+    return digest.digest()
+
+
+def _read_source(data_dir, name):
+    path = os.path.join(data_dir, name)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compile_dataset(data_dir, output_path=None):
+    """
+    Compile the JSON data files in data_dir into a binary artifact.
+
+    Cities are read from the per-country shards, or from city.json when
+    the dataset is not sharded. The city table is left out if neither is
+    present.
+
+    Args:
+        data_dir (str): Directory containing country.json and state.json
+        output_path (str): Where to write the artifact. Defaults to
+            dataset.bin inside data_dir.
+
+    Returns:
+        str: The path of the written artifact
+    """
+    output_path = output_path or os.path.join(data_dir, ARTIFACT_NAME)
+    writer = _Writer()
+    writer.column('sources.sha256', source_digest(data_dir))
+
+    countries = _read_source(data_dir, 'country.json')
+    if countries is None:
+        raise FileNotFoundError(os.path.join(data_dir, 'country.json'))
+    writer.string_columns('country', countries, [
+        ('name', 'name'), ('iso2', 'isoCode'), ('phone_code', 'phoneCode'),
+        ('flag', 'flag'), ('currency', 'currency'),
+    ])
+    writer.float_columns('country', countries)
+
+    # Timezones are stored once and referenced from each country
+    zones = {}
+    tz_list = []
+    tz_start = []
+    for country in countries:
+        tz_start.append(len(tz_list))
+        for tz in country.get('timezones') or []:
+            key = json.dumps(tz, sort_keys=True)
+            tz_list.append(zones.setdefault(key, len(zones)))
+    tz_start.append(len(tz_list))
+    writer.column('country.tz_start', tz_start)
+    writer.column('country.tz_list', tz_list)
+    tz_records = [json.loads(key) for key in zones]
+    writer.string_columns('timezone', tz_records, [
+        ('name', 'zoneName'), ('gmt_offset_name', 'gmtOffsetName'),
+        ('abbreviation', 'abbreviation'), ('tz_name', 'tzName'),
+    ])
+    writer.column('timezone.gmt_offset', [tz.get('gmtOffset') or 0 for tz in tz_records])
+
+    # Parent rows are resolved here, so loading needs no code lookups
+    country_rows = {}
+    for row, country in enumerate(countries):
+        country_rows.setdefault(country.get('isoCode') or '', row)
+
+    states = _read_source(data_dir, 'state.json')
+    state_rows = {}
+    if states is not None:
+        writer.string_columns('state', states, [
+            ('name', 'name'), ('country_code', 'countryCode'), ('iso_code', 'isoCode'),
+        ])
+        writer.float_columns('state', states)
+        writer.buckets('state.country', states, lambda r: (r.get('countryCode') or '',))
+        writer.column('state.country_row', [
+            country_rows.get(state.get('countryCode') or '', NO_ROW) for state in states
+        ])
+        for row, state in enumerate(states):
+            state_rows.setdefault((state.get('countryCode') or '', state.get('isoCode') or ''), row)
+
+    if shards.has_shards(data_dir):
+        cities = list(shards.iter_records(data_dir))
+    else:
+        cities = _read_source(data_dir, 'city.json')
+    if cities is not None:
+        writer.string_columns('city', cities, [
+            ('name', 'name'), ('country_code', 'countryCode'), ('state_code', 'stateCode'),
+        ])
+        writer.float_columns('city', cities)
+        writer.buckets('city.country', cities, lambda r: (r.get('countryCode') or '',))
+        writer.buckets('city.state', cities, lambda r: (
+            r.get('countryCode') or '', r.get('stateCode') or ''))
+        writer.column('city.country_row', [
+            country_rows.get(city.get('countryCode') or '', NO_ROW) for city in cities
+        ])
+        writer.column('city.state_row', [
+            state_rows.get((city.get('countryCode') or '', city.get('stateCode') or ''), NO_ROW)
+            for city in cities
+        ])
+
+    writer.write(output_path)
+    return output_path
+
+
+class BinaryDataset:
+    """
+    Read-only view of a compiled artifact opened through mmap.
+
+    Columns are returned as typed memoryviews over the mapped file, so
+    opening the artifact decodes nothing and forked processes share the
+    same pages.
+
+    Attributes:
+        path (str): Path of the artifact
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        magic, version, _, count = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} dataset artifact")
+        self._sections = {}
+        for i in range(count):
+            name, offset, length = _ENTRY.unpack_from(self._buffer, _HEADER.size + i * _ENTRY.size)
+            self._sections[name.rstrip(b'\0').decode('ascii')] = (offset, length)
+        self._columns = {}
+        self._strings = self.column('strings')
+        self._string_offsets = self.column('string.offsets')
+        self._decoded = {}
+        self._buckets = {}
+
+    def rows(self, table):
+        """
+        Get the number of records in a table.
+
+        Args:
+            table (str): One of "country", "state" or "city"
+
+        Returns:
+            int: Record count, or 0 if the table is not present
+        """
+        if not self.has_table(table):
+            return 0
+        return len(self.column(f'{table}.name'))
+
+    def has_table(self, table):
+        """
+        Check whether a table was compiled into the artifact.
+
+        Args:
+            table (str): One of "country", "state" or "city"
+
+        Returns:
+            bool: True if the table is present
+        """
+        return f'{table}.name' in self._sections
+
+    def has_section(self, name):
+        """Check whether the artifact contains a section."""
+        return name in self._sections
+
+    def column(self, name):
+        """
+        Get a section as a typed memoryview.
+
+        Args:
+            name (str): Section name (e.g., "state.latitude")
+
+        Returns:
+            memoryview: Zero-copy view of the packed array
+        """
+        view = self._columns.get(name)
+        if view is None:
+            offset, length = self._sections[name]
+            view = self._buffer[offset:offset + length].cast(_section_type(name))
+            self._columns[name] = view
+        return view
+
+    def source_digest(self):
+        """
+        Get the SHA-256 of the sources the artifact was compiled from.
+
+        Returns:
+            bytes: The digest, or None for artifacts built without one
+        """
+        if not self.has_section('sources.sha256'):
+            return None
+        return self.column('sources.sha256').tobytes()
+
+    def string(self, sid):
+        """
+        Decode an entry of the string table.
+
+        Decoded strings are cached, so equal values share one str object.
+
+        Args:
+            sid (int): Index into the string table
+
+        Returns:
+            str: The decoded string
+        """
+        value = self._decoded.get(sid)
+        if value is None:
+            offsets = self._string_offsets
+            value = str(self._strings[offsets[sid]:offsets[sid + 1]], 'utf-8')
+            self._decoded[sid] = value
+        return value
+
+    def string_table(self):
+        """Decode the whole string table into a list indexed by string id."""
+        string = self.string
+        return [string(sid) for sid in range(len(self._string_offsets) - 1)]
+
+    def strings(self, name):
+        """Decode every entry of a string column into a list."""
+        string = self.string
+        return [string(sid) for sid in self.column(name)]
+
+    def floats(self, name):
+        """Read a coordinate column into a list, with None for missing values."""
+        return [None if value != value else value for value in self.column(name)]
+
+    def buckets(self, prefix):
+        """
+        Read an offset table written for name-sorted buckets.
+
+        Args:
+            prefix (str): Bucket prefix (e.g., "city.state")
+
+        Returns:
+            dict: Maps each bucket key to its (start, stop) range in the
+                "<prefix>.order" column. Keys are strings for single-field
+                buckets and tuples otherwise.
+        """
+        buckets = self._buckets.get(prefix)
+        if buckets is None:
+            buckets = self._buckets[prefix] = self._read_buckets(prefix)
+        return buckets
+
+    def _read_buckets(self, prefix):
+        starts = self.column(f'{prefix}.start')
+        key_columns = []
+        i = 0
+        while f'{prefix}.key{i}' in self._sections:
+            key_columns.append(self.strings(f'{prefix}.key{i}'))
+            i += 1
+        keys = key_columns[0] if len(key_columns) == 1 else list(zip(*key_columns))
+        return {key: (starts[i], starts[i + 1]) for i, key in enumerate(keys)}
+
+
+def open_artifact(data_dir):
+    """
+    Open the compiled artifact in data_dir if it is present and current.
+
+    The artifact is ignored unless the digest of the sources stored in it
+    matches the JSON files, so edits to the JSON data are never shadowed
+    by a stale build. File times are not compared, as installers such as
+    pip do not preserve them.
+
+    Args:
+        data_dir (str): Directory containing the data files
+
+    Returns:
+        BinaryDataset: The opened artifact, or None if the JSON files
+            should be used instead
+    """
+    if sys.byteorder != 'little':
+        return None
+    try:
+        artifact = BinaryDataset(os.path.join(data_dir, ARTIFACT_NAME))
+    except FileNotFoundError:
+        return None
+    if artifact.source_digest() != source_digest(data_dir):
+        return None
+    return artifact
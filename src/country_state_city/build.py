@@ -0,0 +1,224 @@
+"""
+Build step for derived data artifacts.
+
+Partitions the data files by country and, in a pool of worker processes,
+builds each country's city shard and its prebuilt name and spatial indexes
+(see indexes.py). The binary artifact read by the dataset registry is then
+compiled, and a manifest.json listing the SHA-256 of every source and
+output file is written next to the data. Outputs depend only on the
+inputs, so rebuilding unchanged data reproduces the same manifest.
+
+With --cities, a monolithic city.json is split into the per-country shards
+under data/cities. Otherwise the existing shards, or a city.json in the
+data directory, are indexed as they are.
+
+Usage:
+    python -m country_state_city.build [--data-dir DIR] [--output PATH]
+                                       [--cities CITY_JSON] [--jobs N]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from . import indexes, shards
+from .autocomplete import PrefixIndex
+from .binary import ARTIFACT_NAME, compile_dataset
+from .dataset import DATA_DIR, CityTable, StateTable
+from .models import City, State
+from .spatial import KDTree
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _relative(data_dir, path):
+    return os.path.relpath(path, data_dir).replace(os.sep, '/')
+
+
+def _read_source(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _partition(records):
+    by_country = {}
+    for record in records or ():
+        by_country.setdefault(record.get('countryCode') or '', []).append(record)
+    return by_country
+
+
+def build_index(records):
+    """
+    Build the prebuilt index of one country's states or cities.
+
+    Args:
+        records (list): The records in the order of Registry.records_of
+
+    Returns:
+        dict: The index, as stored in the country's index file
+    """
+    prefix = PrefixIndex(records)
+    positions = {id(record): i for i, record in enumerate(records)}
+    order, nodes = KDTree(records).to_nodes()
+    return {
+        'count': len(records),
+        'digest': indexes.records_digest(records),
+        'names': {
+            'keys': prefix.keys,
+            'order': [positions[id(record)] for record in prefix.records],
+        },
+        'kdtree': {'order': order, 'nodes': nodes},
+    }
+
+
+def _build_country(task):
+    """
+    Write one country's shard and serialize its index; runs in a worker.
+
+    Index files are written by the parent once every shard is in place.
+    """
+    data_dir, country_code, states, cities, write_shard = task
+    shard = shards.shard_path(data_dir, country_code)
+    if cities is None:
+        cities = list(shards.iter_shard(shard))
+    elif write_shard:
+        cities.sort(key=shards._shard_key)
+        shards.write_shard(cities, shard)
+
+    # Rebuild the buckets exactly as the registry does, so positions match
+    state_table = StateTable([State.from_dict(state) for state in states])
+    city_table = CityTable([City.from_dict(city) for city in cities])
+    index = {}
+    if states:
+        index['state'] = build_index(state_table.by_country[country_code])
+    if cities:
+        index['city'] = build_index(city_table.by_country[country_code])
+    files = {}
+    if cities and (write_shard or os.path.exists(shard)):
+        files[_relative(data_dir, shard)] = _sha256(shard)
+    return country_code, files, indexes.dump_index(index)
+
+
+def build(data_dir=DATA_DIR, output_path=None, cities_path=None, jobs=None):
+    """
+    Build shards, indexes, the binary artifact and the manifest.
+
+    Args:
+        data_dir (str): Directory containing the JSON data files
+        output_path (str): Artifact path. Defaults to dataset.bin inside
+            data_dir.
+        cities_path (str): A city.json to split into shards first
+        jobs (int): Number of worker processes. Defaults to the number of
+            CPUs; 1 builds in this process.
+
+    Returns:
+        dict: The manifest
+    """
+    states = _read_source(os.path.join(data_dir, 'state.json')) or []
+    states_by_country = _partition(states)
+
+    if cities_path:
+        cities_by_country = _partition(_read_source(cities_path))
+        shards.clear_shards(data_dir)
+        write_shard = True
+    elif shards.has_shards(data_dir):
+        cities_by_country = dict.fromkeys(shards.shard_countries(data_dir))
+        write_shard = False
+    else:
+        cities_by_country = _partition(_read_source(os.path.join(data_dir, 'city.json')))
+        write_shard = False
+
+    countries = sorted(
+        code for code in set(states_by_country) | set(cities_by_country)
+        if indexes.index_path(data_dir, code) is not None
+    )
+    # Cities of None are read from the existing shard by the worker
+    tasks = [
+        (data_dir, code, states_by_country.get(code, []), cities_by_country.get(code, []),
+         write_shard)
+        for code in countries
+    ]
+
+    directory = indexes.index_dir(data_dir)
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name[:-len(indexes.INDEX_SUFFIX)] not in countries:
+            os.remove(os.path.join(directory, name))
+
+    if jobs == 1:
+        results = list(map(_build_country, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_build_country, tasks))
+
+    files = {}
+    for country_code, shard_files, content in results:
+        files.update(shard_files)
+        path = indexes.index_path(data_dir, country_code)
+        indexes.write_index(path, content)
+        files[_relative(data_dir, path)] = hashlib.sha256(content).hexdigest()
+
+    output_path = compile_dataset(data_dir, output_path)
+    files[_relative(data_dir, output_path)] = _sha256(output_path)
+
+    sources = {}
+    for name in ('country.json', 'state.json', 'city.json'):
+        path = os.path.join(data_dir, name)
+        if os.path.exists(path):
+            sources[name] = _sha256(path)
+    if cities_path:
+        sources[os.path.basename(cities_path)] = _sha256(cities_path)
+
+    manifest = {'sources': sources, 'files': dict(sorted(files.items()))}
+    content = json.dumps(manifest, sort_keys=True).encode('utf-8')
+    manifest['digest'] = hashlib.sha256(content).hexdigest()
+    with open(os.path.join(data_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return manifest
+
+
+def main(argv=None):
+    """
+    Run the build from the command line.
+
+    Args:
+        argv (list): Command line arguments, defaults to sys.argv[1:]
+
+    Returns:
+        int: Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m country_state_city.build',
+        description='Build city shards, search indexes and the binary dataset artifact.',
+    )
+    parser.add_argument('--data-dir', default=DATA_DIR,
+                        help='directory containing the JSON data files')
+    parser.add_argument('--output',
+                        help=f'artifact path (default: DATA_DIR/{ARTIFACT_NAME})')
+    parser.add_argument('--cities', metavar='CITY_JSON',
+                        help='split this city.json into per-country shards first')
+    parser.add_argument('--jobs', type=int,
+                        help='number of worker processes (default: number of CPUs)')
+    args = parser.parse_args(argv)
+
+    manifest = build(args.data_dir, args.output, args.cities, args.jobs)
+    print(f"Built {len(manifest['files'])} files, digest {manifest['digest']}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
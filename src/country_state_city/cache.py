@@ -0,0 +1,197 @@
+"""
+Opt-in bounded cache of the per-country city tables.
+
+Without the cache, every city shard read to answer a country-scoped call
+(City.get_cities_of_country, City.get_cities_of_state, City.get_city_by_name,
+country-scoped search and nearest, ...) stays loaded in the registry for
+the life of the process. Deployments with skewed traffic and a memory cap
+can instead enable() an LRU cache that holds those tables, bounded by a
+number of countries and optionally by an estimated size in bytes, with an
+optional time to live. An evicted country's table, records and indexes
+are freed and read again from its shard when next needed. disable()
+returns the tables to the registry.
+
+The cache only applies to sharded city data. When cities come from the
+compiled artifact or a single city.json, the whole city table is loaded
+at once as before. Countries and states are always kept in memory, as
+lookups in them are already a single dictionary access.
+
+Example:
+    from country_state_city import cache
+
+    tables = cache.enable(max_entries=20, max_bytes=64 * 1024 * 1024)
+    City.get_cities_of_country('US')
+    tables.stats()
+    # {'hits': 0, 'misses': 1, 'evictions': 0, 'expirations': 0, ...}
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from . import dataset
+
+
+def _sizeof(value):
+    """Estimate the memory held by a value: the container and its items."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        size += sum(map(sys.getsizeof, value))
+    return size
+
+
+def _table_size(table):
+    """Estimate the memory held by a city table: records, names and buckets."""
+    size = _sizeof(table.records) + sum(sys.getsizeof(city.name) for city in table.records)
+    for buckets in (table.by_country, table.by_state):
+        size += sys.getsizeof(buckets) + sum(map(sys.getsizeof, buckets.values()))
+    return size
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with entry, byte and age limits.
+
+    Attributes:
+        max_entries (int): Largest number of entries, or None
+        max_bytes (int): Largest estimated total size in bytes, or None
+        ttl (float): Seconds an entry stays valid, or None
+    """
+    def __init__(self, max_entries=1024, max_bytes=None, ttl=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, size, expires)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Check for an unexpired entry without touching the statistics."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[2] is None or entry[2] > time.monotonic())
+
+    def get(self, key, default=None):
+        """Get a cached value and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size=None):
+        """
+        Cache a value, evicting the least recently used entries as needed.
+
+        Args:
+            key (hashable): The key
+            value: The value to cache
+            size (int): Estimated size of value in bytes. Defaults to the
+                size of the value and, for lists and tuples, its items.
+        """
+        if size is None:
+            size = _sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires)
+            self._bytes += size
+            while ((self.max_entries is not None and len(self._entries) > self.max_entries)
+                   or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        """Drop every entry. Statistics are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Get the cache statistics.
+
+        Returns:
+            dict: "hits", "misses", "evictions", "expirations", "entries"
+                and estimated "bytes"
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+
+_lock = threading.Lock()
+_cache = None
+
+
+def enable(max_entries=32, max_bytes=None, ttl=None):
+    """
+    Install the city table cache.
+
+    Per-country city tables already loaded by the registry are dropped, so
+    from here on only the tables in the cache stay in memory. Calling
+    enable() again while enabled returns the existing cache.
+
+    Args:
+        max_entries (int): Largest number of cached countries, or None
+        max_bytes (int): Largest estimated size of all cached tables in
+            bytes, or None. Indexes built over a table are not counted.
+        ttl (float): Seconds a table stays cached, or None to keep tables
+            until they are evicted
+
+    Returns:
+        ResultCache: The installed cache, for statistics
+    """
+    global _cache
+    with _lock:
+        if _cache is None:
+            _cache = ResultCache(max_entries, max_bytes, ttl)
+            dataset.set_shard_cache(_cache, _table_size)
+            dataset.get_registry().drop_shards()
+        return _cache
+
+
+def disable():
+    """Remove the cache and drop the tables it holds."""
+    global _cache
+    with _lock:
+        dataset.set_shard_cache(None)
+        _cache = None
+
+
+def get_cache():
+    """
+    Get the installed cache.
+
+    Returns:
+        ResultCache: The cache, or None when disabled
+    """
+    return _cache
@@ -0,0 +1,154 @@
+"""
+Columnar export of the country, state and city tables.
+
+Tables are returned as NumPy arrays, a pyarrow Table or a pandas
+DataFrame, with float64 coordinates (NaN or null when missing) and
+categorical code columns. When the compiled artifact is available and no
+delta has been applied, the columns are taken straight from its packed
+arrays and string table, so no model objects are created. NumPy is
+required; pyarrow and pandas are only needed for their formats.
+
+Example:
+    from country_state_city import State
+
+    columns = State.as_columns()
+    columns['latitude'].mean()
+
+    table = State.as_columns(format='arrow')
+"""
+
+from .dataset import KINDS, get_registry
+
+FORMATS = ('numpy', 'arrow', 'pandas')
+
+# (attribute, column type) per kind; "code" columns are categorical
+FIELDS = {
+    'country': (
+        ('name', 'text'), ('iso2', 'code'), ('phone_code', 'code'), ('flag', 'text'),
+        ('currency', 'code'), ('latitude', 'float'), ('longitude', 'float'),
+    ),
+    'state': (
+        ('name', 'text'), ('country_code', 'code'), ('iso_code', 'code'),
+        ('latitude', 'float'), ('longitude', 'float'),
+    ),
+    'city': (
+        ('name', 'text'), ('country_code', 'code'), ('state_code', 'code'),
+        ('latitude', 'float'), ('longitude', 'float'),
+    ),
+}
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("as_columns requires NumPy (pip install numpy)") from None
+    return numpy
+
+
+def _from_artifact(np, artifact, kind):
+    """Read (codes, categories) pairs and float arrays from the artifact."""
+    columns = {}
+    for field, column_type in FIELDS[kind]:
+        column = artifact.column(f'{kind}.{field}')
+        if column_type == 'float':
+            columns[field] = np.frombuffer(column, dtype='<f8').copy()
+            continue
+        # Only decode the strings this column uses
+        sids, codes = np.unique(np.frombuffer(column, dtype='<u4'), return_inverse=True)
+        categories = np.empty(len(sids), dtype=object)
+        categories[:] = [artifact.string(sid) for sid in sids.tolist()]
+        columns[field] = (codes.astype(np.int32), categories)
+    return columns
+
+
+def _from_records(np, records, kind):
+    """Build (codes, categories) pairs and float arrays from model objects."""
+    columns = {}
+    for field, column_type in FIELDS[kind]:
+        values = [getattr(record, field) for record in records]
+        if column_type == 'float':
+            columns[field] = np.array(
+                [np.nan if value is None else value for value in values], dtype=np.float64
+            )
+            continue
+        lookup = {}
+        codes = np.fromiter(
+            (lookup.setdefault(value or '', len(lookup)) for value in values),
+            dtype=np.int32, count=len(values),
+        )
+        categories = np.empty(len(lookup), dtype=object)
+        categories[:] = list(lookup)
+        columns[field] = (codes, categories)
+    return columns
+
+
+def as_columns(kind, format='numpy'):
+    """
+    Export a whole table as columns.
+
+    Args:
+        kind (str): "country", "state" or "city"
+        format (str): "numpy" for a dict of NumPy arrays, "arrow" for a
+            pyarrow Table or "pandas" for a pandas DataFrame
+
+    Returns:
+        The table in the requested format. NumPy columns hold text as
+        object arrays, codes as fixed-width unicode arrays and coordinates
+        as float64 with NaN for missing values. Arrow and pandas code
+        columns are dictionary-encoded / categorical.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"kind must be one of {', '.join(KINDS)}, not {kind!r}")
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}, not {format!r}")
+    np = _import_numpy()
+
+    registry = get_registry()
+    artifact = registry.artifact
+    # After apply_delta() the artifact no longer matches the loaded tables
+    if artifact is not None and artifact.has_table(kind) and not registry.deltas:
+        raw = _from_artifact(np, artifact, kind)
+    else:
+        _, records = registry.records_of(kind)
+        raw = _from_records(np, records, kind)
+
+    if format == 'numpy':
+        columns = {}
+        for field, column_type in FIELDS[kind]:
+            value = raw[field]
+            if column_type == 'float':
+                columns[field] = value
+            elif column_type == 'code':
+                columns[field] = value[1][value[0]].astype(str)
+            else:
+                columns[field] = value[1][value[0]]
+        return columns
+
+    if format == 'arrow':
+        import pyarrow
+        arrays = []
+        for field, column_type in FIELDS[kind]:
+            value = raw[field]
+            if column_type == 'float':
+                arrays.append(pyarrow.array(value, from_pandas=True))
+            elif column_type == 'code':
+                codes, categories = value
+                arrays.append(pyarrow.DictionaryArray.from_arrays(
+                    codes, pyarrow.array(categories, type=pyarrow.string())))
+            else:
+                arrays.append(pyarrow.array(value[1][value[0]], type=pyarrow.string()))
+        return pyarrow.table(arrays, names=[field for field, _ in FIELDS[kind]])
+
+    import pandas
+    data = {}
+    for field, column_type in FIELDS[kind]:
+        value = raw[field]
+        if column_type == 'float':
+            data[field] = value
+        elif column_type == 'code':
+            codes, categories = value
+            data[field] = pandas.Categorical.from_codes(codes, categories)
+        else:
+            data[field] = value[1][value[0]]
+    return pandas.DataFrame(data)
@@ -0,0 +1,585 @@
+"""
+Process-wide registry for the country, state and city datasets.
+
+Each data file is parsed at most once per process. The parsed records are
+kept in tables together with dictionary indexes, so the static methods on
+the model classes can answer lookups without re-reading or scanning the
+data. When a compiled artifact (see country_state_city.binary) is present
+next to the JSON files, tables are read from it through mmap instead.
+
+Example:
+    from country_state_city import dataset
+
+    # Drop everything that has been loaded so far
+    dataset.clear()
+
+    # Re-read the data files that were already loaded
+    dataset.reload()
+
+    # Update the loaded tables in place of a reload (see country_state_city.delta)
+    dataset.get_registry().apply_delta(delta.load_delta('changes.json'))
+"""
+
+import json
+import os
+import threading
+
+from . import shards
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+KINDS = ('country', 'state', 'city')
+
+# Optional file in the data directory holding {"version": "..."}
+VERSION_NAME = 'version.json'
+
+# Marks an artifact that has not been looked for yet
+_UNSET = object()
+
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _sorted_buckets(records, key):
+    """Group records by key into tuples sorted by name."""
+    buckets = {}
+    for record in records:
+        buckets.setdefault(key(record), []).append(record)
+    return {k: tuple(sorted(v, key=lambda x: x.name)) for k, v in buckets.items()}
+
+
+def _binary_buckets(artifact, prefix, records):
+    """Rebuild name-sorted buckets from an artifact offset table."""
+    order = artifact.column(f'{prefix}.order')
+    return {
+        key: tuple(records[row] for row in order[start:stop])
+        for key, (start, stop) in artifact.buckets(prefix).items()
+    }
+
+
+def _binary_parents(artifact, name, records, slot):
+    """Set the parent row foreign keys of records from an artifact column."""
+    from .binary import NO_ROW
+    if not artifact.has_section(name):
+        return
+    for record, row in zip(records, artifact.column(name)):
+        setattr(record, slot, -1 if row == NO_ROW else row)
+
+
+def _share_timezones(countries):
+    """Replace equal Timezone objects of different countries with one instance."""
+    zones = {}
+    for country in countries:
+        country.timezones = [
+            zones.setdefault(
+                (tz.name, tz.gmt_offset, tz.gmt_offset_name, tz.abbreviation, tz.tz_name), tz
+            )
+            for tz in country.timezones
+        ]
+
+
+class Table:
+    """
+    Base class for dataset tables.
+
+    Attributes:
+        indexes (dict): Derived indexes built on first use, keyed by name
+    """
+    def __init__(self):
+        self.indexes = {}
+
+    def derived(self, key, build):
+        """
+        Get a derived index cached on this table, building it on first use.
+
+        Concurrent first calls may both build the index; only one result is
+        kept.
+
+        Args:
+            key (hashable): Name of the index
+            build (callable): Builds the index when it is not cached yet
+
+        Returns:
+            object: The cached index
+        """
+        index = self.indexes.get(key)
+        if index is None:
+            index = self.indexes.setdefault(key, build())
+        return index
+
+
+def row_positions(table):
+    """
+    Map the keys of table.by_code to row positions in table.records.
+
+    Args:
+        table (Table): A country or state table
+
+    Returns:
+        dict: Row numbers keyed like table.by_code, built once per table
+    """
+    def build():
+        rows = {id(record): row for row, record in enumerate(table.records)}
+        return {key: rows[id(record)] for key, record in table.by_code.items()}
+    return table.derived('positions', build)
+
+
+class CountryTable(Table):
+    """
+    All countries in file order, indexed by ISO code.
+
+    Attributes:
+        records (list): Country objects in the order of the data file
+        by_code (dict): Country objects keyed by ISO 3166-1 alpha-2 code
+    """
+    def __init__(self, records):
+        super().__init__()
+        self.records = records
+        self.by_code = {}
+        for country in records:
+            self.by_code.setdefault(country.iso2, country)
+
+    @classmethod
+    def load(cls, data_dir, artifact=None):
+        """Parse country.json from data_dir, or read artifact, into a new table."""
+        from .models import Country, Timezone
+        if artifact is not None:
+            zones = [
+                Timezone(*fields) for fields in zip(
+                    artifact.strings('timezone.name'),
+                    artifact.column('timezone.gmt_offset'),
+                    artifact.strings('timezone.gmt_offset_name'),
+                    artifact.strings('timezone.abbreviation'),
+                    artifact.strings('timezone.tz_name'),
+                )
+            ]
+            tz_start = artifact.column('country.tz_start')
+            tz_list = artifact.column('country.tz_list')
+            records = []
+            for i, fields in enumerate(zip(
+                artifact.strings('country.name'),
+                artifact.strings('country.iso2'),
+                artifact.strings('country.phone_code'),
+                artifact.strings('country.flag'),
+                artifact.strings('country.currency'),
+                artifact.floats('country.latitude'),
+                artifact.floats('country.longitude'),
+            )):
+                timezones = [zones[tz] for tz in tz_list[tz_start[i]:tz_start[i + 1]]]
+                records.append(Country(*fields, timezones=timezones))
+            return cls(records)
+        data = _read_json(os.path.join(data_dir, 'country.json'))
+        records = [Country.from_dict(country) for country in data]
+        _share_timezones(records)
+        return cls(records)
+
+
+class StateTable(Table):
+    """
+    All states in file order, indexed by country and state code.
+
+    Attributes:
+        records (list): State objects in the order of the data file
+        by_code (dict): State objects keyed by (country_code, iso_code)
+        by_country (dict): Tuples of State objects keyed by country_code,
+            sorted by name
+    """
+    def __init__(self, records, by_country=None):
+        super().__init__()
+        self.records = records
+        self.by_code = {}
+        for state in records:
+            self.by_code.setdefault((state.country_code, state.iso_code), state)
+        if by_country is None:
+            by_country = _sorted_buckets(records, lambda s: s.country_code)
+        self.by_country = by_country
+
+    @classmethod
+    def load(cls, data_dir, artifact=None):
+        """Parse state.json from data_dir, or read artifact, into a new table."""
+        from .models import State
+        if artifact is not None and artifact.has_table('state'):
+            records = [State(*fields) for fields in zip(
+                artifact.strings('state.name'),
+                artifact.strings('state.country_code'),
+                artifact.strings('state.iso_code'),
+                artifact.floats('state.latitude'),
+                artifact.floats('state.longitude'),
+            )]
+            _binary_parents(artifact, 'state.country_row', records, '_country_row')
+            return cls(records, _binary_buckets(artifact, 'state.country', records))
+        data = _read_json(os.path.join(data_dir, 'state.json'))
+        return cls([State.from_dict(state) for state in data])
+
+
+class CityTable(Table):
+    """
+    All cities in file order, grouped by country and by state.
+
+    Attributes:
+        records (list): City objects in the order of the data file
+        by_country (dict): Tuples of City objects keyed by country_code,
+            sorted by name
+        by_state (dict): Tuples of City objects keyed by
+            (country_code, state_code), sorted by name
+    """
+    def __init__(self, records, by_country=None, by_state=None):
+        super().__init__()
+        self.records = records
+        if by_country is None:
+            by_country = _sorted_buckets(records, lambda c: c.country_code)
+        if by_state is None:
+            by_state = _sorted_buckets(records, lambda c: (c.country_code, c.state_code))
+        self.by_country = by_country
+        self.by_state = by_state
+
+    @classmethod
+    def load(cls, data_dir, artifact=None):
+        """
+        Read all cities into a new table.
+
+        Cities come from the artifact if it includes them, otherwise from
+        the per-country shards, otherwise from a single city.json.
+
+        Raises:
+            FileNotFoundError: If no city data is installed
+        """
+        from .models import City
+        if artifact is not None and artifact.has_table('city'):
+            records = [City(*fields) for fields in zip(
+                artifact.strings('city.name'),
+                artifact.strings('city.country_code'),
+                artifact.strings('city.state_code'),
+                artifact.floats('city.latitude'),
+                artifact.floats('city.longitude'),
+            )]
+            _binary_parents(artifact, 'city.country_row', records, '_country_row')
+            _binary_parents(artifact, 'city.state_row', records, '_state_row')
+            return cls(
+                records,
+                _binary_buckets(artifact, 'city.country', records),
+                _binary_buckets(artifact, 'city.state', records),
+            )
+        if shards.has_shards(data_dir):
+            return cls([City.from_dict(city) for city in shards.iter_records(data_dir)])
+        try:
+            data = _read_json(os.path.join(data_dir, 'city.json'))
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f'city data not installed in {data_dir}; run '
+                '`python -m country_state_city.build --cities CITY_JSON`'
+            ) from None
+        return cls([City.from_dict(city) for city in data])
+
+    @classmethod
+    def load_shard(cls, data_dir, country_code):
+        """Read the cities of one country from its shard into a new table."""
+        from .models import City
+        path = shards.shard_path(data_dir, country_code)
+        return cls([City.from_dict(city) for city in shards.iter_shard(path)])
+
+
+class Registry:
+    """
+    Lazily loads and caches the dataset tables.
+
+    Tables are loaded on first access and shared by every caller afterwards.
+    Loading is guarded by a lock so concurrent first calls parse each file
+    only once.
+
+    Attributes:
+        data_dir (str): Directory containing the JSON data files
+        use_artifact (bool): Whether to read the compiled artifact when one
+            is present in data_dir
+        generation (int): Incremented whenever cached tables are dropped or
+            replaced, so results derived from older tables can be discarded
+        deltas (list): Deltas applied since the registry was created, in
+            order; they are replayed on every table loaded afterwards
+    """
+    _tables = {
+        'countries': CountryTable,
+        'states': StateTable,
+        'cities': CityTable,
+    }
+
+    def __init__(self, data_dir=None, use_artifact=True):
+        self.data_dir = data_dir or DATA_DIR
+        self.use_artifact = use_artifact
+        self._lock = threading.RLock()
+        self._loaded = {}
+        self._artifact = _UNSET
+        self._version = _UNSET
+        self._has_cities = _UNSET
+        self.generation = 0
+        self.deltas = []
+
+    def _load(self, name):
+        if isinstance(name, tuple):
+            table = CityTable.load_shard(self.data_dir, name[1])
+        else:
+            table = self._tables[name].load(self.data_dir, self.artifact)
+        for delta in self.deltas:
+            table = delta.apply(name, table)
+        return table
+
+    def _get(self, name):
+        table = self._loaded.get(name)
+        if table is None:
+            with self._lock:
+                table = self._loaded.get(name)
+                if table is None:
+                    table = self._load(name)
+                    self._loaded[name] = table
+        return table
+
+    @property
+    def artifact(self):
+        """BinaryDataset: The compiled artifact, or None when reading JSON."""
+        if self._artifact is _UNSET:
+            with self._lock:
+                if self._artifact is _UNSET:
+                    from .binary import open_artifact
+                    self._artifact = open_artifact(self.data_dir) if self.use_artifact else None
+        return self._artifact
+
+    @property
+    def version(self):
+        """str: Version of the dataset, or None if the data is unversioned."""
+        if self._version is _UNSET:
+            with self._lock:
+                if self._version is _UNSET:
+                    try:
+                        self._version = _read_json(os.path.join(self.data_dir, VERSION_NAME)).get('version')
+                    except FileNotFoundError:
+                        self._version = None
+        return self._version
+
+    @property
+    def countries(self):
+        """CountryTable: The country table, loaded on first access."""
+        return self._get('countries')
+
+    @property
+    def states(self):
+        """StateTable: The state table, loaded on first access."""
+        return self._get('states')
+
+    @property
+    def cities(self):
+        """CityTable: The city table, loaded on first access."""
+        return self._get('cities')
+
+    def cities_of_country(self, country_code):
+        """
+        Get a city table holding at least the cities of one country.
+
+        When the city dataset is sharded and neither the artifact nor the
+        full city table is in use, only the requested country's shard is
+        read. It is kept by the registry, or by the shard cache when one is
+        set (see set_shard_cache).
+
+        Args:
+            country_code (str): The ISO 3166-1 alpha-2 country code
+
+        Returns:
+            CityTable: The full city table or a single-country table
+        """
+        if 'cities' in self._loaded or not shards.has_shards(self.data_dir):
+            return self.cities
+        artifact = self.artifact
+        if artifact is not None and artifact.has_table('city'):
+            return self.cities
+        path = shards.shard_path(self.data_dir, country_code)
+        if path is None or not os.path.exists(path):
+            # Known countries without cities get a cached empty table like
+            # any shard; unknown codes are not cached
+            if country_code not in self.countries.by_code and \
+                    not any(country_code in d.countries('cities') for d in self.deltas):
+                return CityTable([])
+        return self._shard(country_code)
+
+    def _shard(self, country_code):
+        name = ('cities', country_code)
+        cache = _shard_cache
+        if cache is None:
+            return self._get(name)
+        # Tables of older generations are never served and age out
+        key = (self, self.generation, country_code)
+        table = cache.get(key)
+        if table is None:
+            table = self._load(name)
+            cache.put(key, table, _shard_size(table))
+        return table
+
+    def records_of(self, kind, country_code=None):
+        """
+        Get the records of one kind, optionally restricted to one country.
+
+        Args:
+            kind (str): "country", "state" or "city"
+            country_code (str): Only include records of this country
+
+        Returns:
+            tuple: (table, records) where table is the Table the records
+                belong to, for caching derived indexes on it
+        """
+        if kind == 'country':
+            table = self.countries
+            if country_code:
+                country = table.by_code.get(country_code)
+                return table, (country,) if country is not None else ()
+            return table, table.records
+        if kind == 'state':
+            table = self.states
+            if country_code:
+                return table, table.by_country.get(country_code, ())
+            return table, table.records
+        if kind == 'city':
+            if country_code:
+                table = self.cities_of_country(country_code)
+                return table, table.by_country.get(country_code, ())
+            table = self.cities
+            return table, table.records
+        raise ValueError(f"kind must be one of {', '.join(KINDS)}, not {kind!r}")
+
+    def has_city_data(self):
+        """
+        Check whether city data is installed.
+
+        The answer is cached until clear() or reload().
+
+        Returns:
+            bool: True if cities can be read from the artifact, the
+                per-country shards or a city.json
+        """
+        if self._has_cities is _UNSET:
+            artifact = self.artifact
+            self._has_cities = (
+                'cities' in self._loaded
+                or shards.has_shards(self.data_dir)
+                or (artifact is not None and artifact.has_table('city'))
+                or os.path.exists(os.path.join(self.data_dir, 'city.json'))
+            )
+        return self._has_cities
+
+    def is_loaded(self, name):
+        """
+        Check whether a table has been loaded.
+
+        Args:
+            name (str): One of "countries", "states" or "cities", or
+                ("cities", country_code) for a single city shard
+
+        Returns:
+            bool: True if the table is currently cached, by the registry
+                or, for city shards, by the shard cache
+        """
+        cache = _shard_cache
+        if cache is not None and isinstance(name, tuple):
+            return (self, self.generation, name[1]) in cache
+        return name in self._loaded
+
+    def drop_shards(self):
+        """Drop the loaded city shards. They are read again on next access."""
+        with self._lock:
+            self._loaded = {
+                name: table for name, table in self._loaded.items() if not isinstance(name, tuple)
+            }
+
+    def clear(self):
+        """
+        Drop all cached tables. They are loaded again on next access.
+
+        Applied deltas are kept and replayed on the reloaded tables.
+        """
+        with self._lock:
+            self._loaded = {}
+            self._artifact = _UNSET
+            self._has_cities = _UNSET
+            self.generation += 1
+
+    def reload(self):
+        """
+        Re-read every table that is currently loaded.
+
+        The new tables are built before they replace the old ones, so
+        concurrent readers never see a partially loaded dataset.
+        """
+        with self._lock:
+            self._artifact = _UNSET
+            self._has_cities = _UNSET
+            loaded = {name: self._load(name) for name in self._loaded}
+            self._loaded = loaded
+            self.generation += 1
+
+    def apply_delta(self, delta):
+        """
+        Update the loaded tables with a delta, copy-on-write.
+
+        The updated tables are built from the current ones, sharing every
+        unchanged record, and replace them in one step, so concurrent
+        readers see either the old or the new dataset. Tables that are not
+        loaded yet get the delta applied when they are.
+
+        Args:
+            delta (Delta): A delta from country_state_city.delta
+
+        Raises:
+            ValueError: If the delta's from_version is not this dataset's
+                version
+        """
+        with self._lock:
+            version = self.version
+            if delta.from_version is not None and version is not None and delta.from_version != version:
+                raise ValueError(
+                    f'delta applies to version {delta.from_version}, the dataset is at version {version}')
+            loaded = {name: delta.apply(name, table) for name, table in self._loaded.items()}
+            self.deltas.append(delta)
+            self._loaded = loaded
+            if delta.to_version is not None:
+                self._version = delta.to_version
+            self.generation += 1
+
+
+_registry = Registry()
+
+# When set, holds the city shards in place of the registries, with a
+# function estimating the size of a table (see country_state_city.cache)
+_shard_cache = None
+_shard_size = None
+
+
+def set_shard_cache(cache, size=None):
+    """
+    Keep the per-country city tables of every registry in a cache.
+
+    Args:
+        cache: An object with get(key) and put(key, table, size), such as
+            cache.ResultCache, or None to keep the tables in the registries
+        size (callable): Estimates the size of a table in bytes
+    """
+    global _shard_cache, _shard_size
+    _shard_cache = cache
+    _shard_size = size
+
+
+def get_registry():
+    """
+    Get the process-wide registry used by the model classes.
+
+    Returns:
+        Registry: The shared registry instance
+    """
+    return _registry
+
+
+def clear():
+    """Drop all cached tables from the process-wide registry."""
+    _registry.clear()
+
+
+def reload():
+    """Re-read every table currently loaded in the process-wide registry."""
+    _registry.reload()
@@ -0,0 +1,328 @@
+"""
+Incremental dataset updates.
+
+A delta lists the records added, removed and changed between two versions
+of the dataset, keyed the way the data files identify them:
+
+    {
+        "format": 1,
+        "from_version": "2024.05.01",
+        "to_version": "2024.05.08",
+        "countries": {"added": [...], "removed": [...], "changed": [...]},
+        "states": {"added": [...], "removed": [...], "changed": [...]},
+        "cities": {"added": [...], "removed": [...], "changed": [...]}
+    }
+
+Entries are dictionaries in the format of the data files. Countries are
+keyed by "isoCode", states by "countryCode" and "isoCode", and cities by
+"countryCode", "stateCode" and "name". Removed entries only need their key
+fields, and changed entries only need their key fields plus the fields
+that changed. Every section and list is optional.
+
+apply_delta() updates the loaded tables copy-on-write: unchanged records
+and the buckets of unaffected countries and states are shared with the
+old tables, only new and changed records are built, and the new tables
+replace the old ones in one step under the registry lock. Readers keep
+using the tables they already hold. Tables that are loaded later get the
+delta applied as they are read. Indexes scoped to an unaffected country
+are kept; the others are rebuilt on first use.
+
+Deltas only change the in-memory tables. The data files, compiled
+artifact and shards on disk are left as they are, as are the views
+module and City.iter_cities() over shards, which read those directly.
+as_columns() builds its columns from the tables instead of the artifact
+once a delta has been applied.
+
+Example:
+    from country_state_city import delta
+
+    changes = delta.diff('data/2024.05.01', 'data/2024.05.08',
+                         from_version='2024.05.01', to_version='2024.05.08')
+    delta.apply_delta(changes)
+"""
+
+import json
+import os
+
+from .dataset import get_registry
+
+FORMAT = 1
+
+# Section of a delta, the key fields of its entries and the key of a record
+SECTIONS = {
+    'countries': ('isoCode',),
+    'states': ('countryCode', 'isoCode'),
+    'cities': ('countryCode', 'stateCode', 'name'),
+}
+
+_RECORD_KEYS = {
+    'countries': lambda r: r.iso2,
+    'states': lambda r: (r.country_code, r.iso_code),
+    'cities': lambda r: (r.country_code, r.state_code, r.name),
+}
+
+
+def _entry_key(section, entry):
+    fields = SECTIONS[section]
+    try:
+        values = tuple(entry[field] for field in fields)
+    except (KeyError, TypeError):
+        raise ValueError(f'{section} entries need the fields {", ".join(fields)}: {entry!r}') from None
+    return values[0] if len(values) == 1 else values
+
+
+class Delta:
+    """
+    A parsed and validated delta.
+
+    Attributes:
+        from_version (str): Version the delta applies to, or None for any
+        to_version (str): Version of the dataset after the delta, or None
+        sections (dict): Per section, a tuple (added, removed, changed)
+            where added and changed map keys to entries and removed is a
+            set of keys
+    """
+    def __init__(self, data):
+        if not isinstance(data, dict):
+            raise ValueError('a delta must be a JSON object')
+        if data.get('format', FORMAT) != FORMAT:
+            raise ValueError(f"unsupported delta format {data.get('format')!r}")
+        unknown = set(data) - set(SECTIONS) - {'format', 'from_version', 'to_version'}
+        if unknown:
+            raise ValueError(f"unknown delta fields: {', '.join(sorted(unknown))}")
+        self.from_version = data.get('from_version')
+        self.to_version = data.get('to_version')
+        self.sections = {}
+        for section in SECTIONS:
+            changes = data.get(section) or {}
+            added = {_entry_key(section, e): e for e in changes.get('added', ())}
+            removed = {_entry_key(section, e) for e in changes.get('removed', ())}
+            changed = {_entry_key(section, e): e for e in changes.get('changed', ())}
+            if added or removed or changed:
+                self.sections[section] = (added, removed, changed)
+
+    def countries(self, section):
+        """Get the country codes with records touched in a section."""
+        if section not in self.sections:
+            return set()
+        added, removed, changed = self.sections[section]
+        keys = set(added) | removed | set(changed)
+        if section == 'countries':
+            return keys
+        return {key[0] for key in keys}
+
+    def apply(self, name, table):
+        """
+        Build the table that results from applying this delta.
+
+        Args:
+            name: Registry name of the table: "countries", "states",
+                "cities" or ("cities", country_code) for a shard
+            table (Table): The table to update; it is not modified
+
+        Returns:
+            Table: A new table, or table itself if the delta does not touch it
+        """
+        section = 'cities' if isinstance(name, tuple) else name
+        if section not in self.sections:
+            return table
+        added, removed, changed = self.sections[section]
+        if isinstance(name, tuple):
+            # A shard only holds the cities of one country
+            code = name[1]
+            added = {key: entry for key, entry in added.items() if key[0] == code}
+            removed = {key for key in removed if key[0] == code}
+            changed = {key: entry for key, entry in changed.items() if key[0] == code}
+            if not (added or removed or changed):
+                return table
+        return _APPLY[section](table, added, removed, changed)
+
+
+def _records(cls, section, table, added, removed, changed):
+    """
+    Get the updated record list and the records that were built.
+
+    Records keep their position; added records whose key already exists
+    replace the existing record, the others are appended.
+    """
+    key_of = _RECORD_KEYS[section]
+    records = []
+    built = []
+    pending = dict(added)
+    for record in table.records:
+        key = key_of(record)
+        if key in removed:
+            continue
+        entry = pending.pop(key, None)
+        if entry is None and key in changed:
+            entry = dict(record.to_dict(), **changed[key])
+        if entry is not None:
+            record = cls.from_dict(entry)
+            built.append(record)
+        records.append(record)
+    for entry in pending.values():
+        record = cls.from_dict(entry)
+        built.append(record)
+        records.append(record)
+    return records, built
+
+
+def _patch_buckets(old, records, bucket_key, affected):
+    """Rebuild the name-sorted buckets of the affected keys only."""
+    buckets = dict(old)
+    fresh = {key: [] for key in affected}
+    for record in records:
+        bucket = fresh.get(bucket_key(record))
+        if bucket is not None:
+            bucket.append(record)
+    for key, bucket in fresh.items():
+        if bucket:
+            buckets[key] = tuple(sorted(bucket, key=lambda x: x.name))
+        else:
+            buckets.pop(key, None)
+    return buckets
+
+
+def _keep_indexes(old, new, countries):
+    """Share the derived indexes of countries the delta does not touch."""
+    for key, index in old.indexes.items():
+        if isinstance(key, tuple) and key[1] is not None and key[1] not in countries:
+            new.indexes[key] = index
+
+
+def _apply_countries(table, added, removed, changed):
+    from .dataset import CountryTable
+    from .models import Country
+    records, built = _records(Country, 'countries', table, added, removed, changed)
+    # Share Timezone objects with the existing countries
+    new = {id(country) for country in built}
+    zones = {}
+    for country in records:
+        if id(country) in new:
+            continue
+        for tz in country.timezones:
+            zones.setdefault((tz.name, tz.gmt_offset, tz.gmt_offset_name, tz.abbreviation, tz.tz_name), tz)
+    for country in built:
+        country.timezones = [
+            zones.setdefault((tz.name, tz.gmt_offset, tz.gmt_offset_name, tz.abbreviation, tz.tz_name), tz)
+            for tz in country.timezones
+        ]
+    return CountryTable(records)
+
+
+def _apply_states(table, added, removed, changed):
+    from .dataset import StateTable
+    from .models import State
+    records, _ = _records(State, 'states', table, added, removed, changed)
+    countries = {key[0] for key in set(added) | removed | set(changed)}
+    new = StateTable(records, _patch_buckets(table.by_country, records, lambda s: s.country_code, countries))
+    _keep_indexes(table, new, countries)
+    return new
+
+
+def _apply_cities(table, added, removed, changed):
+    from .dataset import CityTable
+    from .models import City
+    records, _ = _records(City, 'cities', table, added, removed, changed)
+    keys = set(added) | removed | set(changed)
+    countries = {key[0] for key in keys}
+    new = CityTable(
+        records,
+        _patch_buckets(table.by_country, records, lambda c: c.country_code, countries),
+        _patch_buckets(table.by_state, records, lambda c: (c.country_code, c.state_code),
+                       {key[:2] for key in keys}),
+    )
+    _keep_indexes(table, new, countries)
+    return new
+
+
+_APPLY = {
+    'countries': _apply_countries,
+    'states': _apply_states,
+    'cities': _apply_cities,
+}
+
+
+def load_delta(path):
+    """
+    Read a delta from a JSON file.
+
+    Args:
+        path (str): Path of the delta file
+
+    Returns:
+        Delta: The parsed delta
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return Delta(json.load(f))
+
+
+def apply_delta(delta, registry=None):
+    """
+    Apply a delta to the loaded dataset.
+
+    Args:
+        delta: A Delta, a delta dictionary or the path of a delta file
+        registry (Registry): Defaults to the process-wide registry
+
+    Returns:
+        str: The dataset version after the delta
+
+    Raises:
+        ValueError: If the delta is malformed or its from_version does not
+            match the version of the dataset
+    """
+    if isinstance(delta, (str, os.PathLike)):
+        delta = load_delta(delta)
+    elif not isinstance(delta, Delta):
+        delta = Delta(delta)
+    registry = registry or get_registry()
+    registry.apply_delta(delta)
+    return registry.version
+
+
+def _section_delta(section, old, new):
+    key_of = _RECORD_KEYS[section]
+    old = {key_of(r): r.to_dict() for r in old}
+    new = {key_of(r): r.to_dict() for r in new}
+    fields = SECTIONS[section]
+    changes = {
+        'added': [new[key] for key in new if key not in old],
+        'removed': [
+            dict(zip(fields, key if isinstance(key, tuple) else (key,)))
+            for key in old if key not in new
+        ],
+        'changed': [new[key] for key in new if key in old and new[key] != old[key]],
+    }
+    return {name: entries for name, entries in changes.items() if entries}
+
+
+def diff(old_dir, new_dir, from_version=None, to_version=None):
+    """
+    Compute the delta between two data directories.
+
+    Cities are compared when both directories contain city data.
+
+    Args:
+        old_dir (str): Directory of the current data files
+        new_dir (str): Directory of the updated data files
+        from_version (str): Version of the current data, if known
+        to_version (str): Version of the updated data, if known
+
+    Returns:
+        dict: The delta, ready to be saved as JSON or applied
+    """
+    from .dataset import Registry
+    old = Registry(old_dir, use_artifact=False)
+    new = Registry(new_dir, use_artifact=False)
+    delta = {'format': FORMAT, 'from_version': from_version, 'to_version': to_version}
+    for section, kind in (('countries', 'country'), ('states', 'state'), ('cities', 'city')):
+        try:
+            changes = _section_delta(section, old.records_of(kind)[1], new.records_of(kind)[1])
+        except FileNotFoundError:
+            if section != 'cities':
+                raise
+            continue
+        if changes:
+            delta[section] = changes
+    return delta
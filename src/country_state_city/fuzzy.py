@@ -0,0 +1,161 @@
+"""
+Typo-tolerant name matching.
+
+Names are normalized with normalize_name and broken into padded trigrams.
+An inverted index from trigram to records prunes the candidates of a query
+before the edit distance is computed, using the q-gram lemma: each edit
+destroys at most three trigrams, so a name within edit distance k of the
+query shares all but at most 3k of the query's distinct trigrams.
+
+Example:
+    from country_state_city import match
+
+    match('Califronia', kind='state', country_code='US')
+    # [Match(record=<State: California (CA)>, distance=2)]
+"""
+
+from collections import namedtuple
+
+from .dataset import get_registry
+from .models import normalize_name
+
+Match = namedtuple('Match', ['record', 'distance'])
+Match.__doc__ = """A fuzzy match: the matched record and its edit distance to the query."""
+
+_PAD = '  '
+
+
+def trigrams(key):
+    """
+    Get the set of padded trigrams of a normalized name.
+
+    Args:
+        key (str): A normalized name
+
+    Returns:
+        set: Trigrams, including the ones spanning the padding
+    """
+    padded = _PAD + key + _PAD
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit):
+    """
+    Compute the Levenshtein distance between two strings, up to a limit.
+
+    Args:
+        a (str): First string
+        b (str): Second string
+        limit (int): Largest distance of interest
+
+    Returns:
+        int: The distance, or limit + 1 if it exceeds limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+class TrigramIndex:
+    """
+    Inverted index from padded trigrams to records.
+
+    Attributes:
+        keys (list): Normalized names aligned with records
+        records (list): Indexed records
+        postings (dict): Lists of record positions keyed by trigram
+    """
+    def __init__(self, records):
+        self.records = list(records)
+        self.keys = [normalize_name(record.name) for record in self.records]
+        self.postings = {}
+        for position, key in enumerate(self.keys):
+            for gram in trigrams(key):
+                self.postings.setdefault(gram, []).append(position)
+
+    def candidates(self, key, max_distance):
+        """
+        Get positions of records that may be within max_distance of key.
+
+        Args:
+            key (str): A normalized query
+            max_distance (int): Largest edit distance of interest
+
+        Returns:
+            iterable: Record positions passing the trigram count filter
+        """
+        grams = trigrams(key)
+        needed = len(grams) - 3 * max_distance
+        if needed <= 0:
+            # Short queries cannot be pruned by trigrams
+            return range(len(self.keys))
+        counts = {}
+        for gram in grams:
+            for position in self.postings.get(gram, ()):
+                counts[position] = counts.get(position, 0) + 1
+        return [position for position, count in counts.items() if count >= needed]
+
+    def match(self, name, max_distance=2, limit=5):
+        """
+        Find the records closest to a name.
+
+        Args:
+            name (str): The possibly misspelled name
+            max_distance (int): Largest edit distance to accept
+            limit (int): Maximum number of results, or None for all
+
+        Returns:
+            list: Match tuples ordered by distance and then by name
+        """
+        key = normalize_name(name)
+        if not key:
+            return []
+        keys = self.keys
+        scored = []
+        for position in self.candidates(key, max_distance):
+            distance = edit_distance(key, keys[position], max_distance)
+            if distance <= max_distance:
+                scored.append((distance, keys[position], position))
+        scored.sort()
+        if limit is not None:
+            scored = scored[:limit]
+        return [Match(self.records[position], distance) for distance, _, position in scored]
+
+
+def match(name, kind, country_code=None, max_distance=2, limit=5):
+    """
+    Find places whose names are close to a possibly misspelled name.
+
+    Matching ignores case and accents and tolerates up to max_distance
+    inserted, deleted or substituted characters.
+
+    Args:
+        name (str): The name to match (e.g., "Califronia")
+        kind (str): "country", "state" or "city"
+        country_code (str): Restrict states and cities to this country
+        max_distance (int): Largest edit distance to accept
+        limit (int): Maximum number of results, or None for all
+
+    Returns:
+        list: Match(record, distance) tuples, closest first
+    """
+    return _trigram_index(kind, country_code).match(name, max_distance, limit)
+
+
+def _trigram_index(kind, country_code=None):
+    table, records = get_registry().records_of(kind, country_code)
+    return table.derived(('trigram', country_code or None), lambda: TrigramIndex(records))
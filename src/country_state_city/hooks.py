@@ -0,0 +1,67 @@
+"""
+Shared installation of wrappers around the Country, State and City methods.
+
+Opt-in features such as instrumentation and the result cache each add a
+layer of wrappers with install() and take it away with uninstall(). The
+wrapped methods are always rebuilt from the original functions and the
+layers still installed, in installation order, so removing one layer never
+removes or brings back another. Once no layer wraps a method, the original
+is put back.
+"""
+
+import threading
+
+_lock = threading.RLock()
+_originals = {}  # (cls, name) -> the original staticmethod
+_layers = []  # (layer, factory, methods) in installation order
+
+
+def install(layer, methods, factory):
+    """
+    Wrap static methods with a new outermost layer.
+
+    Args:
+        layer (hashable): Identifies the layer for uninstall()
+        methods (iterable): (class, method name) pairs to wrap
+        factory (callable): Called as factory(label, function), where
+            label is e.g. "State.get_states", returning the wrapper
+    """
+    with _lock:
+        if is_installed(layer):
+            raise ValueError(f'layer {layer!r} is already installed')
+        methods = tuple(methods)
+        for cls, name in methods:
+            _originals.setdefault((cls, name), cls.__dict__[name])
+        _layers.append((layer, factory, methods))
+        _rebuild(methods)
+
+
+def uninstall(layer):
+    """Remove the wrappers of a layer, keeping every other layer."""
+    with _lock:
+        for i, (installed, _, methods) in enumerate(_layers):
+            if installed == layer:
+                del _layers[i]
+                _rebuild(methods)
+                return
+
+
+def is_installed(layer):
+    """Check whether a layer is installed."""
+    return any(installed == layer for installed, _, _ in _layers)
+
+
+def _rebuild(methods):
+    for cls, name in methods:
+        original = _originals[cls, name]
+        function = original.__func__
+        wrapped = False
+        for _, factory, layer_methods in _layers:
+            if (cls, name) in layer_methods:
+                function = factory(f'{cls.__name__}.{name}', function)
+                wrapped = True
+        if wrapped:
+            setattr(cls, name, staticmethod(function))
+        else:
+            setattr(cls, name, original)
+            del _originals[cls, name]
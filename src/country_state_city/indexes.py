@@ -0,0 +1,87 @@
+"""
+Prebuilt per-country search indexes.
+
+The build step writes one JSON file per country under data/indexes (e.g.,
+data/indexes/US.json) holding the sorted name index and the KD-tree of the
+country's states and cities. Country-scoped prefix searches and spatial
+queries load these instead of sorting and splitting at runtime.
+
+Each index records the number and a digest of the records it was built
+from, in the order returned by Registry.records_of. An index is only used
+when it still matches the records; otherwise the index is built in memory
+as usual. File times are not compared, as installers do not preserve them.
+"""
+
+import hashlib
+import json
+import os
+
+INDEX_DIR = 'indexes'
+INDEX_SUFFIX = '.json'
+
+
+def index_dir(data_dir):
+    """Get the directory holding the prebuilt indexes of data_dir."""
+    return os.path.join(data_dir, INDEX_DIR)
+
+
+def index_path(data_dir, country_code):
+    """
+    Get the path of the prebuilt index file for a country.
+
+    Returns:
+        str: The index path, or None if country_code is not a valid code
+    """
+    if not country_code or not country_code.isalnum():
+        return None
+    return os.path.join(index_dir(data_dir), country_code + INDEX_SUFFIX)
+
+
+def records_digest(records):
+    """Get a digest identifying the names, coordinates and order of records."""
+    digest = hashlib.sha256()
+    for record in records:
+        digest.update(repr((record.name, record.latitude, record.longitude)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def prebuilt(data_dir, kind, country_code, records):
+    """
+    Load the prebuilt index of one kind of record of one country.
+
+    Args:
+        data_dir (str): Directory containing the data files
+        kind (str): "state" or "city"
+        country_code (str): The ISO 3166-1 alpha-2 country code
+        records (list): The records the index must have been built from
+
+    Returns:
+        dict: The index with "names" and "kdtree" entries, or None if there
+            is no usable prebuilt index
+    """
+    path = index_path(data_dir, country_code)
+    if path is None:
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            index = json.load(f).get(kind)
+    except (OSError, ValueError):
+        return None
+    if index is None or index['count'] != len(records):
+        return None
+    if index['digest'] != records_digest(records):
+        return None
+    return index
+
+
+def dump_index(index):
+    """Serialize an index deterministically, with sorted keys."""
+    return json.dumps(index, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def write_index(path, content):
+    """Atomically write serialized index content to path."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
@@ -0,0 +1,341 @@
+"""
+Opt-in instrumentation of data loads and lookups.
+
+Nothing is measured until enable() is called: it replaces the registry's
+load and table access methods and every static method of Country, State
+and City with timed wrappers, and disable() puts the originals back. When
+disabled the library runs its plain code paths, so there is no overhead.
+
+Measurements are aggregated in a Metrics object (load time, bytes parsed,
+objects materialized, table cache hits and misses, per-method latency
+histograms) that can be exported in the Prometheus text format. Listeners
+receive every LoadEvent and CallEvent as it happens, which is the place to
+forward them to OpenTelemetry or a tracing system.
+
+Example:
+    from country_state_city import instrumentation
+
+    metrics = instrumentation.enable()
+    State.get_states_of_country('US')
+    print(metrics.to_prometheus())
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import namedtuple
+
+from . import hooks, shards
+from .dataset import Registry
+
+LoadEvent = namedtuple('LoadEvent', ['table', 'source', 'seconds', 'bytes', 'objects'])
+LoadEvent.__doc__ = """A table load: where it was read from, how long it took and its size."""
+
+CallEvent = namedtuple('CallEvent', ['method', 'seconds'])
+CallEvent.__doc__ = """A call of a Country, State or City static method and its duration."""
+
+# Upper bounds in seconds of the latency histogram buckets
+BUCKETS = (
+    0.000001, 0.000005, 0.00001, 0.00005, 0.0001, 0.0005,
+    0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0,
+)
+
+_KINDS = {'countries': 'country', 'states': 'state', 'cities': 'city'}
+
+
+class Histogram:
+    """
+    Cumulative latency histogram with fixed buckets.
+
+    Attributes:
+        counts (list): Observations per bucket, the last one unbounded
+        count (int): Number of observations
+        sum (float): Total of all observations in seconds
+    """
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        """Record one observation."""
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+
+class Metrics:
+    """
+    Aggregated measurements.
+
+    Attributes:
+        loads (dict): Per table name, a dict with "count", "seconds",
+            "bytes" and "objects" totals
+        hits (dict): Table cache hits per table name
+        misses (dict): Table cache misses per table name
+        calls (dict): Histogram per method name (e.g., "State.get_states")
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop all measurements."""
+        with self._lock:
+            self.loads = {}
+            self.hits = {}
+            self.misses = {}
+            self.calls = {}
+
+    def record_load(self, event):
+        with self._lock:
+            totals = self.loads.setdefault(
+                event.table, {'count': 0, 'seconds': 0.0, 'bytes': 0, 'objects': 0})
+            totals['count'] += 1
+            totals['seconds'] += event.seconds
+            totals['bytes'] += event.bytes
+            totals['objects'] += event.objects
+
+    def record_access(self, table, hit):
+        with self._lock:
+            counter = self.hits if hit else self.misses
+            counter[table] = counter.get(table, 0) + 1
+
+    def record_call(self, event):
+        with self._lock:
+            histogram = self.calls.get(event.method)
+            if histogram is None:
+                histogram = self.calls[event.method] = Histogram()
+            histogram.observe(event.seconds)
+
+    def snapshot(self):
+        """
+        Get a copy of the measurements as plain data.
+
+        Returns:
+            dict: "loads", "hits", "misses" and "calls", where each call
+                entry has "count", "sum" and cumulative "buckets" keyed by
+                upper bound
+        """
+        with self._lock:
+            return {
+                'loads': {table: dict(totals) for table, totals in self.loads.items()},
+                'hits': dict(self.hits),
+                'misses': dict(self.misses),
+                'calls': {
+                    method: {
+                        'count': histogram.count,
+                        'sum': histogram.sum,
+                        'buckets': dict(zip(BUCKETS + (float('inf'),), _cumulative(histogram.counts))),
+                    }
+                    for method, histogram in self.calls.items()
+                },
+            }
+
+    def to_prometheus(self, prefix='country_state_city'):
+        """
+        Export the measurements in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Prefix of every metric name
+
+        Returns:
+            str: The exposition text
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} {kind}')
+            for suffix, labels, value in samples:
+                label_text = ','.join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f'{prefix}_{name}{suffix}{{{label_text}}} {value}')
+
+        loads = sorted(snapshot['loads'].items())
+        metric('loads_total', 'counter', 'Table loads.',
+               [('', [('table', t)], v['count']) for t, v in loads])
+        metric('load_seconds_total', 'counter', 'Time spent loading tables.',
+               [('', [('table', t)], v['seconds']) for t, v in loads])
+        metric('load_bytes_total', 'counter', 'Bytes of data files parsed.',
+               [('', [('table', t)], v['bytes']) for t, v in loads])
+        metric('load_objects_total', 'counter', 'Records materialized.',
+               [('', [('table', t)], v['objects']) for t, v in loads])
+        metric('cache_hits_total', 'counter', 'Accesses to already loaded tables.',
+               [('', [('table', t)], v) for t, v in sorted(snapshot['hits'].items())])
+        metric('cache_misses_total', 'counter', 'Accesses that loaded a table.',
+               [('', [('table', t)], v) for t, v in sorted(snapshot['misses'].items())])
+
+        samples = []
+        for method, histogram in sorted(snapshot['calls'].items()):
+            for bound, count in histogram['buckets'].items():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                samples.append(('_bucket', [('method', method), ('le', le)], count))
+            samples.append(('_sum', [('method', method)], histogram['sum']))
+            samples.append(('_count', [('method', method)], histogram['count']))
+        metric('call_seconds', 'histogram', 'Latency of Country, State and City methods.', samples)
+        return '\n'.join(lines) + '\n'
+
+
+def _cumulative(counts):
+    total = 0
+    result = []
+    for count in counts:
+        total += count
+        result.append(total)
+    return result
+
+
+def _table_name(name):
+    return f'cities:{name[1]}' if isinstance(name, tuple) else name
+
+
+def _source(registry, name):
+    """Describe where a table is read from and how many bytes are parsed."""
+    data_dir = registry.data_dir
+    if isinstance(name, tuple):
+        paths = [shards.shard_path(data_dir, name[1])]
+        source = 'shard'
+    else:
+        artifact = registry.artifact
+        if artifact is not None and (name == 'countries' or artifact.has_table(_KINDS[name])):
+            # Mapped, not parsed
+            return 'artifact', 0
+        if name == 'cities' and shards.has_shards(data_dir):
+            paths = [shards.shard_path(data_dir, code) for code in shards.shard_countries(data_dir)]
+            source = 'shard'
+        else:
+            paths = [os.path.join(data_dir, _KINDS[name] + '.json')]
+            source = 'json'
+    size = 0
+    for path in paths:
+        try:
+            size += os.path.getsize(path)
+        except (OSError, TypeError):
+            pass
+    return source, size
+
+
+_lock = threading.Lock()
+_metrics = None
+_listeners = []
+_originals = {}
+
+
+def _notify(event):
+    for listener in list(_listeners):
+        listener(event)
+
+
+def _timed_load(metrics, original):
+    def _load(self, name):
+        start = time.perf_counter()
+        table = original(self, name)
+        seconds = time.perf_counter() - start
+        source, size = _source(self, name)
+        event = LoadEvent(_table_name(name), source, seconds, size, len(table.records))
+        metrics.record_load(event)
+        _notify(event)
+        return table
+    return _load
+
+
+def _counted_get(metrics, original):
+    def _get(self, name):
+        metrics.record_access(_table_name(name), name in self._loaded)
+        return original(self, name)
+    return _get
+
+
+def _timed_method(metrics, label, function):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            event = CallEvent(label, time.perf_counter() - start)
+            metrics.record_call(event)
+            _notify(event)
+    wrapper.__name__ = function.__name__
+    wrapper.__qualname__ = function.__qualname__
+    wrapper.__doc__ = function.__doc__
+    wrapper.__wrapped__ = function
+    return wrapper
+
+
+def is_enabled():
+    """Check whether instrumentation is installed."""
+    return _metrics is not None
+
+
+def enable(listener=None):
+    """
+    Install the instrumentation wrappers.
+
+    Calling enable() again keeps the existing wrappers and measurements.
+
+    Args:
+        listener (callable): Optional callback receiving each LoadEvent
+            and CallEvent
+
+    Returns:
+        Metrics: The object aggregating the measurements
+    """
+    global _metrics
+    from .models import Country, State, City
+    with _lock:
+        if listener is not None and listener not in _listeners:
+            _listeners.append(listener)
+        if _metrics is not None:
+            return _metrics
+        _metrics = Metrics()
+        _originals[Registry, '_load'] = Registry.__dict__['_load']
+        _originals[Registry, '_get'] = Registry.__dict__['_get']
+        Registry._load = _timed_load(_metrics, Registry._load)
+        Registry._get = _counted_get(_metrics, Registry._get)
+        metrics = _metrics
+        methods = [
+            (cls, name)
+            for cls in (Country, State, City)
+            for name, value in vars(cls).items()
+            if isinstance(value, staticmethod)
+        ]
+        hooks.install(__name__, methods, lambda label, function: _timed_method(metrics, label, function))
+        return _metrics
+
+
+def disable():
+    """Remove the instrumentation wrappers and all listeners."""
+    global _metrics
+    with _lock:
+        hooks.uninstall(__name__)
+        for (owner, name), value in _originals.items():
+            setattr(owner, name, value)
+        _originals.clear()
+        _listeners.clear()
+        _metrics = None
+
+
+def add_listener(listener):
+    """Register a callback receiving each LoadEvent and CallEvent."""
+    with _lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+
+
+def remove_listener(listener):
+    """Unregister a callback added with add_listener or enable."""
+    with _lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def get_metrics():
+    """
+    Get the active measurements.
+
+    Returns:
+        Metrics: The aggregated measurements, or None when disabled
+    """
+    return _metrics
@@ -2,10 +2,224 @@
 Data models for Country, State, City and Timezone entities.
 """
 
-import json
-import os
+import re
+import sys
 import unicodedata
 
+from . import shards
+from .dataset import get_registry, row_positions
+
+
+def _to_float(value):
+    """Convert a coordinate from the data files to a float, or None if missing."""
+    if value is None or value == '':
+        return None
+    return float(value)
+
+
+def _format_coordinate(value):
+    """Format a coordinate the way the data files store it."""
+    return None if value is None else f'{value:.8f}'
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def normalize_name(name):
+    """
+    Normalize a place name for case- and accent-insensitive matching.
+
+    The name is decomposed (NFKD), combining marks are removed and the
+    result is case-folded, so "São Paulo" and "sao paulo" give the same key.
+
+    Args:
+        name (str): A place name
+
+    Returns:
+        str: The normalized key
+    """
+    if not name:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def _names_index(table, key):
+    """
+    Hash index from normalized name keys to lists of records, in table order.
+
+    The index is built once per loaded table. key maps a record and its
+    normalized name to the dictionary key.
+    """
+    def build():
+        index = {}
+        for record in table.records:
+            index.setdefault(key(record, normalize_name(record.name)), []).append(record)
+        return index
+    return table.derived('names', build)
+
+
+def _parent(record, slot, table, key, code):
+    """
+    Follow an integer foreign key from a record to its parent.
+
+    The row stored in slot is used while it still points at a record whose
+    code equals key. Otherwise, e.g. before the first navigation or after a
+    reload, the parent is looked up by key and its row stored for next time.
+
+    Args:
+        record: The child record
+        slot (str): Name of the slot holding the parent row
+        table (Table): The parent table
+        key: The parent's key in table.by_code
+        code (callable): Gets the key of a parent record
+
+    Returns:
+        The parent record, or None if it is not in the dataset
+    """
+    records = table.records
+    row = getattr(record, slot)
+    if row is not None and 0 <= row < len(records):
+        parent = records[row]
+        if code(parent) == key:
+            return parent
+    found = row_positions(table).get(key, -1)
+    if found != row:
+        setattr(record, slot, found)
+    return records[found] if found >= 0 else None
+
+
+def _country_key(country):
+    return country.iso2
+
+
+def _state_key(state):
+    return (state.country_code, state.iso_code)
+
+
+# Name index keys per kind; states and cities are looked up within a country
+_NAME_KEYS = {
+    'country': lambda country, key: key,
+    'state': lambda state, key: (state.country_code, key),
+    'city': lambda city, key: (city.country_code, key),
+}
+
+
+def _timezone_index():
+    """
+    Inverted indexes over the shared Timezone objects of all countries.
+
+    Built once per loaded country table. Zones are deduplicated by
+    identity, since equal zones of different countries share one object.
+    """
+    table = get_registry().countries
+
+    def build():
+        zones = {}
+        countries = {}
+        for country in table.records:
+            for tz in country.timezones:
+                zones.setdefault(id(tz), tz)
+                bucket = countries.setdefault(tz.name, [])
+                if not bucket or bucket[-1] is not country:
+                    bucket.append(country)
+        ordered = tuple(sorted(zones.values(), key=lambda tz: (tz.name, tz.gmt_offset)))
+        by_name = {}
+        by_offset = {}
+        by_abbreviation = {}
+        for tz in ordered:
+            by_name.setdefault(tz.name, tz)
+            by_offset.setdefault(tz.gmt_offset, []).append(tz)
+            by_abbreviation.setdefault(tz.abbreviation, []).append(tz)
+        return {
+            'zones': ordered,
+            'by_name': by_name,
+            'countries': {name: tuple(bucket) for name, bucket in countries.items()},
+            'by_offset': {offset: tuple(bucket) for offset, bucket in by_offset.items()},
+            'by_abbreviation': {abbr: tuple(bucket) for abbr, bucket in by_abbreviation.items()},
+        }
+    return table.derived('timezones', build)
+
+
+# Alternatives inside one phone code field, e.g. "+1-787 and 1-939"
+_PHONE_ALTERNATIVES = re.compile(r'\band\b|[,;/]')
+
+# Formatting characters allowed in phone codes and numbers
+_PHONE_FORMATTING = re.compile(r'[\s\-().]')
+
+_DIGITS = re.compile(r'[0-9]+')
+
+
+def _phone_digits(value):
+    """
+    Reduce a calling code or phone number to its digits.
+
+    Formatting characters and a leading "+" or "00" international call
+    prefix are dropped, so "+358-18" gives "35818" and "0055" gives "55".
+
+    Returns:
+        str: The digits, or None if the value contains anything else
+    """
+    value = _PHONE_FORMATTING.sub('', value or '')
+    if value.startswith('+'):
+        value = value[1:]
+    elif value.startswith('00'):
+        value = value[2:]
+    return value if _DIGITS.fullmatch(value) else None
+
+
+def _calling_codes(value):
+    """Split a phone code field into its normalized calling codes."""
+    codes = []
+    for part in _PHONE_ALTERNATIVES.split(value or ''):
+        code = _phone_digits(part)
+        if code and code not in codes:
+            codes.append(code)
+    return codes
+
+
+def _phone_index():
+    """
+    Calling code indexes over all countries.
+
+    Built once per loaded country table: exact lookups by normalized code
+    and a digit trie for longest-prefix matching of phone numbers. Each trie
+    node is a dict of digit to child node, and the countries whose code ends
+    at a node are stored under the None key.
+    """
+    table = get_registry().countries
+
+    def build():
+        by_code = {}
+        for country in table.records:
+            for code in _calling_codes(country.phone_code):
+                by_code.setdefault(code, []).append(country)
+        trie = {}
+        for code, countries in by_code.items():
+            node = trie
+            for digit in code:
+                node = node.setdefault(digit, {})
+            node[None] = tuple(countries)
+        return {
+            'by_code': {code: tuple(countries) for code, countries in by_code.items()},
+            'trie': trie,
+        }
+    return table.derived('phone_codes', build)
+
+
+def _currency_index():
+    """Countries by currency code, built once per loaded country table."""
+    table = get_registry().countries
+
+    def build():
+        by_currency = {}
+        for country in table.records:
+            if country.currency:
+                by_currency.setdefault(country.currency, []).append(country)
+        return {currency: tuple(countries) for currency, countries in by_currency.items()}
+    return table.derived('currencies', build)
+
 
 class Timezone:
     """
@@ -18,6 +232,8 @@ class Timezone:
         abbreviation (str): Timezone abbreviation (e.g., "EST")
         tz_name (str): Full timezone name (e.g., "Eastern Standard Time")
     """
+    __slots__ = ('name', 'gmt_offset', 'gmt_offset_name', 'abbreviation', 'tz_name')
+
     def __init__(self, name, gmt_offset, gmt_offset_name, abbreviation, tz_name):
         self.name = name
         self.gmt_offset = gmt_offset
@@ -64,6 +280,68 @@ class Timezone:
     def __repr__(self):
         return f"<Timezone: {self.name}>"
 
+    @staticmethod
+    def get_timezones():
+        """
+        Get every timezone used by any country, without duplicates.
+
+        Returns:
+            list: Timezone objects sorted by name
+        """
+        return list(_timezone_index()['zones'])
+
+    @staticmethod
+    def get_by_name(name):
+        """
+        Get a timezone by its IANA name.
+
+        Args:
+            name (str): The zone name (e.g., "America/New_York")
+
+        Returns:
+            Timezone: The timezone, or None if no country uses it
+        """
+        return _timezone_index()['by_name'].get(name)
+
+    @staticmethod
+    def get_countries_for_zone(name):
+        """
+        Get the countries that use a timezone.
+
+        Args:
+            name (str): The zone name (e.g., "Europe/Zurich")
+
+        Returns:
+            list: Country objects in the order of the data file
+        """
+        return list(_timezone_index()['countries'].get(name, ()))
+
+    @staticmethod
+    def get_by_offset(seconds):
+        """
+        Get the timezones with a given GMT offset.
+
+        Args:
+            seconds (int): The offset from GMT in seconds (e.g., -18000)
+
+        Returns:
+            list: Timezone objects sorted by name
+        """
+        return list(_timezone_index()['by_offset'].get(seconds, ()))
+
+    @staticmethod
+    def get_by_abbreviation(abbreviation):
+        """
+        Get the timezones with a given abbreviation.
+
+        Args:
+            abbreviation (str): The abbreviation (e.g., "CET")
+
+        Returns:
+            list: Timezone objects sorted by name
+        """
+        return list(_timezone_index()['by_abbreviation'].get(abbreviation, ()))
+
 
 class Country:
     """
@@ -79,20 +357,31 @@ class Country:
         longitude (float): Longitude of country's center
         timezones (list): List of Timezone objects for this country
         unicode_flag (str): Unicode representation of the flag
+        states (list): The states of this country, sorted by name
     """
+    __slots__ = (
+        'name', 'iso2', 'phone_code', 'flag', 'currency', 'latitude', 'longitude',
+        'timezones', 'unicode_flag',
+    )
+
     def __init__(self, name, iso2, phone_code, flag, currency, latitude, longitude, timezones=None):
         self.name = name
-        self.iso2 = iso2
+        self.iso2 = _intern(iso2)
         self.phone_code = phone_code
         self.flag = flag
-        self.currency = currency
-        self.latitude = latitude
-        self.longitude = longitude
+        self.currency = _intern(currency)
+        self.latitude = _to_float(latitude)
+        self.longitude = _to_float(longitude)
         self.timezones = timezones or []
         
         # Derive unicode flag from emoji flag
         self.unicode_flag = self.flag
     
+    @property
+    def states(self):
+        """list: The states of this country, sorted by name."""
+        return State.get_states_of_country(self.iso2)
+    
     @classmethod
     def from_dict(cls, data):
         """Create a Country instance from a dictionary."""
@@ -117,8 +406,8 @@ class Country:
             'phoneCode': self.phone_code,
             'flag': self.flag,
             'currency': self.currency,
-            'latitude': self.latitude,
-            'longitude': self.longitude,
+            'latitude': _format_coordinate(self.latitude),
+            'longitude': _format_coordinate(self.longitude),
             'timezones': [tz.to_dict() for tz in self.timezones] if self.timezones else []
         }
     
@@ -133,11 +422,7 @@ class Country:
         Returns:
             list: A list of Country objects representing all countries in the dataset.
         """
-        data_path = os.path.join(os.path.dirname(__file__), 'data', 'country.json')
-        with open(data_path, 'r', encoding='utf-8') as f:
-            countries_data = json.load(f)
-        
-        return [Country.from_dict(country) for country in countries_data]
+        return list(get_registry().countries.records)
     
     @staticmethod
     def get_country_by_code(country_code):
@@ -153,12 +438,137 @@ class Country:
         if not country_code:
             return None
             
-        countries = Country.get_countries()
-        for country in countries:
-            if country.iso2 == country_code:
-                return country
+        return get_registry().countries.by_code.get(country_code)
+    
+    @staticmethod
+    def get_countries_by_codes(country_codes, missing=None):
+        """
+        Get many countries by ISO code in one pass.
         
-        return None
+        Args:
+            country_codes (iterable): ISO 3166-1 alpha-2 codes, e.g. a list,
+                an iterator or a NumPy array
+            missing: Value returned for codes that are not found
+            
+        Returns:
+            list: Country objects aligned with country_codes
+        """
+        from .batch import lookup_many
+        return lookup_many('country', country_codes, missing)
+    
+    @staticmethod
+    def get_country_by_name(name):
+        """
+        Get a country by its name, ignoring case and accents.
+        
+        Args:
+            name (str): The country name (e.g., "united states" or "Curacao")
+            
+        Returns:
+            Country: Country object matching the name, or None if not found
+        """
+        if not name:
+            return None
+            
+        index = _names_index(get_registry().countries, _NAME_KEYS['country'])
+        matches = index.get(normalize_name(name))
+        return matches[0] if matches else None
+    
+    @staticmethod
+    def get_countries_by_currency(currency):
+        """
+        Get the countries that use a currency.
+        
+        Args:
+            currency (str): The ISO 4217 currency code (e.g., "EUR")
+            
+        Returns:
+            list: Country objects in the order of the data file
+        """
+        if not currency:
+            return []
+            
+        return list(_currency_index().get(currency.upper(), ()))
+    
+    @staticmethod
+    def get_countries_by_phone_code(phone_code):
+        """
+        Get the countries with a calling code.
+        
+        Codes are compared without formatting, so "+358-18", "358 18" and
+        "35818" all find the Aland Islands.
+        
+        Args:
+            phone_code (str): The calling code (e.g., "44" or "+1-242")
+            
+        Returns:
+            list: Country objects in the order of the data file
+        """
+        by_code = _phone_index()['by_code']
+        countries = []
+        for code in _calling_codes(phone_code):
+            countries.extend(c for c in by_code.get(code, ()) if c not in countries)
+        return countries
+    
+    @staticmethod
+    def resolve_phone_number(number):
+        """
+        Get the countries a phone number belongs to by its calling code.
+        
+        The longest calling code that prefixes the number wins, so
+        "+1 242 555 0100" resolves to the Bahamas rather than to the
+        countries of "1", and "+358 18 12345" to the Aland Islands
+        rather than Finland.
+        
+        Args:
+            number (str): An E.164 number (e.g., "+14155550123"), optionally
+                with spaces, dashes or parentheses, or with a "00" prefix
+                
+        Returns:
+            list: Country objects sharing the matched code in the order of
+                the data file, or an empty list if nothing matches
+        """
+        digits = _phone_digits(number)
+        if not digits:
+            return []
+        node = _phone_index()['trie']
+        countries = ()
+        for digit in digits:
+            node = node.get(digit)
+            if node is None:
+                break
+            countries = node.get(None, countries)
+        return list(countries)
+    
+    @staticmethod
+    def query():
+        """
+        Start a lazy query over countries.
+        
+        Example:
+            Country.query().name_prefix('united').limit(5).all()
+            
+        Returns:
+            Query: A query without filters, see country_state_city.query
+        """
+        from .query import Query
+        return Query('country')
+    
+    @staticmethod
+    def as_columns(format='numpy'):
+        """
+        Export all countries as columns without building Country objects.
+        
+        Args:
+            format (str): "numpy" for a dict of NumPy arrays, "arrow" for a
+                pyarrow Table or "pandas" for a pandas DataFrame
+            
+        Returns:
+            The country table with float64 latitude/longitude and categorical
+            code columns. Requires NumPy, plus pyarrow or pandas for those formats.
+        """
+        from .columns import as_columns
+        return as_columns('country', format)
 
 
 class State:
@@ -171,13 +581,29 @@ class State:
         iso_code (str): State code (e.g., "CA" for California)
         latitude (float): Latitude of state's center
         longitude (float): Longitude of state's center
+        country (Country): The country this state belongs to
+        cities (list): The cities of this state, sorted by name
     """
+    __slots__ = ('name', 'country_code', 'iso_code', 'latitude', 'longitude', '_country_row')
+
     def __init__(self, name, country_code, iso_code, latitude=None, longitude=None):
         self.name = name
-        self.country_code = country_code
-        self.iso_code = iso_code
-        self.latitude = latitude
-        self.longitude = longitude
+        self.country_code = _intern(country_code)
+        self.iso_code = _intern(iso_code)
+        self.latitude = _to_float(latitude)
+        self.longitude = _to_float(longitude)
+        self._country_row = None
+    
+    @property
+    def country(self):
+        """Country: The country this state belongs to, or None if unknown."""
+        return _parent(self, '_country_row', get_registry().countries,
+                       self.country_code, _country_key)
+    
+    @property
+    def cities(self):
+        """list: The cities of this state, sorted by name."""
+        return City.get_cities_of_state(self.country_code, self.iso_code)
     
     @classmethod
     def from_dict(cls, data):
@@ -196,8 +622,8 @@ class State:
             'name': self.name,
             'countryCode': self.country_code,
             'isoCode': self.iso_code,
-            'latitude': self.latitude,
-            'longitude': self.longitude
+            'latitude': _format_coordinate(self.latitude),
+            'longitude': _format_coordinate(self.longitude)
         }
     
     def __repr__(self):
@@ -211,11 +637,7 @@ class State:
         Returns:
             list: A list of State objects representing all states in the dataset
         """
-        data_path = os.path.join(os.path.dirname(__file__), 'data', 'state.json')
-        with open(data_path, 'r', encoding='utf-8') as f:
-            states_data = json.load(f)
-        
-        return [State.from_dict(state) for state in states_data]
+        return list(get_registry().states.records)
     
     @staticmethod
     def get_states_of_country(country_code):
@@ -232,9 +654,7 @@ class State:
         if not country_code:
             return []
             
-        states = State.get_states()
-        country_states = [state for state in states if state.country_code == country_code]
-        return sorted(country_states, key=lambda x: x.name)
+        return list(get_registry().states.by_country.get(country_code, ()))
     
     @staticmethod
     def get_state_by_code(country_code, state_code):
@@ -251,12 +671,108 @@ class State:
         if not country_code or not state_code:
             return None
             
-        states = State.get_states()
-        for state in states:
-            if state.country_code == country_code and state.iso_code == state_code:
-                return state
+        return get_registry().states.by_code.get((country_code, state_code))
+    
+    @staticmethod
+    def get_states_by_codes(code_pairs, missing=None):
+        """
+        Get many states by country and state code in one pass.
         
-        return None
+        Args:
+            code_pairs (iterable): (country_code, state_code) pairs, e.g. a
+                list of tuples or an (n, 2) NumPy array
+            missing: Value returned for pairs that are not found
+            
+        Returns:
+            list: State objects aligned with code_pairs
+        """
+        from .batch import lookup_many
+        return lookup_many('state', code_pairs, missing)
+    
+    @staticmethod
+    def get_state_by_name(country_code, name):
+        """
+        Get a state by its country code and name, ignoring case and accents.
+        
+        Args:
+            country_code (str): The ISO 3166-1 alpha-2 country code (e.g., "BR")
+            name (str): The state name (e.g., "sao paulo")
+            
+        Returns:
+            State: State object matching the name, or None if not found
+        """
+        if not country_code or not name:
+            return None
+            
+        index = _names_index(get_registry().states, _NAME_KEYS['state'])
+        matches = index.get((country_code, normalize_name(name)))
+        return matches[0] if matches else None
+    
+    @staticmethod
+    def nearest(latitude, longitude, k=1, country_code=None):
+        """
+        Get the states closest to a point.
+        
+        Args:
+            latitude (float): Latitude in degrees
+            longitude (float): Longitude in degrees
+            k (int): Number of states to return
+            country_code (str): Only consider states of this country (e.g., "US")
+            
+        Returns:
+            list: Neighbor(record, distance) tuples ordered by great-circle
+                  distance in kilometres. States without coordinates are ignored.
+        """
+        from .spatial import get_tree
+        return get_tree('state', country_code).nearest(latitude, longitude, k)
+    
+    @staticmethod
+    def within_radius(latitude, longitude, km, country_code=None):
+        """
+        Get all states within a distance of a point.
+        
+        Args:
+            latitude (float): Latitude in degrees
+            longitude (float): Longitude in degrees
+            km (float): Radius in kilometres
+            country_code (str): Only consider states of this country (e.g., "US")
+            
+        Returns:
+            list: Neighbor(record, distance) tuples ordered by great-circle
+                  distance in kilometres
+        """
+        from .spatial import get_tree
+        return get_tree('state', country_code).within_radius(latitude, longitude, km)
+    
+    @staticmethod
+    def query():
+        """
+        Start a lazy query over states.
+        
+        Example:
+            State.query().country('US').order_by('latitude').limit(3).all()
+            
+        Returns:
+            Query: A query without filters, see country_state_city.query
+        """
+        from .query import Query
+        return Query('state')
+    
+    @staticmethod
+    def as_columns(format='numpy'):
+        """
+        Export all states as columns without building State objects.
+        
+        Args:
+            format (str): "numpy" for a dict of NumPy arrays, "arrow" for a
+                pyarrow Table or "pandas" for a pandas DataFrame
+            
+        Returns:
+            The state table with float64 latitude/longitude and categorical
+            code columns. Requires NumPy, plus pyarrow or pandas for those formats.
+        """
+        from .columns import as_columns
+        return as_columns('state', format)
 
 
 class City:
@@ -269,13 +785,34 @@ class City:
         state_code (str): State code this city belongs to (e.g., "CA")
         latitude (float): Latitude of city's center
         longitude (float): Longitude of city's center
+        country (Country): The country this city belongs to
+        state (State): The state this city belongs to
     """
+    __slots__ = (
+        'name', 'country_code', 'state_code', 'latitude', 'longitude',
+        '_country_row', '_state_row',
+    )
+
     def __init__(self, name, country_code, state_code, latitude=None, longitude=None):
         self.name = name
-        self.country_code = country_code
-        self.state_code = state_code
-        self.latitude = latitude
-        self.longitude = longitude
+        self.country_code = _intern(country_code)
+        self.state_code = _intern(state_code)
+        self.latitude = _to_float(latitude)
+        self.longitude = _to_float(longitude)
+        self._country_row = None
+        self._state_row = None
+    
+    @property
+    def country(self):
+        """Country: The country this city belongs to, or None if unknown."""
+        return _parent(self, '_country_row', get_registry().countries,
+                       self.country_code, _country_key)
+    
+    @property
+    def state(self):
+        """State: The state this city belongs to, or None if unknown."""
+        return _parent(self, '_state_row', get_registry().states,
+                       (self.country_code, self.state_code), _state_key)
     
     @classmethod
     def from_dict(cls, data):
@@ -294,8 +831,8 @@ class City:
             'name': self.name,
             'countryCode': self.country_code,
             'stateCode': self.state_code,
-            'latitude': self.latitude,
-            'longitude': self.longitude
+            'latitude': _format_coordinate(self.latitude),
+            'longitude': _format_coordinate(self.longitude)
         }
     
     def __repr__(self):
@@ -310,11 +847,7 @@ class City:
             list: A list of City objects representing all cities in the dataset
                  (note: this can be a large dataset)
         """
-        data_path = os.path.join(os.path.dirname(__file__), 'data', 'city.json')
-        with open(data_path, 'r', encoding='utf-8') as f:
-            cities_data = json.load(f)
-        
-        return [City.from_dict(city) for city in cities_data]
+        return list(get_registry().cities.records)
     
     @staticmethod
     def get_cities_of_state(country_code, state_code):
@@ -332,12 +865,8 @@ class City:
         if not country_code or not state_code:
             return []
             
-        cities = City.get_cities()
-        state_cities = [
-            city for city in cities 
-            if city.country_code == country_code and city.state_code == state_code
-        ]
-        return sorted(state_cities, key=lambda x: x.name)
+        cities = get_registry().cities_of_country(country_code)
+        return list(cities.by_state.get((country_code, state_code), ()))
     
     @staticmethod
     def get_cities_of_country(country_code):
@@ -355,6 +884,125 @@ class City:
         if not country_code:
             return []
             
-        cities = City.get_cities()
-        country_cities = [city for city in cities if city.country_code == country_code]
-        return sorted(country_cities, key=lambda x: x.name)
\ No newline at end of file
+        return list(get_registry().cities_of_country(country_code).by_country.get(country_code, ()))
+    
+    @staticmethod
+    def get_city_by_name(country_code, name, state_code=None):
+        """
+        Get a city by its country code and name, ignoring case and accents.
+        
+        Args:
+            country_code (str): The ISO 3166-1 alpha-2 country code (e.g., "CH")
+            name (str): The city name (e.g., "zurich")
+            state_code (str): Only match cities of this state (e.g., "ZH")
+            
+        Returns:
+            City: The first City object matching the name, or None if not found
+        """
+        if not country_code or not name:
+            return None
+            
+        table = get_registry().cities_of_country(country_code)
+        index = _names_index(table, _NAME_KEYS['city'])
+        for city in index.get((country_code, normalize_name(name)), ()):
+            if state_code is None or city.state_code == state_code:
+                return city
+        return None
+    
+    @staticmethod
+    def nearest(latitude, longitude, k=1, country_code=None):
+        """
+        Get the cities closest to a point.
+        
+        Args:
+            latitude (float): Latitude in degrees
+            longitude (float): Longitude in degrees
+            k (int): Number of cities to return
+            country_code (str): Only consider cities of this country (e.g., "US")
+            
+        Returns:
+            list: Neighbor(record, distance) tuples ordered by great-circle
+                  distance in kilometres. Cities without coordinates are ignored.
+        """
+        from .spatial import get_tree
+        return get_tree('city', country_code).nearest(latitude, longitude, k)
+    
+    @staticmethod
+    def within_radius(latitude, longitude, km, country_code=None):
+        """
+        Get all cities within a distance of a point.
+        
+        Args:
+            latitude (float): Latitude in degrees
+            longitude (float): Longitude in degrees
+            km (float): Radius in kilometres
+            country_code (str): Only consider cities of this country (e.g., "US")
+            
+        Returns:
+            list: Neighbor(record, distance) tuples ordered by great-circle
+                  distance in kilometres
+        """
+        from .spatial import get_tree
+        return get_tree('city', country_code).within_radius(latitude, longitude, km)
+    
+    @staticmethod
+    def query():
+        """
+        Start a lazy query over cities.
+        
+        Example:
+            City.query().country('US').state('CA').name_prefix('San').limit(10).all()
+            
+        Returns:
+            Query: A query without filters, see country_state_city.query
+        """
+        from .query import Query
+        return Query('city')
+    
+    @staticmethod
+    def as_columns(format='numpy'):
+        """
+        Export all cities as columns without building City objects.
+        
+        Args:
+            format (str): "numpy" for a dict of NumPy arrays, "arrow" for a
+                pyarrow Table or "pandas" for a pandas DataFrame
+            
+        Returns:
+            The city table with float64 latitude/longitude and categorical
+            code columns. Requires NumPy, plus pyarrow or pandas for those formats.
+        """
+        from .columns import as_columns
+        return as_columns('city', format)
+    
+    @staticmethod
+    def iter_cities(country_code=None, state_code=None):
+        """
+        Iterate over cities without loading the whole city dataset.
+        
+        With the sharded city dataset, only the shard of the requested
+        country is read, one record at a time, and nothing is cached.
+        
+        Args:
+            country_code (str): Only yield cities of this country (e.g., "US")
+            state_code (str): Only yield cities of this state (e.g., "CA")
+            
+        Yields:
+            City: City objects, ordered by state code and then by name
+                  within each country when the dataset is sharded
+        """
+        registry = get_registry()
+        if shards.has_shards(registry.data_dir):
+            for city in shards.iter_records(registry.data_dir, country_code, state_code):
+                yield City.from_dict(city)
+            return
+        
+        if country_code and state_code:
+            cities = registry.cities.by_state.get((country_code, state_code), ())
+        elif country_code:
+            cities = registry.cities.by_country.get(country_code, ())
+        else:
+            cities = registry.cities.records
+        for city in cities:
+            if state_code is None or city.state_code == state_code:
+                yield city
\ No newline at end of file
@@ -0,0 +1,269 @@
+"""
+Lazy, immutable queries over countries, states and cities.
+
+A Query only records its filters, ordering and limit; nothing is looked up
+until it is iterated or counted. Every builder method returns a new Query,
+so partially built queries can be kept and reused.
+
+Queries are planned against the existing indexes: the country and state
+buckets (already sorted by name), the prefix index for name_prefix(), and
+the country's shard when the city data is sharded. Results stream from the
+chosen source; ordering by name is served by the buckets without sorting,
+any other ordering with a limit keeps only the top k in a heap, and count()
+reads index sizes when no other filter applies.
+
+Example:
+    from country_state_city import City
+
+    query = City.query().country('US').state('CA').name_prefix('San')
+    first = query.order_by('name').limit(10).all()
+    total = query.count()
+"""
+
+import heapq
+from itertools import chain, islice
+from operator import attrgetter
+
+from .dataset import KINDS, get_registry
+from .models import Country, State, City, normalize_name
+
+_CLASSES = {'country': Country, 'state': State, 'city': City}
+
+
+class Query:
+    """
+    Immutable query over one kind of record.
+
+    Create queries with Country.query(), State.query() or City.query().
+    """
+    __slots__ = ('_kind', '_country', '_state', '_prefix', '_predicates', '_order', '_reverse', '_limit')
+
+    def __init__(self, kind):
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {', '.join(KINDS)}, not {kind!r}")
+        self._kind = kind
+        self._country = None
+        self._state = None
+        self._prefix = None
+        self._predicates = ()
+        self._order = None
+        self._reverse = False
+        self._limit = None
+
+    def _copy(self, **changes):
+        query = Query.__new__(Query)
+        for slot in Query.__slots__:
+            setattr(query, slot, changes.get(slot, getattr(self, slot)))
+        return query
+
+    def __repr__(self):
+        parts = [f'{self._kind}']
+        if self._country:
+            parts.append(f'country={self._country!r}')
+        if self._state:
+            parts.append(f'state={self._state!r}')
+        if self._prefix is not None:
+            parts.append(f'name_prefix={self._prefix!r}')
+        if self._predicates:
+            parts.append(f'where={len(self._predicates)}')
+        if self._order:
+            parts.append(f"order_by={'-' if self._reverse else ''}{self._order}")
+        if self._limit is not None:
+            parts.append(f'limit={self._limit}')
+        return f"<Query: {' '.join(parts)}>"
+
+    def country(self, country_code):
+        """
+        Only include records of one country.
+
+        Args:
+            country_code (str): The ISO 3166-1 alpha-2 country code (e.g., "US")
+
+        Returns:
+            Query: A new query
+        """
+        return self._copy(_country=country_code)
+
+    def state(self, state_code):
+        """
+        Only include cities of one state. Requires country().
+
+        Args:
+            state_code (str): The state code (e.g., "CA" for California)
+
+        Returns:
+            Query: A new query
+        """
+        if self._kind != 'city':
+            raise ValueError(f'state() only applies to city queries, not {self._kind}')
+        return self._copy(_state=state_code)
+
+    def name_prefix(self, prefix):
+        """
+        Only include records whose name starts with a prefix, ignoring case
+        and accents.
+
+        Args:
+            prefix (str): Beginning of the name (e.g., "San")
+
+        Returns:
+            Query: A new query
+        """
+        return self._copy(_prefix=normalize_name(prefix or ''))
+
+    def where(self, predicate):
+        """
+        Only include records for which a function returns true.
+
+        Repeated calls are combined with "and".
+
+        Args:
+            predicate (callable): Called with each record
+
+        Returns:
+            Query: A new query
+        """
+        return self._copy(_predicates=self._predicates + (predicate,))
+
+    def order_by(self, field, reverse=False):
+        """
+        Order the results by an attribute. Missing values sort last.
+
+        Args:
+            field (str): Attribute of the records (e.g., "name" or "latitude")
+            reverse (bool): Sort in descending order
+
+        Returns:
+            Query: A new query
+        """
+        if not hasattr(_CLASSES[self._kind], field):
+            raise ValueError(f'{_CLASSES[self._kind].__name__} has no field {field!r}')
+        return self._copy(_order=field, _reverse=bool(reverse))
+
+    def limit(self, count):
+        """
+        Return at most count results.
+
+        Args:
+            count (int): Largest number of results, or None for all
+
+        Returns:
+            Query: A new query
+        """
+        if count is not None and count < 0:
+            raise ValueError('limit must not be negative')
+        return self._copy(_limit=count)
+
+    def _source(self):
+        """
+        Pick the smallest index that answers the country, state and prefix
+        filters.
+
+        Returns:
+            tuple: (records, by_name) where by_name tells whether the
+                records are already sorted by name
+        """
+        from .autocomplete import _prefix_index
+        registry = get_registry()
+        country_code = self._country
+        state_code = self._state
+        if self._kind == 'city' and state_code and not country_code:
+            raise ValueError('state() requires country()')
+
+        if self._prefix is not None:
+            if self._kind == 'country' and country_code:
+                country = registry.countries.by_code.get(country_code)
+                records = (country,) if country is not None else ()
+                return [r for r in records if normalize_name(r.name).startswith(self._prefix)], True
+            # Results in index order need no more than the limit
+            limit = None if state_code or self._predicates or self._order else self._limit
+            records = _prefix_index(self._kind, country_code).search(self._prefix, limit)
+            if state_code:
+                return [r for r in records if r.state_code == state_code], False
+            return records, False
+
+        if self._kind == 'country':
+            table = registry.countries
+            if country_code:
+                country = table.by_code.get(country_code)
+                return ((country,) if country is not None else ()), True
+            return table.records, False
+        if self._kind == 'state':
+            table = registry.states
+            if country_code:
+                return table.by_country.get(country_code, ()), True
+            return table.records, False
+        if country_code:
+            cities = registry.cities_of_country(country_code)
+            if state_code:
+                return cities.by_state.get((country_code, state_code), ()), True
+            return cities.by_country.get(country_code, ()), True
+        return registry.cities.records, False
+
+    def _filtered(self, records):
+        predicates = self._predicates
+        if not predicates:
+            return iter(records)
+        return (r for r in records if all(predicate(r) for predicate in predicates))
+
+    def __iter__(self):
+        records, by_name = self._source()
+        results = self._filtered(records)
+        limit = self._limit
+        if self._order is None or (self._order == 'name' and by_name and not self._reverse):
+            # Already in the requested order: stream and stop early
+            return iter(results) if limit is None else islice(results, limit)
+        # Records missing the field (e.g., coordinates) are set aside and
+        # follow the ordered ones, whatever the direction
+        key = attrgetter(self._order)
+        missing = []
+
+        def present():
+            for record in results:
+                if key(record) is not None:
+                    yield record
+                elif limit is None or len(missing) < limit:
+                    missing.append(record)
+
+        if limit is None:
+            ordered = sorted(present(), key=key, reverse=self._reverse)
+            return chain(ordered, missing)
+        select = heapq.nlargest if self._reverse else heapq.nsmallest
+        ordered = select(limit, present(), key=key)
+        return islice(chain(ordered, missing), limit)
+
+    def all(self):
+        """
+        Run the query.
+
+        Returns:
+            list: The matching records
+        """
+        return list(self)
+
+    def first(self):
+        """
+        Get the first result.
+
+        Returns:
+            The first matching record, or None
+        """
+        return next(iter(self.limit(1)), None)
+
+    def count(self):
+        """
+        Count the results without building a result list.
+
+        Returns:
+            int: Number of matching records, at most the limit
+        """
+        records, _ = self._source()
+        if self._predicates:
+            total = sum(1 for _ in self._filtered(records))
+        else:
+            total = len(records)
+        return total if self._limit is None else min(total, self._limit)
+
+    def exists(self):
+        """Check whether any record matches."""
+        return self.first() is not None
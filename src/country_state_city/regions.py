@@ -0,0 +1,381 @@
+"""
+Point-in-region lookup of the country and state containing a coordinate.
+
+Boundaries are read from optional GeoJSON files in data/boundaries:
+country.geojson with an "isoCode" property per feature and state.geojson
+with "countryCode" and "isoCode" properties, each feature a Polygon or
+MultiPolygon. A region index is built once per loaded table:
+
+    * The world is divided into 1 degree root cells, and every cell that
+      a region's border passes through is split into quadrants, keeping
+      only the border edges that touch each quadrant, until few edges are
+      left or a fixed depth is reached.
+    * Cells that no border passes through resolve to a single region (or
+      to none) without any polygon test.
+    * Only the cells left on a border run an exact point-in-polygon test
+      against their few candidate regions, which scans a single band of
+      each region's edges.
+
+Without boundary files, locate() falls back to the nearest state centroid
+and reports the result as not exact.
+
+Example:
+    from country_state_city import locate
+
+    location = locate(37.77, -122.42)
+    location.country, location.state, location.exact
+"""
+
+import json
+import os
+from collections import namedtuple
+
+from .dataset import get_registry
+
+BOUNDARY_DIR = 'boundaries'
+
+Location = namedtuple('Location', ['country', 'state', 'exact'])
+Location.__doc__ = """
+The country and state containing a point. exact is False when a centroid
+fallback was used because boundary data is not installed.
+"""
+
+# Size in degrees of the root cells and number of quadrant splits below them
+_ROOT_SIZE = 1.0
+_COLUMNS = 360
+_ROWS = 180
+_MAX_DEPTH = 5
+
+# Cells crossed by at most this many border edges are not split further
+_LEAF_EDGES = 16
+
+# Leaf value of cells outside every region
+_NONE = -1
+
+
+def boundary_path(data_dir, kind):
+    """Get the path of the boundary file of "country" or "state" regions."""
+    return os.path.join(data_dir, BOUNDARY_DIR, f'{kind}.geojson')
+
+
+def _rings(geometry):
+    """Get the rings of a Polygon or MultiPolygon as lists of (x, y) tuples."""
+    if geometry is None:
+        return []
+    if geometry['type'] == 'Polygon':
+        polygons = [geometry['coordinates']]
+    elif geometry['type'] == 'MultiPolygon':
+        polygons = geometry['coordinates']
+    else:
+        return []
+    return [[(float(x), float(y)) for x, y, *_ in ring] for polygon in polygons for ring in polygon]
+
+
+def _contains(rings, x, y):
+    """Even-odd point-in-polygon test over all rings of a region."""
+    inside = False
+    for ring in rings:
+        x1, y1 = ring[-1]
+        for x2, y2 in ring:
+            if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+                inside = not inside
+            x1, y1 = x2, y2
+    return inside
+
+
+class _Region:
+    """
+    Edges of one region bucketed into horizontal bands.
+
+    A horizontal ray only crosses edges spanning its latitude, so the exact
+    test scans one band instead of every edge of the region.
+    """
+    __slots__ = ('bounds', 'edges', 'bands', 'y0', 'height')
+
+    def __init__(self, rings):
+        self.edges = [
+            (x1, y1, x2, y2)
+            for ring in rings
+            for (x1, y1), (x2, y2) in zip(ring[-1:] + ring[:-1], ring)
+        ]
+        xs = [x for ring in rings for x, _ in ring]
+        ys = [y for ring in rings for _, y in ring]
+        self.bounds = (min(xs), min(ys), max(xs), max(ys))
+        self.y0 = self.bounds[1]
+        count = max(1, min(4096, len(self.edges) // 4))
+        self.height = (self.bounds[3] - self.y0) / count or 1.0
+        self.bands = [[] for _ in range(count)]
+        for edge in self.edges:
+            low = self._band(min(edge[1], edge[3]))
+            high = self._band(max(edge[1], edge[3]))
+            for band in range(low, high + 1):
+                self.bands[band].append(edge)
+
+    def _band(self, y):
+        return min(max(int((y - self.y0) / self.height), 0), len(self.bands) - 1)
+
+    def contains(self, x, y):
+        """Test whether a point lies inside the region."""
+        x0, y0, x1, y1 = self.bounds
+        if not (x0 <= x <= x1 and y0 <= y <= y1):
+            return False
+        inside = False
+        for ex1, ey1, ex2, ey2 in self.bands[self._band(y)]:
+            if (ey1 > y) != (ey2 > y) and x < ex1 + (y - ey1) * (ex2 - ex1) / (ey2 - ey1):
+                inside = not inside
+        return inside
+
+
+class RegionIndex:
+    """
+    Quadtree over region boundaries for point lookups.
+
+    Attributes:
+        records (list): The record of each region
+        rings (list): The rings of each region, aligned with records
+    """
+    def __init__(self, regions):
+        self.records = []
+        self.rings = []
+        self._regions = []
+        for record, rings in regions:
+            rings = [ring for ring in rings if len(ring) >= 3]
+            if rings:
+                self.records.append(record)
+                self.rings.append(rings)
+                self._regions.append(_Region(rings))
+
+        # Bounds of the edges of each region that touch each root cell
+        cells = {}
+        for number, region in enumerate(self._regions):
+            touching = {cell: [] for cell in _cells(region.bounds)}
+            for x1, y1, x2, y2 in region.edges:
+                bounds = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+                for cell in _cells(bounds):
+                    touching[cell].append(bounds)
+            for cell, edges in touching.items():
+                cells.setdefault(cell, []).append((number, edges))
+
+        self._roots = [_NONE] * (_COLUMNS * _ROWS)
+        for cell, candidates in cells.items():
+            row, column = divmod(cell, _COLUMNS)
+            x0 = column * _ROOT_SIZE - 180.0
+            y0 = row * _ROOT_SIZE - 90.0
+            self._roots[cell] = self._build((x0, y0, x0 + _ROOT_SIZE, y0 + _ROOT_SIZE), candidates, 0)
+
+    def __len__(self):
+        return len(self.records)
+
+    def _build(self, box, candidates, depth):
+        x0, y0, x1, y1 = box
+        inside = _NONE
+        border = []
+        for region, edges in candidates:
+            touching = [e for e in edges if e[0] <= x1 and x0 <= e[2] and e[1] <= y1 and y0 <= e[3]]
+            if touching:
+                border.append((region, touching))
+            elif self._regions[region].contains((x0 + x1) / 2, (y0 + y1) / 2):
+                # No border crosses the cell, so the whole cell is inside
+                inside = region
+        if not border:
+            return inside
+        if depth == _MAX_DEPTH or sum(len(edges) for _, edges in border) <= _LEAF_EDGES:
+            regions = [region for region, _ in border]
+            if inside != _NONE:
+                regions.append(inside)
+            return tuple(regions)
+        xm = (x0 + x1) / 2
+        ym = (y0 + y1) / 2
+        if inside != _NONE:
+            border.append((inside, []))
+        # Children ordered (south-west, south-east, north-west, north-east)
+        return [
+            self._build(child, border, depth + 1)
+            for child in ((x0, y0, xm, ym), (xm, y0, x1, ym), (x0, ym, xm, y1), (xm, ym, x1, y1))
+        ]
+
+    def lookup(self, latitude, longitude):
+        """
+        Find the region containing a point.
+
+        Args:
+            latitude (float): Latitude in degrees
+            longitude (float): Longitude in degrees
+
+        Returns:
+            The record of the containing region, or None
+        """
+        return self.lookup_many((latitude,), (longitude,))[0]
+
+    def lookup_many(self, latitudes, longitudes):
+        """
+        Find the regions containing many points.
+
+        Args:
+            latitudes (iterable): Latitudes in degrees
+            longitudes (iterable): Longitudes in degrees, aligned with latitudes
+
+        Returns:
+            list: The record of each containing region, or None
+        """
+        roots = self._roots
+        records = self.records
+        regions = self._regions
+        results = []
+        append = results.append
+        for latitude, longitude in zip(latitudes, longitudes):
+            if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+                append(None)
+                continue
+            fx = (longitude + 180.0) / _ROOT_SIZE
+            fy = (latitude + 90.0) / _ROOT_SIZE
+            column = int(fx)
+            row = int(fy)
+            if column == _COLUMNS:
+                column -= 1
+            if row == _ROWS:
+                row -= 1
+            node = roots[row * _COLUMNS + column]
+            if type(node) is int:
+                append(None if node == _NONE else records[node])
+                continue
+            fx -= column
+            fy -= row
+            while type(node) is list:
+                fx *= 2
+                fy *= 2
+                child = 0
+                if fx >= 1.0:
+                    fx -= 1.0
+                    child = 1
+                if fy >= 1.0:
+                    fy -= 1.0
+                    child += 2
+                node = node[child]
+            if type(node) is int:
+                append(None if node == _NONE else records[node])
+                continue
+            for region in node:
+                if regions[region].contains(longitude, latitude):
+                    append(records[region])
+                    break
+            else:
+                append(None)
+        return results
+
+
+def _cells(bounds):
+    """Get the numbers of the root cells overlapping a bounding box."""
+    x0, y0, x1, y1 = bounds
+    first_column = min(max(int((x0 + 180.0) // _ROOT_SIZE), 0), _COLUMNS - 1)
+    last_column = min(max(int((x1 + 180.0) // _ROOT_SIZE), 0), _COLUMNS - 1)
+    first_row = min(max(int((y0 + 90.0) // _ROOT_SIZE), 0), _ROWS - 1)
+    last_row = min(max(int((y1 + 90.0) // _ROOT_SIZE), 0), _ROWS - 1)
+    return [
+        row * _COLUMNS + column
+        for row in range(first_row, last_row + 1)
+        for column in range(first_column, last_column + 1)
+    ]
+
+
+def _read_regions(path, resolve):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            collection = json.load(f)
+    except FileNotFoundError:
+        return []
+    regions = []
+    for feature in collection.get('features', ()):
+        record = resolve(feature.get('properties') or {})
+        if record is not None:
+            regions.append((record, _rings(feature.get('geometry'))))
+    return regions
+
+
+def get_region_index(kind):
+    """
+    Get the cached region index of "country" or "state" boundaries.
+
+    Returns:
+        RegionIndex: The index, empty when no boundary file is installed
+    """
+    registry = get_registry()
+    path = boundary_path(registry.data_dir, kind)
+    if kind == 'country':
+        table = registry.countries
+
+        def resolve(properties):
+            return table.by_code.get(properties.get('isoCode'))
+    elif kind == 'state':
+        table = registry.states
+
+        def resolve(properties):
+            return table.by_code.get((properties.get('countryCode'), properties.get('isoCode')))
+    else:
+        raise ValueError(f"kind must be country or state, not {kind!r}")
+    return table.derived('regions', lambda: RegionIndex(_read_regions(path, resolve)))
+
+
+def _locate_all(latitudes, longitudes):
+    from .models import State
+    countries = get_region_index('country')
+    states = get_region_index('state')
+    found_states = states.lookup_many(latitudes, longitudes) if states else None
+    if countries:
+        found_countries = countries.lookup_many(latitudes, longitudes)
+    elif states:
+        found_countries = [state.country if state is not None else None for state in found_states]
+    else:
+        found_countries = None
+
+    if states and (countries or all(found_states)):
+        return [Location(country, state, True) for country, state in zip(found_countries, found_states)]
+
+    results = []
+    for i, (latitude, longitude) in enumerate(zip(latitudes, longitudes)):
+        if states and found_states[i] is not None:
+            results.append(Location(found_countries[i], found_states[i], True))
+            continue
+        country = found_countries[i] if found_countries else None
+        if country is not None:
+            neighbors = State.nearest(latitude, longitude, 1, country.iso2)
+            results.append(Location(country, neighbors[0].record if neighbors else None, False))
+        elif countries:
+            # Exactly outside every country
+            results.append(Location(None, None, True))
+        else:
+            # No usable boundaries: fall back to the nearest state centroid
+            neighbors = State.nearest(latitude, longitude, 1)
+            state = neighbors[0].record if neighbors else None
+            results.append(Location(state.country if state else None, state, False))
+    return results
+
+
+def locate(latitude, longitude):
+    """
+    Find the country and state containing a point.
+
+    Args:
+        latitude (float): Latitude in degrees
+        longitude (float): Longitude in degrees
+
+    Returns:
+        Location: (country, state, exact). With boundary data, country and
+            state are None for points outside every region. Without it,
+            the nearest state centroid is used and exact is False.
+    """
+    return _locate_all((latitude,), (longitude,))[0]
+
+
+def locate_many(latitudes, longitudes):
+    """
+    Locate many points at once.
+
+    Args:
+        latitudes (iterable): Latitudes in degrees (lists or NumPy arrays)
+        longitudes (iterable): Longitudes in degrees, aligned with latitudes
+
+    Returns:
+        list: Location tuples aligned with the input
+    """
+    return _locate_all([float(lat) for lat in latitudes], [float(lon) for lon in longitudes])
@@ -0,0 +1,155 @@
+"""
+Per-country shards of the city dataset.
+
+Cities are stored as one JSON Lines file per country under data/cities,
+named after the ISO country code (e.g., data/cities/US.jsonl). Each line
+holds one city record, and records are sorted by state code and then by
+name, so the cities of one state form a contiguous run of lines. Shards
+can be streamed line by line without loading the rest of the dataset.
+"""
+
+import json
+import os
+
+SHARD_DIR = 'cities'
+SHARD_SUFFIX = '.jsonl'
+
+
+def shard_dir(data_dir):
+    """Get the directory holding the city shards of data_dir."""
+    return os.path.join(data_dir, SHARD_DIR)
+
+
+def shard_path(data_dir, country_code):
+    """
+    Get the path of the city shard for a country.
+
+    Returns:
+        str: The shard path, or None if country_code is not a valid code
+    """
+    if not country_code or not country_code.isalnum():
+        return None
+    return os.path.join(shard_dir(data_dir), country_code + SHARD_SUFFIX)
+
+
+def has_shards(data_dir):
+    """Check whether data_dir contains a sharded city dataset."""
+    return os.path.isdir(shard_dir(data_dir))
+
+
+def shard_countries(data_dir):
+    """
+    List the countries that have a city shard.
+
+    Args:
+        data_dir (str): Directory containing the data files
+
+    Returns:
+        list: Sorted ISO country codes
+    """
+    if not has_shards(data_dir):
+        return []
+    return sorted(
+        name[:-len(SHARD_SUFFIX)] for name in os.listdir(shard_dir(data_dir))
+        if name.endswith(SHARD_SUFFIX)
+    )
+
+
+def _shard_key(record):
+    return (record.get('stateCode') or '', record.get('name') or '')
+
+
+def write_shards(records, data_dir):
+    """
+    Split city records into per-country shards.
+
+    Existing shards in data_dir are replaced.
+
+    Args:
+        records (iterable): City dictionaries as found in city.json
+        data_dir (str): Directory to write the cities/ shard directory into
+
+    Returns:
+        dict: Number of cities written per country code
+    """
+    by_country = {}
+    for record in records:
+        by_country.setdefault(record.get('countryCode') or '', []).append(record)
+
+    clear_shards(data_dir)
+    counts = {}
+    for country_code, cities in sorted(by_country.items()):
+        path = shard_path(data_dir, country_code)
+        if path is None:
+            continue
+        cities.sort(key=_shard_key)
+        write_shard(cities, path)
+        counts[country_code] = len(cities)
+    return counts
+
+
+def clear_shards(data_dir):
+    """Create the shard directory of data_dir, removing any existing shards."""
+    directory = shard_dir(data_dir)
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith(SHARD_SUFFIX):
+            os.remove(os.path.join(directory, name))
+
+
+def write_shard(records, path):
+    """Write already sorted city records of one country to a shard file."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, sort_keys=True))
+            f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def iter_shard(path, state_code=None):
+    """
+    Stream the city dictionaries of one shard.
+
+    Args:
+        path (str): Path of the shard file. Missing shards yield nothing.
+        state_code (str): Only yield cities of this state. Reading stops
+            once the state's run of lines has been passed.
+
+    Yields:
+        dict: City records in shard order
+    """
+    if path is None:
+        return
+    try:
+        f = open(path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return
+    with f:
+        seen = False
+        for line in f:
+            record = json.loads(line)
+            if state_code is not None:
+                if record.get('stateCode') != state_code:
+                    if seen:
+                        break
+                    continue
+                seen = True
+            yield record
+
+
+def iter_records(data_dir, country_code=None, state_code=None):
+    """
+    Stream city dictionaries from the shards of data_dir.
+
+    Args:
+        data_dir (str): Directory containing the data files
+        country_code (str): Only read the shard of this country
+        state_code (str): Only yield cities of this state
+
+    Yields:
+        dict: City records, shard by shard
+    """
+    countries = [country_code] if country_code else shard_countries(data_dir)
+    for code in countries:
+        yield from iter_shard(shard_path(data_dir, code), state_code)
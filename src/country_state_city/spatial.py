@@ -0,0 +1,264 @@
+"""
+Spatial index for nearest-place and radius queries.
+
+Coordinates are projected onto the unit sphere and stored in a KD-tree, so
+the straight-line (chord) distance between two points orders them exactly
+like the great-circle distance. Trees are built once per table, or per
+country bucket, and cached until the dataset is reloaded.
+
+Example:
+    from country_state_city import State
+
+    State.nearest(37.77, -122.42)
+    # [Neighbor(record=<State: California (CA)>, distance=...)]
+"""
+
+import heapq
+import math
+from collections import namedtuple
+
+from . import indexes
+from .dataset import get_registry
+
+EARTH_RADIUS_KM = 6371.0088
+
+Neighbor = namedtuple('Neighbor', ['record', 'distance'])
+Neighbor.__doc__ = """A nearby record and its great-circle distance in kilometres."""
+
+# Points per leaf of the KD-tree
+_LEAF_SIZE = 16
+
+
+def to_unit_vector(latitude, longitude):
+    """Project a latitude/longitude pair in degrees onto the unit sphere."""
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    cos_lat = math.cos(lat)
+    return (cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat))
+
+
+def chord_to_km(chord):
+    """Convert a chord length on the unit sphere to a great-circle distance in km."""
+    return 2 * math.asin(min(1.0, chord / 2)) * EARTH_RADIUS_KM
+
+
+def km_to_chord(km):
+    """Convert a great-circle distance in km to a chord length on the unit sphere."""
+    angle = min(math.pi, km / EARTH_RADIUS_KM)
+    return 2 * math.sin(angle / 2)
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """
+    Compute the great-circle distance between two points.
+
+    Args:
+        lat1 (float): Latitude of the first point in degrees
+        lon1 (float): Longitude of the first point in degrees
+        lat2 (float): Latitude of the second point in degrees
+        lon2 (float): Longitude of the second point in degrees
+
+    Returns:
+        float: Distance in kilometres
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+
+
+class KDTree:
+    """
+    Static KD-tree over records with coordinates.
+
+    Records without a latitude or longitude are left out.
+
+    Attributes:
+        records (list): Indexed records
+        points (list): Unit vectors aligned with records
+    """
+    def __init__(self, records):
+        self._project(records)
+        self._columns = [list(values) for values in zip(*self.points)] or [[], [], []]
+        self._order = list(range(len(self.points)))
+        # Nodes are (start, stop, axis, split, left, right); leaves have axis -1
+        self._nodes = []
+        self._root = self._build(0, len(self._order)) if self._order else None
+        del self._columns
+
+    @classmethod
+    def from_nodes(cls, records, order, nodes):
+        """
+        Rebuild a tree from the order and nodes of a previously built one.
+
+        Args:
+            records (list): The records the tree was built from
+            order (list): The tree's permutation of indexed positions
+            nodes (list): The tree's (start, stop, axis, split, left, right)
+                node tuples
+
+        Returns:
+            KDTree: A tree equal to the original, without re-splitting
+        """
+        tree = cls.__new__(cls)
+        tree._project(records)
+        if len(order) != len(tree.points):
+            raise ValueError("order does not match the records")
+        tree._order = list(order)
+        tree._nodes = [tuple(node) for node in nodes]
+        tree._root = 0 if tree._nodes else None
+        return tree
+
+    def to_nodes(self):
+        """
+        Get the tree structure for storing it alongside the records.
+
+        Returns:
+            tuple: (order, nodes) as accepted by from_nodes
+        """
+        return list(self._order), [list(node) for node in self._nodes]
+
+    def _project(self, records):
+        self.records = []
+        self.points = []
+        for record in records:
+            if record.latitude is None or record.longitude is None:
+                continue
+            self.records.append(record)
+            self.points.append(to_unit_vector(record.latitude, record.longitude))
+
+    def __len__(self):
+        return len(self.records)
+
+    def _build(self, start, stop):
+        order = self._order
+        if stop - start <= _LEAF_SIZE:
+            self._nodes.append((start, stop, -1, 0.0, -1, -1))
+            return len(self._nodes) - 1
+
+        # Split along the axis with the largest spread, estimated from a sample
+        sample = order[start:stop:max(1, (stop - start) // 64)]
+        spreads = []
+        for column in self._columns:
+            values = list(map(column.__getitem__, sample))
+            spreads.append(max(values) - min(values))
+        axis = spreads.index(max(spreads))
+        column = self._columns[axis]
+        order[start:stop] = sorted(order[start:stop], key=column.__getitem__)
+        middle = (start + stop) // 2
+        split = column[order[middle]]
+
+        node = len(self._nodes)
+        self._nodes.append(None)
+        left = self._build(start, middle)
+        right = self._build(middle, stop)
+        self._nodes[node] = (start, stop, axis, split, left, right)
+        return node
+
+    def nearest(self, latitude, longitude, k=1):
+        """
+        Find the k records closest to a point.
+
+        Args:
+            latitude (float): Latitude in degrees
+            longitude (float): Longitude in degrees
+            k (int): Number of records to return
+
+        Returns:
+            list: Neighbor tuples ordered by distance
+        """
+        if self._root is None or k <= 0:
+            return []
+        query = to_unit_vector(latitude, longitude)
+        nodes = self._nodes
+        order = self._order
+        points = self.points
+        heap = []  # (-squared chord, position) for the best k so far
+
+        def visit(node):
+            start, stop, axis, split, left, right = nodes[node]
+            if axis < 0:
+                qx, qy, qz = query
+                for position in order[start:stop]:
+                    x, y, z = points[position]
+                    d = (x - qx) ** 2 + (y - qy) ** 2 + (z - qz) ** 2
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-d, position))
+                    elif d < -heap[0][0]:
+                        heapq.heapreplace(heap, (-d, position))
+                return
+            diff = query[axis] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                visit(far)
+
+        visit(self._root)
+        return [
+            Neighbor(self.records[position], chord_to_km(math.sqrt(-d)))
+            for d, position in sorted(heap, reverse=True)
+        ]
+
+    def within_radius(self, latitude, longitude, km):
+        """
+        Find all records within a great-circle distance of a point.
+
+        Args:
+            latitude (float): Latitude in degrees
+            longitude (float): Longitude in degrees
+            km (float): Radius in kilometres
+
+        Returns:
+            list: Neighbor tuples ordered by distance
+        """
+        if self._root is None or km < 0:
+            return []
+        query = to_unit_vector(latitude, longitude)
+        limit = km_to_chord(km) ** 2
+        nodes = self._nodes
+        order = self._order
+        points = self.points
+        found = []
+        stack = [self._root]
+        while stack:
+            start, stop, axis, split, left, right = nodes[stack.pop()]
+            if axis < 0:
+                qx, qy, qz = query
+                for position in order[start:stop]:
+                    x, y, z = points[position]
+                    d = (x - qx) ** 2 + (y - qy) ** 2 + (z - qz) ** 2
+                    if d <= limit:
+                        found.append((d, position))
+                continue
+            diff = query[axis] - split
+            if diff < 0 or diff * diff <= limit:
+                stack.append(left)
+            if diff >= 0 or diff * diff <= limit:
+                stack.append(right)
+        found.sort()
+        return [Neighbor(self.records[p], chord_to_km(math.sqrt(d))) for d, p in found]
+
+
+def get_tree(kind, country_code=None):
+    """
+    Get the cached KD-tree of one kind of record.
+
+    Args:
+        kind (str): "country", "state" or "city"
+        country_code (str): Only index records of this country
+
+    Returns:
+        KDTree: The tree, built on first use
+    """
+    registry = get_registry()
+    table, records = registry.records_of(kind, country_code)
+
+    def build():
+        if country_code:
+            index = indexes.prebuilt(registry.data_dir, kind, country_code, records)
+            if index is not None:
+                tree = index['kdtree']
+                return KDTree.from_nodes(records, tree['order'], tree['nodes'])
+        return KDTree(records)
+    return table.derived(('kdtree', country_code or None), build)
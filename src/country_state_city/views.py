@@ -0,0 +1,261 @@
+"""
+Zero-copy record views over the compiled dataset.
+
+This is an alternative read mode to the static methods on State and City.
+Instead of materialized model objects, listings return sequences of small
+views that point at a row of the memory-mapped artifact. Fields are
+decoded only when they are accessed, and taking the length of a listing
+decodes nothing at all. The compiled artifact must be available (see
+country_state_city.build).
+
+Example:
+    from country_state_city import views
+
+    cities = views.get_cities_of_country('US')
+    print(len(cities))
+    for city in cities[:5]:
+        print(city.name, city.state_code)
+"""
+
+from collections.abc import Sequence
+
+from .dataset import get_registry
+from .models import _format_coordinate
+
+
+class RecordView:
+    """
+    Base class for a view of one row of a compiled table.
+
+    Attributes:
+        row (int): Row number of the record in the compiled table
+    """
+    __slots__ = ('_artifact', 'row')
+
+    _table = None
+    _fields = ()
+
+    def __init__(self, artifact, row):
+        self._artifact = artifact
+        self.row = row
+
+    def _string(self, field):
+        artifact = self._artifact
+        return artifact.string(artifact.column(f'{self._table}.{field}')[self.row])
+
+    def _float(self, field):
+        value = self._artifact.column(f'{self._table}.{field}')[self.row]
+        return None if value != value else value
+
+    @property
+    def name(self):
+        return self._string('name')
+
+    @property
+    def latitude(self):
+        return self._float('latitude')
+
+    @property
+    def longitude(self):
+        return self._float('longitude')
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._artifact is other._artifact and self.row == other.row
+
+    def __hash__(self):
+        return hash((id(self._artifact), self.row))
+
+
+class StateView(RecordView):
+    """
+    View of a compiled state record with the same fields as State.
+
+    Attributes:
+        name (str): Full state name
+        country_code (str): ISO country code this state belongs to
+        iso_code (str): State code
+        latitude (float): Latitude of state's center
+        longitude (float): Longitude of state's center
+    """
+    __slots__ = ()
+    _table = 'state'
+
+    @property
+    def country_code(self):
+        return self._string('country_code')
+
+    @property
+    def iso_code(self):
+        return self._string('iso_code')
+
+    def to_dict(self):
+        """Convert the state to a dictionary, matching State.to_dict."""
+        return {
+            'name': self.name,
+            'countryCode': self.country_code,
+            'isoCode': self.iso_code,
+            'latitude': _format_coordinate(self.latitude),
+            'longitude': _format_coordinate(self.longitude)
+        }
+
+    def __repr__(self):
+        return f"<StateView: {self.name} ({self.iso_code})>"
+
+
+class CityView(RecordView):
+    """
+    View of a compiled city record with the same fields as City.
+
+    Attributes:
+        name (str): City name
+        country_code (str): ISO country code this city belongs to
+        state_code (str): State code this city belongs to
+        latitude (float): Latitude of city's center
+        longitude (float): Longitude of city's center
+    """
+    __slots__ = ()
+    _table = 'city'
+
+    @property
+    def country_code(self):
+        return self._string('country_code')
+
+    @property
+    def state_code(self):
+        return self._string('state_code')
+
+    def to_dict(self):
+        """Convert the city to a dictionary, matching City.to_dict."""
+        return {
+            'name': self.name,
+            'countryCode': self.country_code,
+            'stateCode': self.state_code,
+            'latitude': _format_coordinate(self.latitude),
+            'longitude': _format_coordinate(self.longitude)
+        }
+
+    def __repr__(self):
+        return f"<CityView: {self.name}>"
+
+
+class ViewSequence(Sequence):
+    """
+    Lazy, read-only sequence of record views.
+
+    Views are created one at a time as items are accessed. len() and
+    slicing do not touch the records themselves.
+    """
+    __slots__ = ('_artifact', '_view', '_rows')
+
+    def __init__(self, artifact, view, rows):
+        self._artifact = artifact
+        self._view = view
+        self._rows = rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ViewSequence(self._artifact, self._view, self._rows[index])
+        return self._view(self._artifact, self._rows[index])
+
+    def __iter__(self):
+        view = self._view
+        artifact = self._artifact
+        for row in self._rows:
+            yield view(artifact, row)
+
+    def __repr__(self):
+        return f"<ViewSequence: {len(self)} {self._view._table} records>"
+
+
+def _artifact(table):
+    artifact = get_registry().artifact
+    if artifact is None or not artifact.has_table(table):
+        raise FileNotFoundError(
+            f"No compiled {table} data found; run python -m country_state_city.build"
+        )
+    return artifact
+
+
+def _all(table, view):
+    artifact = _artifact(table)
+    return ViewSequence(artifact, view, range(artifact.rows(table)))
+
+
+def _bucket(table, view, prefix, key):
+    artifact = _artifact(table)
+    start, stop = artifact.buckets(prefix).get(key, (0, 0))
+    return ViewSequence(artifact, view, artifact.column(f'{prefix}.order')[start:stop])
+
+
+def get_states():
+    """
+    Get views of all states in file order.
+
+    Returns:
+        ViewSequence: StateView objects for every state in the dataset
+    """
+    return _all('state', StateView)
+
+
+def get_states_of_country(country_code):
+    """
+    Get views of the states of a country.
+
+    Args:
+        country_code (str): The ISO 3166-1 alpha-2 country code (e.g., "US")
+
+    Returns:
+        ViewSequence: StateView objects sorted alphabetically by name.
+            Empty if the country is not found.
+    """
+    if not country_code:
+        return ViewSequence(None, StateView, ())
+    return _bucket('state', StateView, 'state.country', country_code)
+
+
+def get_cities():
+    """
+    Get views of all cities in file order.
+
+    Returns:
+        ViewSequence: CityView objects for every city in the dataset
+    """
+    return _all('city', CityView)
+
+
+def get_cities_of_state(country_code, state_code):
+    """
+    Get views of the cities of a state.
+
+    Args:
+        country_code (str): The ISO 3166-1 alpha-2 country code (e.g., "US")
+        state_code (str): The state code (e.g., "CA" for California)
+
+    Returns:
+        ViewSequence: CityView objects sorted alphabetically by name.
+            Empty if the state is not found.
+    """
+    if not country_code or not state_code:
+        return ViewSequence(None, CityView, ())
+    return _bucket('city', CityView, 'city.state', (country_code, state_code))
+
+
+def get_cities_of_country(country_code):
+    """
+    Get views of the cities of a country.
+
+    Args:
+        country_code (str): The ISO 3166-1 alpha-2 country code (e.g., "US")
+
+    Returns:
+        ViewSequence: CityView objects sorted alphabetically by name.
+            Empty if the country is not found.
+    """
+    if not country_code:
+        return ViewSequence(None, CityView, ())
+    return _bucket('city', CityView, 'city.country', country_code)
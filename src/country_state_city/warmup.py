@@ -0,0 +1,145 @@
+"""
+Pre-fork warmup for multi-process servers.
+
+Call preload() in the master process of a pre-forking server (gunicorn
+--preload, uwsgi without lazy-apps) before workers are forked. Tables and
+indexes are then built once and inherited by every worker through
+copy-on-write pages instead of being parsed again in each worker.
+
+The parent rows of every state and city are resolved as well, so that
+navigating to a parent (e.g., city.state) in a worker reads the inherited
+records without writing to them.
+
+After loading, the garbage collector is run and all surviving objects are
+moved to the permanent generation with gc.freeze(), so collections in the
+workers never traverse, and thereby write to, the inherited objects.
+Reference counting still writes to objects a worker touches; the compiled
+artifact's columns are buffer-backed and stay shared regardless.
+
+Example:
+    # gunicorn.conf.py
+    import country_state_city
+
+    preload_app = True
+
+    def on_starting(server):
+        country_state_city.preload()
+
+    def post_fork(server, worker):
+        usage = country_state_city.memory_usage()
+        server.log.info("worker %s unique memory: %s bytes", worker.pid, usage['uss'])
+"""
+
+import gc
+
+from .dataset import get_registry, row_positions
+
+# Fields of /proc/<pid>/smaps_rollup, in kB
+_SMAPS_FIELDS = {
+    'Rss': 'rss',
+    'Pss': 'pss',
+    'Shared_Clean': 'shared',
+    'Shared_Dirty': 'shared',
+    'Private_Clean': 'uss',
+    'Private_Dirty': 'uss',
+}
+
+
+def _warm_indexes(kind):
+    from .autocomplete import _prefix_index
+    from .fuzzy import _trigram_index
+    from .models import _NAME_KEYS, _currency_index, _names_index, _phone_index, _timezone_index
+    from .regions import get_region_index
+    from .spatial import get_tree
+
+    table, _ = get_registry().records_of(kind)
+    _names_index(table, _NAME_KEYS[kind])
+    _prefix_index(kind)
+    _trigram_index(kind)
+    get_tree(kind)
+    if kind != 'city':
+        row_positions(table)
+        get_region_index(kind)
+    if kind == 'country':
+        _timezone_index()
+        _phone_index()
+        _currency_index()
+
+
+def _link_parents(kinds):
+    """Store the parent rows of every loaded state and city."""
+    registry = get_registry()
+    for state in registry.states.records:
+        state.country
+    if 'city' in kinds:
+        for city in registry.cities.records:
+            city.country
+            city.state
+
+
+def preload(cities=True, indexes=True, freeze=True):
+    """
+    Load the dataset and its indexes, then freeze them for forking.
+
+    Args:
+        cities (bool): Also load the city table, if city data is installed
+        indexes (bool): Also build the name, prefix, fuzzy, spatial and
+            boundary indexes over whole tables. Country-scoped indexes are still
+            built on first use.
+        freeze (bool): Collect garbage and call gc.freeze() afterwards
+            (Python 3.7+)
+
+    Returns:
+        list: The kinds of record that were loaded
+    """
+    registry = get_registry()
+    registry.countries
+    registry.states
+    kinds = ['country', 'state']
+    if cities:
+        try:
+            registry.cities
+        except FileNotFoundError:
+            pass
+        else:
+            kinds.append('city')
+    _link_parents(kinds)
+
+    if indexes:
+        for kind in kinds:
+            _warm_indexes(kind)
+
+    if freeze:
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+    return kinds
+
+
+def memory_usage(pid=None):
+    """
+    Report the memory of a process split into shared and unique pages.
+
+    The unique set size (USS) is the memory that would be freed if the
+    process exited, which is what each forked worker really costs.
+
+    Args:
+        pid (int): The process to inspect, defaults to the current one
+
+    Returns:
+        dict: "rss", "pss", "shared" and "uss" in bytes, or None if the
+            platform does not provide /proc/<pid>/smaps_rollup (Linux 4.14+)
+    """
+    path = f"/proc/{pid or 'self'}/smaps_rollup"
+    try:
+        f = open(path, 'r')
+    except OSError:
+        return None
+    usage = dict.fromkeys(('rss', 'pss', 'shared', 'uss'), 0)
+    with f:
+        for line in f:
+            field, _, value = line.partition(':')
+            name = _SMAPS_FIELDS.get(field)
+            if name is not None:
+                usage[name] += int(value.split()[0]) * 1024
+    return usage
@@ -1 +1,56 @@
-# Test package initialization
\ No newline at end of file
+# Test package initialization
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from country_state_city import dataset, shards
+from country_state_city.dataset import Registry
+
+# A few cities of two countries, used as sharded city data
+CITIES = [
+    {"name": "Oakland", "countryCode": "US", "stateCode": "CA",
+     "latitude": "37.80437000", "longitude": "-122.27080000"},
+    {"name": "Albany", "countryCode": "US", "stateCode": "NY",
+     "latitude": "42.65258000", "longitude": "-73.75623000"},
+    {"name": "Fresno", "countryCode": "US", "stateCode": "CA",
+     "latitude": "36.74773000", "longitude": "-119.77237000"},
+    {"name": "Pune", "countryCode": "IN", "stateCode": "MH",
+     "latitude": "18.51957000", "longitude": "73.85535000"},
+    {"name": "Mumbai", "countryCode": "IN", "stateCode": "MH",
+     "latitude": "19.07283000", "longitude": "72.88261000"},
+]
+
+
+class DataDirTestCase(unittest.TestCase):
+    """
+    Base class for tests that run against a private copy of the data files.
+
+    setUp copies country.json and state.json into a temporary data_dir,
+    writes the CITIES of the class as city shards when it has any, and
+    points the process-wide registry at a new Registry over data_dir until
+    the test ends. The registry reads nothing until it is used, so tests
+    may add more files to data_dir first.
+    """
+    CITIES = None
+    USE_ARTIFACT = True
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        for name in ('country.json', 'state.json'):
+            shutil.copy(os.path.join(dataset.DATA_DIR, name), self.data_dir)
+        if self.CITIES is not None:
+            self.counts = shards.write_shards(self.CITIES, self.data_dir)
+        self.registry = Registry(self.data_dir, use_artifact=self.USE_ARTIFACT)
+        patcher = mock.patch.object(dataset, '_registry', self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_json(self, name, data):
+        """Write a JSON file into data_dir."""
+        with open(os.path.join(self.data_dir, name), 'w', encoding='utf-8') as f:
+            json.dump(data, f)
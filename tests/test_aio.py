@@ -0,0 +1,104 @@
+"""
+Tests for the asyncio facade.
+"""
+
+import asyncio
+import threading
+from unittest import mock
+
+from country_state_city import State, aio, instrumentation, models, shards
+from tests import CITIES, DataDirTestCase
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestAio(DataDirTestCase):
+    USE_ARTIFACT = False
+
+    def test_wrappers_match_sync_results(self):
+        """Test that the async wrappers return the same records."""
+        states = run(aio.get_states_of_country('US'))
+        self.assertEqual(states, State.get_states_of_country('US'))
+        country = run(aio.get_country_by_code('IN'))
+        self.assertEqual(country.name, 'India')
+        self.assertIsNone(run(aio.get_state_by_code('US', 'XX')))
+
+    def test_concurrent_awaiters_share_one_load(self):
+        """Test that concurrent first calls coalesce onto a single load."""
+        release = threading.Event()
+        loads = []
+        load_table = aio._load_table
+
+        def slow_load(registry, name, names=False):
+            loads.append(name)
+            release.wait(5)
+            load_table(registry, name, names)
+
+        async def scenario():
+            tasks = [asyncio.ensure_future(aio.get_states_of_country('US')) for _ in range(8)]
+            await asyncio.sleep(0.05)
+            release.set()
+            return await asyncio.gather(*tasks)
+
+        with mock.patch.object(aio, '_load_table', slow_load):
+            results = run(scenario())
+        self.assertEqual(loads, ['states'])
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(aio._pending, {})
+
+    def test_loaded_tables_skip_the_executor(self):
+        """Test that later calls are served from memory."""
+        run(aio.preload())
+        self.assertTrue(self.registry.is_loaded('states'))
+        with mock.patch.object(aio, '_get_executor') as executor:
+            run(aio.get_states())
+        executor.assert_not_called()
+
+    def test_name_index_built_off_the_loop(self):
+        """Test that by-name lookups build their index on the executor."""
+        threads = []
+        names_index = models._names_index
+
+        def record_thread(table, key):
+            if 'names' not in table.indexes:
+                threads.append(threading.current_thread())
+            return names_index(table, key)
+
+        with mock.patch.object(models, '_names_index', record_thread):
+            state = run(aio.get_state_by_name('US', 'california'))
+            country = run(aio.get_country_by_name('India'))
+        self.assertEqual((state.iso_code, country.iso2), ('CA', 'IN'))
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.main_thread(), threads)
+        with mock.patch.object(aio, '_get_executor') as executor:
+            run(aio.get_state_by_name('US', 'texas'))
+        executor.assert_not_called()
+
+    def test_country_without_cities(self):
+        """Test that the empty city table of a country is kept."""
+        shards.write_shards(CITIES, self.data_dir)
+        self.assertEqual(run(aio.get_cities_of_country('GB')), [])
+        self.assertTrue(self.registry.is_loaded(('cities', 'GB')))
+        with mock.patch.object(aio, '_get_executor') as executor:
+            run(aio.get_cities_of_country('GB'))
+        executor.assert_not_called()
+        self.assertEqual(run(aio.get_cities_of_country('XX')), [])
+        self.assertFalse(self.registry.is_loaded(('cities', 'XX')))
+
+    def test_wrappers_installed_later(self):
+        """Test that methods wrapped after import are called."""
+        self.addCleanup(instrumentation.disable)
+        metrics = instrumentation.enable()
+        run(aio.get_states_of_country('US'))
+        self.assertEqual(metrics.snapshot()['calls']['State.get_states_of_country']['count'], 1)
+
+    def test_run(self):
+        """Test running an arbitrary call on the executor."""
+        neighbors = run(aio.run(State.nearest, 37.77, -122.42, country_code='US'))
+        self.assertEqual(neighbors[0].record.iso_code, 'CA')
@@ -9,6 +9,24 @@ from tests.test_country import TestCountry
 from tests.test_state import TestState
 from tests.test_city import TestCity
 from tests.test_timezone import TestTimezone
+from tests.test_dataset import TestRegistry, TestBuckets, TestModelCaching
+from tests.test_binary import TestBinaryDataset
+from tests.test_views import TestViews
+from tests.test_shards import TestShards
+from tests.test_autocomplete import TestSearch, TestSearchWithoutCities
+from tests.test_fuzzy import TestFuzzy
+from tests.test_spatial import TestSpatial
+from tests.test_batch import TestBatch
+from tests.test_columns import TestColumns
+from tests.test_aio import TestAio
+from tests.test_build import TestBuild
+from tests.test_warmup import TestWarmup
+from tests.test_imports import TestImports
+from tests.test_instrumentation import TestInstrumentation
+from tests.test_cache import TestResultCache, TestShardCache
+from tests.test_regions import TestRegions
+from tests.test_query import TestQuery, TestCityQuery
+from tests.test_delta import TestDelta
 
 
 if __name__ == '__main__':
@@ -20,6 +38,29 @@ if __name__ == '__main__':
     test_suite.addTest(unittest.makeSuite(TestState))
     test_suite.addTest(unittest.makeSuite(TestCity))
     test_suite.addTest(unittest.makeSuite(TestTimezone))
+    test_suite.addTest(unittest.makeSuite(TestRegistry))
+    test_suite.addTest(unittest.makeSuite(TestBuckets))
+    test_suite.addTest(unittest.makeSuite(TestModelCaching))
+    test_suite.addTest(unittest.makeSuite(TestBinaryDataset))
+    test_suite.addTest(unittest.makeSuite(TestViews))
+    test_suite.addTest(unittest.makeSuite(TestShards))
+    test_suite.addTest(unittest.makeSuite(TestSearch))
+    test_suite.addTest(unittest.makeSuite(TestSearchWithoutCities))
+    test_suite.addTest(unittest.makeSuite(TestFuzzy))
+    test_suite.addTest(unittest.makeSuite(TestSpatial))
+    test_suite.addTest(unittest.makeSuite(TestBatch))
+    test_suite.addTest(unittest.makeSuite(TestColumns))
+    test_suite.addTest(unittest.makeSuite(TestAio))
+    test_suite.addTest(unittest.makeSuite(TestBuild))
+    test_suite.addTest(unittest.makeSuite(TestWarmup))
+    test_suite.addTest(unittest.makeSuite(TestImports))
+    test_suite.addTest(unittest.makeSuite(TestInstrumentation))
+    test_suite.addTest(unittest.makeSuite(TestResultCache))
+    test_suite.addTest(unittest.makeSuite(TestShardCache))
+    test_suite.addTest(unittest.makeSuite(TestRegions))
+    test_suite.addTest(unittest.makeSuite(TestQuery))
+    test_suite.addTest(unittest.makeSuite(TestCityQuery))
+    test_suite.addTest(unittest.makeSuite(TestDelta))
     
     # Run the test suite
     runner = unittest.TextTestRunner(verbosity=2)
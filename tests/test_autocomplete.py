@@ -0,0 +1,81 @@
+"""
+Tests for prefix search.
+"""
+
+import unittest
+
+from country_state_city import Country, State, City, search, shards
+from country_state_city.autocomplete import PrefixIndex
+from country_state_city.models import normalize_name
+from tests import CITIES, DataDirTestCase
+
+
+class TestSearch(unittest.TestCase):
+    def test_normalize_name(self):
+        """Test case and accent folding."""
+        self.assertEqual(normalize_name("São Paulo"), "sao paulo")
+        self.assertEqual(normalize_name("ZÜRICH"), "zurich")
+        self.assertEqual(normalize_name(None), "")
+
+    def test_search_states_of_country(self):
+        """Test prefix search restricted to one country."""
+        results = search('new', kind='state', country_code='US')
+        self.assertEqual(
+            [s.name for s in results], ['New Hampshire', 'New Jersey', 'New Mexico', 'New York']
+        )
+        self.assertTrue(all(isinstance(s, State) for s in results))
+
+    def test_search_is_accent_insensitive(self):
+        """Test that accents and case in the query or the data are ignored."""
+        names = [s.name for s in search('SAO', kind='state', limit=None)]
+        self.assertIn('São Paulo', names)
+        self.assertEqual(search('Califórnia', kind='state', country_code='US')[0].name, 'California')
+
+    def test_search_countries(self):
+        """Test country search and limits."""
+        results = search('united', kind='country', limit=2)
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(isinstance(c, Country) for c in results))
+        self.assertEqual(search('united', kind='country', country_code='GB')[0].iso2, 'GB')
+        self.assertEqual(search('france', kind='country', country_code='GB'), [])
+
+    def test_no_matches(self):
+        """Test empty and non-matching prefixes."""
+        self.assertEqual(search('', kind='state'), [])
+        self.assertEqual(search('zzzz', kind='state'), [])
+        self.assertEqual(search('cal', kind='state', country_code='XX'), [])
+
+    def test_invalid_kind(self):
+        """Test that an unknown kind is rejected."""
+        with self.assertRaises(ValueError):
+            search('cal', kind='planet')
+
+    def test_prefix_index(self):
+        """Test the sorted array index directly."""
+        index = PrefixIndex([City('San Jose', 'US', 'CA'), City('Santa Ana', 'US', 'CA'),
+                             City('Salinas', 'US', 'CA'), City('Fresno', 'US', 'CA')])
+        self.assertEqual(len(index), 4)
+        self.assertEqual([c.name for c in index.search('san')], ['San Jose', 'Santa Ana'])
+        self.assertEqual([c.name for c in index.search('sa', limit=1)], ['Salinas'])
+        self.assertEqual(index.search('x'), [])
+
+
+class TestSearchWithoutCities(DataDirTestCase):
+    def test_all_kinds(self):
+        """Test that searching every kind skips cities when none are installed."""
+        self.assertFalse(self.registry.has_city_data())
+        self.assertEqual([c.iso2 for c in search('canad')], ['CA'])
+        self.assertEqual([s.iso_code for s in search('cal', country_code='US')], ['CA'])
+
+    def test_with_shards(self):
+        """Test that cities installed later are searched after a reload."""
+        self.assertFalse(self.registry.has_city_data())
+        shards.write_shards(CITIES, self.data_dir)
+        self.assertFalse(self.registry.has_city_data())
+        self.registry.reload()
+        self.assertTrue(self.registry.has_city_data())
+        self.assertEqual([c.name for c in search('oak', country_code='US')], ['Oakland'])
+
+
+if __name__ == '__main__':
+    unittest.main()
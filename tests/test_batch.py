@@ -0,0 +1,66 @@
+"""
+Tests for batch lookups.
+"""
+
+import unittest
+
+from country_state_city import Country, State, lookup_many
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestBatch(unittest.TestCase):
+    def test_get_countries_by_codes(self):
+        """Test aligned results with missing codes."""
+        result = Country.get_countries_by_codes(['US', 'XX', None, 'IN'])
+        self.assertEqual(result[0].iso2, 'US')
+        self.assertIsNone(result[1])
+        self.assertIsNone(result[2])
+        self.assertEqual(result[3].iso2, 'IN')
+
+    def test_get_states_by_codes(self):
+        """Test pairs given as tuples and lists."""
+        result = State.get_states_by_codes([('US', 'CA'), ['IN', 'MH'], ('US', 'XX')])
+        self.assertEqual([s and s.name for s in result], ['California', 'Maharashtra', None])
+
+    def test_iterators_and_sentinels(self):
+        """Test iterator input and a custom missing value."""
+        codes = (code for code in ['GB', 'ZZ'])
+        result = lookup_many('country', codes, missing=False)
+        self.assertEqual(result[0].iso2, 'GB')
+        self.assertIs(result[1], False)
+
+    def test_return_index(self):
+        """Test row positions into the full listings."""
+        positions = lookup_many('state', [('US', 'CA'), ('US', 'XX')], return_index=True)
+        self.assertIs(State.get_states()[positions[0]], State.get_state_by_code('US', 'CA'))
+        self.assertEqual(positions[1], -1)
+        positions = lookup_many('country', ['DE'], return_index=True)
+        self.assertEqual(Country.get_countries()[positions[0]].iso2, 'DE')
+
+    def test_invalid_kind(self):
+        """Test that an unknown kind is rejected."""
+        with self.assertRaises(ValueError):
+            lookup_many('planet', ['US'])
+        with self.assertRaises(ValueError):
+            lookup_many('city', [('US', 'Oakland')], return_index=True)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_input(self):
+        """Test NumPy arrays of codes and of code pairs."""
+        result = Country.get_countries_by_codes(numpy.array(['US', 'XX']))
+        self.assertEqual(result[0].iso2, 'US')
+        self.assertIsNone(result[1])
+
+        pairs = numpy.array([['US', 'CA'], ['US', 'XX']])
+        positions = lookup_many('state', pairs, return_index=True)
+        self.assertIsInstance(positions, numpy.ndarray)
+        self.assertEqual(positions[1], -1)
+        self.assertEqual(State.get_states()[positions[0]].name, 'California')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Tests for the compiled binary dataset.
+"""
+
+import os
+import time
+import unittest
+
+from country_state_city.binary import BinaryDataset, compile_dataset, open_artifact
+from country_state_city.dataset import Registry
+from tests import DataDirTestCase
+
+
+class TestBinaryDataset(DataDirTestCase):
+    def setUp(self):
+        super().setUp()
+        cities = [
+            {"name": "Oakland", "countryCode": "US", "stateCode": "CA",
+             "latitude": "37.80437000", "longitude": "-122.27080000"},
+            {"name": "Albany", "countryCode": "US", "stateCode": "NY",
+             "latitude": "42.65258000", "longitude": "-73.75623000"},
+            {"name": "Fresno", "countryCode": "US", "stateCode": "CA",
+             "latitude": None, "longitude": None},
+        ]
+        self.write_json('city.json', cities)
+        self.path = compile_dataset(self.data_dir)
+
+    def test_tables_match_json(self):
+        """Test that tables read from the artifact equal those read from JSON."""
+        compiled = self.registry
+        plain = Registry(self.data_dir, use_artifact=False)
+        for name in ('countries', 'states', 'cities'):
+            self.assertEqual(
+                [r.to_dict() for r in getattr(compiled, name).records],
+                [r.to_dict() for r in getattr(plain, name).records],
+            )
+        self.assertIsNotNone(compiled.artifact)
+        self.assertIsNone(plain.artifact)
+
+    def test_buckets_match_json(self):
+        """Test that compiled offset tables give the same sorted buckets."""
+        compiled = self.registry
+        plain = Registry(self.data_dir, use_artifact=False)
+        for code, bucket in plain.states.by_country.items():
+            self.assertEqual(
+                [s.to_dict() for s in compiled.states.by_country[code]],
+                [s.to_dict() for s in bucket],
+            )
+        self.assertEqual(
+            [c.name for c in compiled.cities.by_state[('US', 'CA')]], ['Fresno', 'Oakland']
+        )
+        self.assertEqual(
+            [c.name for c in compiled.cities.by_country['US']], ['Albany', 'Fresno', 'Oakland']
+        )
+
+    def test_parent_rows(self):
+        """Test that parent rows are resolved when compiling."""
+        compiled = self.registry
+        countries = compiled.countries.records
+        states = compiled.states.records
+        oakland = compiled.cities.records[0]
+        self.assertEqual(states[oakland._state_row].iso_code, 'CA')
+        self.assertEqual(countries[oakland._country_row].iso2, 'US')
+        california = compiled.states.by_code[('US', 'CA')]
+        self.assertEqual(countries[california._country_row].iso2, 'US')
+
+    def test_columns(self):
+        """Test typed column access and the string table."""
+        artifact = BinaryDataset(self.path)
+        names = artifact.strings('country.name')
+        self.assertIn('United States', names)
+        self.assertEqual(artifact.column('city.latitude').format, 'd')
+        self.assertEqual(artifact.floats('city.latitude')[2], None)
+        self.assertTrue(artifact.has_table('city'))
+
+    def test_stale_artifact_is_ignored(self):
+        """Test that changed JSON files take precedence over the artifact."""
+        self.assertIsNotNone(open_artifact(self.data_dir))
+        with open(os.path.join(self.data_dir, 'state.json'), 'a', encoding='utf-8') as f:
+            f.write('\n')
+        self.assertIsNone(open_artifact(self.data_dir))
+
+    def test_file_times_are_ignored(self):
+        """Test that an artifact older than unchanged sources is used."""
+        later = time.time() + 10
+        for name in ('country.json', 'state.json', 'city.json'):
+            os.utime(os.path.join(self.data_dir, name), (later, later))
+        self.assertIsNotNone(open_artifact(self.data_dir))
+
+    def test_invalid_artifact(self):
+        """Test that a file with the wrong magic is rejected."""
+        with open(self.path, 'wb') as f:
+            f.write(b'\0' * 64)
+        with self.assertRaises(ValueError):
+            BinaryDataset(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Tests for the parallel build step.
+"""
+
+import json
+import os
+import time
+from unittest import mock
+
+from country_state_city import City, State, indexes, search
+from country_state_city.autocomplete import PrefixIndex
+from country_state_city.build import build, main
+from country_state_city.spatial import KDTree
+from tests import CITIES, DataDirTestCase
+
+
+class TestBuild(DataDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write_json('source.json', CITIES)
+        self.cities_path = os.path.join(self.data_dir, 'source.json')
+
+    def test_outputs_are_deterministic(self):
+        """Test that serial and parallel builds give the same manifest."""
+        serial = build(self.data_dir, cities_path=self.cities_path, jobs=1)
+        parallel = build(self.data_dir, cities_path=self.cities_path, jobs=2)
+        self.assertEqual(serial, parallel)
+        self.assertIn('cities/US.jsonl', serial['files'])
+        self.assertIn('indexes/US.json', serial['files'])
+        self.assertIn('dataset.bin', serial['files'])
+        with open(os.path.join(self.data_dir, 'manifest.json'), encoding='utf-8') as f:
+            self.assertEqual(json.load(f), serial)
+
+    def test_prebuilt_indexes_match_runtime(self):
+        """Test that prebuilt indexes equal the ones built in memory."""
+        build(self.data_dir, cities_path=self.cities_path, jobs=1)
+        for kind in ('state', 'city'):
+            _, records = self.registry.records_of(kind, 'US')
+            index = indexes.prebuilt(self.data_dir, kind, 'US', records)
+            self.assertIsNotNone(index)
+            names = PrefixIndex.from_keys(records, index['names']['keys'], index['names']['order'])
+            self.assertEqual(names.records, PrefixIndex(records).records)
+            tree = KDTree.from_nodes(records, index['kdtree']['order'], index['kdtree']['nodes'])
+            self.assertEqual(tree.nearest(37.0, -120.0, 3), KDTree(records).nearest(37.0, -120.0, 3))
+
+    def test_queries_use_prebuilt_indexes(self):
+        """Test that country-scoped queries skip building their indexes."""
+        build(self.data_dir, cities_path=self.cities_path, jobs=1)
+        with mock.patch.object(PrefixIndex, '__init__', side_effect=AssertionError), \
+                mock.patch.object(KDTree, '__init__', side_effect=AssertionError):
+            self.assertEqual([s.iso_code for s in search('califo', 'state', 'US')], ['CA'])
+            self.assertEqual(City.nearest(37.8, -122.3, country_code='US')[0].record.name, 'Oakland')
+            self.assertEqual(State.nearest(36.7, -119.4, country_code='US')[0].record.iso_code, 'CA')
+
+    def test_stale_indexes_are_ignored(self):
+        """Test that indexes of changed data files are not used."""
+        build(self.data_dir, cities_path=self.cities_path, jobs=1)
+        later = time.time() + 10
+        os.utime(os.path.join(self.data_dir, 'state.json'), (later, later))
+        _, records = self.registry.records_of('state', 'US')
+        self.assertIsNotNone(indexes.prebuilt(self.data_dir, 'state', 'US', records))
+
+        with open(os.path.join(self.data_dir, 'state.json'), encoding='utf-8') as f:
+            states = json.load(f)
+        for state in states:
+            if state['countryCode'] == 'US' and state['isoCode'] == 'TX':
+                state['latitude'] = '0.00000000'
+        self.write_json('state.json', states)
+        self.registry.reload()
+        _, records = self.registry.records_of('state', 'US')
+        self.assertIsNone(indexes.prebuilt(self.data_dir, 'state', 'US', records))
+        self.assertEqual([s.iso_code for s in search('califo', 'state', 'US')], ['CA'])
+
+    def test_main(self):
+        """Test the command line entry point."""
+        with mock.patch('builtins.print'):
+            self.assertEqual(main(['--data-dir', self.data_dir, '--cities', self.cities_path,
+                                   '--jobs', '1']), 0)
+        self.assertTrue(os.path.exists(os.path.join(self.data_dir, 'indexes', 'IN.json')))
@@ -0,0 +1,142 @@
+"""
+Tests for the opt-in city table cache.
+"""
+
+import gc
+import unittest
+import weakref
+from unittest import mock
+
+from country_state_city import City, State, cache, dataset, instrumentation
+from country_state_city.cache import ResultCache
+from tests import CITIES, DataDirTestCase
+
+
+class TestResultCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        results = ResultCache(max_entries=2)
+        results.put('a', 1)
+        results.put('b', 2)
+        results.get('a')
+        results.put('c', 3)
+        self.assertIsNone(results.get('b'))
+        self.assertEqual(results.get('a'), 1)
+        self.assertEqual(results.stats()['evictions'], 1)
+
+    def test_byte_budget(self):
+        """Test that the estimated size stays within max_bytes."""
+        value = tuple(range(100))
+        results = ResultCache(max_entries=None, max_bytes=3 * cache._sizeof(value))
+        for key in range(5):
+            results.put(key, value)
+        stats = results.stats()
+        self.assertEqual(stats['entries'], 3)
+        self.assertLessEqual(stats['bytes'], results.max_bytes)
+        results.put('huge', tuple(range(10000)))
+        self.assertIsNone(results.get('huge'))
+
+    def test_ttl(self):
+        """Test that expired entries are not served."""
+        results = ResultCache(ttl=10)
+        with mock.patch('time.monotonic', return_value=100.0):
+            results.put('a', 1)
+        with mock.patch('time.monotonic', return_value=105.0):
+            self.assertEqual(results.get('a'), 1)
+        with mock.patch('time.monotonic', return_value=111.0):
+            self.assertIsNone(results.get('a'))
+        self.assertEqual(results.stats()['expirations'], 1)
+
+
+class TestShardCache(DataDirTestCase):
+    CITIES = CITIES
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(cache.disable)
+
+    def test_disabled_by_default(self):
+        """Test that shards stay in the registry until enabled."""
+        self.assertIsNone(cache.get_cache())
+        City.get_cities_of_country('US')
+        self.assertIn(('cities', 'US'), self.registry._loaded)
+
+    def test_cache_owns_shards(self):
+        """Test that shards are kept by the cache and freed on eviction."""
+        tables = cache.enable(max_entries=1)
+        self.assertEqual([c.name for c in City.get_cities_of_state('US', 'CA')], ['Fresno', 'Oakland'])
+        self.assertEqual(len(City.get_cities_of_country('US')), 3)
+        self.assertEqual(tables.stats()['hits'], 1)
+        self.assertEqual(tables.stats()['misses'], 1)
+        self.assertTrue(self.registry.is_loaded(('cities', 'US')))
+        self.assertNotIn(('cities', 'US'), self.registry._loaded)
+
+        table = weakref.ref(self.registry.cities_of_country('US'))
+        City.get_city_by_name('IN', 'Pune')
+        self.assertFalse(self.registry.is_loaded(('cities', 'US')))
+        self.assertEqual(tables.stats()['evictions'], 1)
+        gc.collect()
+        self.assertIsNone(table())
+
+    def test_byte_budget(self):
+        """Test that the estimated size of the tables stays within max_bytes."""
+        size = cache._table_size(self.registry.cities_of_country('US'))
+        self.registry.drop_shards()
+        tables = cache.enable(max_entries=None, max_bytes=size + 1)
+        City.get_cities_of_country('US')
+        City.get_cities_of_country('IN')
+        self.assertEqual(tables.stats()['entries'], 1)
+        self.assertLessEqual(tables.stats()['bytes'], size + 1)
+
+    def test_enable_drops_loaded_shards(self):
+        """Test that shards loaded before enabling are released."""
+        City.get_cities_of_country('US')
+        cache.enable()
+        self.assertNotIn(('cities', 'US'), self.registry._loaded)
+        self.assertFalse(self.registry.is_loaded(('cities', 'US')))
+        self.assertIs(cache.enable(), cache.get_cache())
+
+    def test_reload_invalidates(self):
+        """Test that tables of replaced generations are not served."""
+        cache.enable()
+        before = self.registry.cities_of_country('US')
+        dataset.clear()
+        self.assertIsNot(self.registry.cities_of_country('US'), before)
+
+    def test_disable_returns_tables(self):
+        """Test that the registry keeps shards again after disabling."""
+        cache.enable()
+        City.get_cities_of_country('US')
+        cache.disable()
+        self.assertFalse(self.registry.is_loaded(('cities', 'US')))
+        City.get_cities_of_country('US')
+        self.assertIn(('cities', 'US'), self.registry._loaded)
+
+    def test_methods_not_wrapped(self):
+        """Test that lookups keep running without a wrapper."""
+        original = State.__dict__['get_state_by_code']
+        cache.enable()
+        self.assertIs(State.__dict__['get_state_by_code'], original)
+        self.assertFalse(hasattr(City.get_cities_of_country, '__wrapped__'))
+
+    def test_with_instrumentation(self):
+        """Test that instrumentation and the cache work independently."""
+        self.addCleanup(instrumentation.disable)
+        original = City.__dict__['get_cities_of_country']
+        instrumentation.enable()
+        tables = cache.enable()
+        instrumentation.disable()
+        City.get_cities_of_country('US')
+        City.get_cities_of_country('US')
+        self.assertEqual(tables.stats()['hits'], 1)
+
+        metrics = instrumentation.enable()
+        cache.disable()
+        City.get_cities_of_country('US')
+        self.assertEqual(metrics.snapshot()['calls']['City.get_cities_of_country']['count'], 1)
+        instrumentation.disable()
+        self.assertIs(City.__dict__['get_cities_of_country'], original)
+
+
+if __name__ == '__main__':
+    unittest.main()
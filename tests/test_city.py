@@ -3,9 +3,10 @@ Tests for the City module.
 """
 
 import unittest
-from country_state_city import City
+from country_state_city import City, dataset
 
 
+@unittest.skipUnless(dataset.get_registry().has_city_data(), "city data is not installed")
 class TestCity(unittest.TestCase):
     def setUp(self):
         # Set up test cases
@@ -0,0 +1,95 @@
+"""
+Tests for the columnar export.
+"""
+
+import math
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from country_state_city import Country, State, dataset, shards
+from country_state_city.binary import compile_dataset
+from country_state_city.dataset import Registry
+from tests import CITIES
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestColumns(unittest.TestCase):
+    def test_numpy_columns(self):
+        """Test that NumPy columns match the State objects."""
+        columns = State.as_columns()
+        states = State.get_states()
+        self.assertEqual(columns['latitude'].dtype, numpy.float64)
+        self.assertEqual(len(columns['name']), len(states))
+        for i in (0, 100, len(states) - 1):
+            self.assertEqual(columns['name'][i], states[i].name)
+            self.assertEqual(columns['country_code'][i], states[i].country_code)
+            if states[i].latitude is None:
+                self.assertTrue(math.isnan(columns['latitude'][i]))
+            else:
+                self.assertEqual(columns['latitude'][i], states[i].latitude)
+
+    def test_artifact_columns_match_json(self):
+        """Test that columns read from the artifact equal those built from JSON."""
+        data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, data_dir)
+        for name in ('country.json', 'state.json'):
+            shutil.copy(os.path.join(dataset.DATA_DIR, name), data_dir)
+        shards.write_shards(CITIES, data_dir)
+        compile_dataset(data_dir)
+
+        results = []
+        for use_artifact in (True, False):
+            registry = Registry(data_dir, use_artifact=use_artifact)
+            with mock.patch.object(dataset, '_registry', registry):
+                results.append(State.as_columns())
+            self.assertEqual(registry.is_loaded('states'), not use_artifact)
+            if use_artifact:
+                # City names are not decoded for the state columns
+                self.assertNotIn('Oakland', registry.artifact._decoded.values())
+        compiled, plain = results
+        for field in compiled:
+            numpy.testing.assert_array_equal(compiled[field], plain[field])
+
+    def test_invalid_format(self):
+        """Test that unknown formats are rejected."""
+        with self.assertRaises(ValueError):
+            Country.as_columns(format='csv')
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow_table(self):
+        """Test the Arrow export with dictionary-encoded codes."""
+        table = Country.as_columns(format='arrow')
+        self.assertEqual(table.num_rows, len(Country.get_countries()))
+        self.assertTrue(pyarrow.types.is_dictionary(table.schema.field('iso2').type))
+        self.assertEqual(table.schema.field('latitude').type, pyarrow.float64())
+
+    @unittest.skipIf(pandas is None, "pandas is not installed")
+    def test_pandas_frame(self):
+        """Test the pandas export with categorical codes."""
+        frame = State.as_columns(format='pandas')
+        self.assertEqual(str(frame['country_code'].dtype), 'category')
+        self.assertEqual(
+            len(frame[frame['country_code'] == 'US']), len(State.get_states_of_country('US'))
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -78,6 +78,52 @@ class TestCountry(unittest.TestCase):
             self.assertIsInstance(country_dict['timezones'][0], dict)
             self.assertTrue('zoneName' in country_dict['timezones'][0])
 
+    
+    def test_get_country_by_name(self):
+        """Test case- and accent-insensitive lookup by name."""
+        self.assertEqual(Country.get_country_by_name('united states').iso2, 'US')
+        self.assertEqual(Country.get_country_by_name('ALAND ISLANDS').iso2, 'AX')
+        curacao = Country.get_country_by_code('CW')
+        self.assertIs(Country.get_country_by_name('curacao'), curacao)
+        self.assertIsNone(Country.get_country_by_name('Atlantis'))
+        self.assertIsNone(Country.get_country_by_name(''))
+    
+    def test_get_countries_by_currency(self):
+        """Test the inverted currency index."""
+        euro = Country.get_countries_by_currency('EUR')
+        self.assertIn(Country.get_country_by_code('DE'), euro)
+        self.assertTrue(all(country.currency == 'EUR' for country in euro))
+        self.assertEqual(Country.get_countries_by_currency('eur'), euro)
+        self.assertEqual(Country.get_countries_by_currency('XXX'), [])
+        self.assertEqual(Country.get_countries_by_currency(''), [])
+    
+    def test_get_countries_by_phone_code(self):
+        """Test lookups by normalized calling code."""
+        codes = lambda countries: [country.iso2 for country in countries]
+        self.assertEqual(codes(Country.get_countries_by_phone_code('358')), ['FI'])
+        self.assertEqual(codes(Country.get_countries_by_phone_code('+358-18')), ['AX'])
+        self.assertEqual(codes(Country.get_countries_by_phone_code('35818')), ['AX'])
+        self.assertEqual(codes(Country.get_countries_by_phone_code('1-939')), ['PR'])
+        self.assertEqual(codes(Country.get_countries_by_phone_code('+1-787 and 1-939')), ['PR'])
+        self.assertEqual(codes(Country.get_countries_by_phone_code('0055')), ['BV', 'BR'])
+        self.assertIn('US', codes(Country.get_countries_by_phone_code('+1')))
+        self.assertEqual(Country.get_countries_by_phone_code(''), [])
+        self.assertEqual(Country.get_countries_by_phone_code(None), [])
+    
+    def test_resolve_phone_number(self):
+        """Test longest-prefix resolution of phone numbers."""
+        codes = lambda number: [country.iso2 for country in Country.resolve_phone_number(number)]
+        self.assertIn('US', codes('+14155550123'))
+        self.assertEqual(codes('+1 242 555 0100'), ['BS'])
+        self.assertEqual(codes('+1 (787) 555-0000'), ['PR'])
+        self.assertEqual(codes('+1 939 555 0000'), ['PR'])
+        self.assertEqual(codes('+358 18 12345'), ['AX'])
+        self.assertEqual(codes('+358 40 1234567'), ['FI'])
+        self.assertEqual(codes('0044 20 7946 0000'), ['GB'])
+        self.assertEqual(codes('+999'), [])
+        self.assertEqual(codes('not a number'), [])
+        self.assertEqual(codes(''), [])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
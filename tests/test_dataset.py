@@ -0,0 +1,144 @@
+"""
+Tests for the dataset registry.
+"""
+
+import json
+import os
+import threading
+import unittest
+from unittest import mock
+
+from country_state_city import City, Country, State, dataset
+from country_state_city.dataset import CityTable
+from tests import DataDirTestCase
+
+
+class TestRegistry(DataDirTestCase):
+
+    def count_reads(self):
+        return mock.patch.object(dataset, '_read_json', wraps=dataset._read_json)
+
+    def test_tables_are_loaded_once(self):
+        """Test that repeated access does not re-read the data files."""
+        with self.count_reads() as read:
+            first = self.registry.states
+            second = self.registry.states
+        self.assertIs(first, second)
+        self.assertEqual(read.call_count, 1)
+
+    def test_tables_are_lazy(self):
+        """Test that nothing is loaded until a table is accessed."""
+        self.assertFalse(self.registry.is_loaded('countries'))
+        self.registry.countries
+        self.assertTrue(self.registry.is_loaded('countries'))
+        self.assertFalse(self.registry.is_loaded('states'))
+
+    def test_concurrent_first_access(self):
+        """Test that concurrent first calls share a single load."""
+        barrier = threading.Barrier(8)
+        tables = []
+
+        def worker():
+            barrier.wait()
+            tables.append(self.registry.countries)
+
+        with self.count_reads() as read:
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(read.call_count, 1)
+        self.assertTrue(all(table is tables[0] for table in tables))
+
+    def test_indexes(self):
+        """Test the country and state code indexes."""
+        countries = self.registry.countries
+        self.assertEqual(countries.by_code['US'].name, "United States")
+        self.assertEqual(len(countries.by_code), len(countries.records))
+
+        states = self.registry.states
+        self.assertEqual(states.by_code[('US', 'CA')].name, "California")
+        self.assertTrue(all(s.country_code == 'IN' for s in states.by_country['IN']))
+
+    def test_clear(self):
+        """Test that clear drops cached tables."""
+        before = self.registry.countries
+        self.registry.clear()
+        self.assertFalse(self.registry.is_loaded('countries'))
+        self.assertIsNot(self.registry.countries, before)
+
+    def test_reload(self):
+        """Test that reload picks up changes to the data files."""
+        self.registry.countries
+        with open(os.path.join(self.data_dir, 'country.json'), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data[0]['name'] = 'Renamed'
+        self.write_json('country.json', data)
+
+        self.registry.reload()
+        self.assertEqual(self.registry.countries.records[0].name, 'Renamed')
+        self.assertFalse(self.registry.is_loaded('states'))
+
+    def test_missing_city_data(self):
+        """Test that city lookups without city data explain how to install it."""
+        self.assertFalse(self.registry.has_city_data())
+        for call in (City.get_cities, lambda: City.get_cities_of_country('US')):
+            with self.assertRaisesRegex(FileNotFoundError, 'city data not installed.*--cities'):
+                call()
+
+
+class TestBuckets(unittest.TestCase):
+    def test_state_buckets_match_full_sort(self):
+        """Test that per-country buckets equal a filtered, sorted scan."""
+        states = State.get_states()
+        for code in ('US', 'IN', 'CA', 'GH'):
+            expected = sorted(
+                [s for s in states if s.country_code == code], key=lambda x: x.name
+            )
+            self.assertEqual(State.get_states_of_country(code), expected)
+
+    def test_city_buckets(self):
+        """Test per-country and per-state city buckets."""
+        table = CityTable([
+            City('Oakland', 'US', 'CA'),
+            City('Albany', 'US', 'NY'),
+            City('Fresno', 'US', 'CA'),
+            City('Pune', 'IN', 'MH'),
+        ])
+        self.assertEqual(
+            [c.name for c in table.by_state[('US', 'CA')]], ['Fresno', 'Oakland']
+        )
+        self.assertEqual(
+            [c.name for c in table.by_country['US']], ['Albany', 'Fresno', 'Oakland']
+        )
+        self.assertIsInstance(table.by_country['IN'], tuple)
+
+    def test_listing_returns_copy(self):
+        """Test that modifying a listing does not affect the bucket."""
+        states = State.get_states_of_country('US')
+        states.clear()
+        self.assertGreater(len(State.get_states_of_country('US')), 0)
+
+
+class TestModelCaching(unittest.TestCase):
+    def test_lookups_use_shared_registry(self):
+        """Test that static methods are served from the process-wide registry."""
+        Country.get_country_by_code('US')
+        State.get_state_by_code('US', 'CA')
+        with mock.patch.object(dataset, '_read_json') as read:
+            self.assertEqual(Country.get_country_by_code('US').iso2, 'US')
+            self.assertEqual(State.get_state_by_code('US', 'CA').name, 'California')
+            self.assertGreater(len(State.get_states_of_country('US')), 0)
+        read.assert_not_called()
+
+    def test_get_countries_returns_new_list(self):
+        """Test that callers cannot modify the cached table through the result."""
+        countries = Country.get_countries()
+        countries.clear()
+        self.assertGreater(len(Country.get_countries()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+Tests for incremental dataset updates.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from country_state_city import City, Country, State, dataset, search
+from country_state_city.binary import compile_dataset
+from country_state_city.dataset import Registry
+from country_state_city.delta import Delta, apply_delta, diff, load_delta
+from tests import CITIES, DataDirTestCase
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DELTA = {
+    'format': 1,
+    'from_version': '1',
+    'to_version': '2',
+    'countries': {
+        'changed': [{'isoCode': 'IN', 'currency': 'XYZ'}],
+    },
+    'states': {
+        'added': [{'name': 'Aaa Territory', 'countryCode': 'US', 'isoCode': 'AAA',
+                   'latitude': '10.00000000', 'longitude': '20.00000000'}],
+        'removed': [{'countryCode': 'US', 'isoCode': 'WY'}],
+        'changed': [{'countryCode': 'US', 'isoCode': 'CA', 'name': 'Kalifornia'}],
+    },
+    'cities': {
+        'added': [{'name': 'Berkeley', 'countryCode': 'US', 'stateCode': 'CA',
+                   'latitude': '37.87159000', 'longitude': '-122.27275000'},
+                  {'name': 'Toronto', 'countryCode': 'CA', 'stateCode': 'ON',
+                   'latitude': '43.70011000', 'longitude': '-79.41630000'}],
+        'removed': [{'countryCode': 'US', 'stateCode': 'NY', 'name': 'Albany'}],
+    },
+}
+
+
+class TestDelta(DataDirTestCase):
+    CITIES = CITIES
+
+    def setUp(self):
+        super().setUp()
+        self.write_json(dataset.VERSION_NAME, {'version': '1'})
+
+    def test_apply_delta(self):
+        """Test that added, removed and changed records are visible."""
+        unchanged = State.get_state_by_code('US', 'TX')
+        generation = self.registry.generation
+        self.assertEqual(apply_delta(DELTA), '2')
+        self.assertEqual(self.registry.version, '2')
+        self.assertGreater(self.registry.generation, generation)
+
+        self.assertIsNone(State.get_state_by_code('US', 'WY'))
+        self.assertEqual(State.get_state_by_code('US', 'CA').name, 'Kalifornia')
+        self.assertEqual(State.get_state_by_code('US', 'CA').latitude, 36.778261)
+        self.assertEqual(State.get_states_of_country('US')[0].iso_code, 'AAA')
+        names = [s.name for s in State.get_states_of_country('US')]
+        self.assertEqual(names, sorted(names))
+        self.assertIs(State.get_state_by_code('US', 'TX'), unchanged)
+        self.assertEqual(Country.get_country_by_code('IN').currency, 'XYZ')
+        self.assertEqual(Country.get_country_by_code('IN').name, 'India')
+        self.assertEqual(search('kalif', kind='state', country_code='US')[0].iso_code, 'CA')
+
+    def test_readers_keep_snapshot(self):
+        """Test that tables held by readers are not modified."""
+        states = self.registry.states
+        before = [s.to_dict() for s in states.by_country['US']]
+        apply_delta(DELTA)
+        self.assertIsNot(self.registry.states, states)
+        self.assertEqual([s.to_dict() for s in states.by_country['US']], before)
+        self.assertIn(('US', 'WY'), states.by_code)
+
+    def test_unaffected_buckets_shared(self):
+        """Test that buckets and indexes of other countries are reused."""
+        states = self.registry.states
+        search('ma', kind='state', country_code='IN')
+        apply_delta(DELTA)
+        self.assertIs(self.registry.states.by_country['IN'], states.by_country['IN'])
+        self.assertIs(self.registry.states.indexes[('prefix', 'IN')], states.indexes[('prefix', 'IN')])
+        self.assertNotIn(('prefix', 'US'), self.registry.states.indexes)
+
+    def test_tables_loaded_later(self):
+        """Test that the delta is replayed on shards read after it."""
+        apply_delta(DELTA)
+        self.assertFalse(self.registry.is_loaded(('cities', 'US')))
+        self.assertEqual([c.name for c in City.get_cities_of_state('US', 'CA')], ['Berkeley', 'Fresno', 'Oakland'])
+        self.assertEqual(City.get_cities_of_state('US', 'NY'), [])
+        self.assertEqual([c.name for c in City.get_cities_of_country('CA')], ['Toronto'])
+        self.registry.reload()
+        self.assertEqual(len(City.get_cities_of_country('US')), 3)
+        self.assertEqual(City.get_cities_of_country('CA')[0].state.name, 'Ontario')
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_columns(self):
+        """Test that the columnar export includes the delta."""
+        compile_dataset(self.data_dir)
+        apply_delta(DELTA)
+        columns = State.as_columns()
+        self.assertIn('Kalifornia', list(columns['name']))
+        self.assertEqual(len(columns['name']), len(State.get_states()))
+
+    def test_version_mismatch(self):
+        """Test that a delta for another version is rejected."""
+        with self.assertRaises(ValueError):
+            apply_delta(dict(DELTA, from_version='0'))
+        self.assertEqual(self.registry.version, '1')
+        self.assertEqual(self.registry.deltas, [])
+
+    def test_invalid_delta(self):
+        """Test that malformed deltas are rejected."""
+        with self.assertRaises(ValueError):
+            Delta({'format': 2})
+        with self.assertRaises(ValueError):
+            Delta({'regions': {}})
+        with self.assertRaises(ValueError):
+            Delta({'states': {'removed': [{'isoCode': 'CA'}]}})
+
+    def test_load_delta(self):
+        """Test reading a delta file."""
+        self.write_json('delta.json', DELTA)
+        path = os.path.join(self.data_dir, 'delta.json')
+        self.assertEqual(load_delta(path).to_version, '2')
+        self.assertEqual(apply_delta(path), '2')
+
+    def test_diff_round_trip(self):
+        """Test that applying a diff gives the new data."""
+        new_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, new_dir)
+        for name in ('country.json', 'state.json'):
+            with open(os.path.join(self.data_dir, name), encoding='utf-8') as f:
+                data = json.load(f)
+            if name == 'state.json':
+                data = [s for s in data if s['isoCode'] != 'WY']
+                data[0]['name'] = 'Renamed'
+                data.append(DELTA['states']['added'][0])
+            with open(os.path.join(new_dir, name), 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+
+        changes = diff(self.data_dir, new_dir, '1', '2')
+        self.assertNotIn('countries', changes)
+        self.assertEqual(len(changes['states']['removed']), len([
+            s for s in State.get_states() if s.iso_code == 'WY']))
+        apply_delta(json.loads(json.dumps(changes)))
+        expected = Registry(new_dir, use_artifact=False).states.records
+        self.assertEqual([s.to_dict() for s in State.get_states()], [s.to_dict() for s in expected])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Tests for fuzzy name matching.
+"""
+
+import unittest
+
+from country_state_city import City, match
+from country_state_city.fuzzy import TrigramIndex, edit_distance, trigrams
+
+
+class TestFuzzy(unittest.TestCase):
+    def test_edit_distance(self):
+        """Test bounded Levenshtein distances."""
+        self.assertEqual(edit_distance('mumbay', 'mumbai', 2), 1)
+        self.assertEqual(edit_distance('califronia', 'california', 2), 2)
+        self.assertEqual(edit_distance('abc', 'abc', 0), 0)
+        self.assertEqual(edit_distance('abc', 'xyz', 1), 2)
+        self.assertEqual(edit_distance('a', 'abcdef', 2), 3)
+
+    def test_match_states(self):
+        """Test matching misspelled state names."""
+        results = match('Califronia', kind='state', country_code='US')
+        self.assertEqual(results[0].record.iso_code, 'CA')
+        self.assertEqual(results[0].distance, 2)
+        self.assertEqual(match('maharastra', kind='state')[0].record.name, 'Maharashtra')
+
+    def test_match_countries(self):
+        """Test matching misspelled country names."""
+        results = match('Germny', kind='country')
+        self.assertEqual(results[0].record.iso2, 'DE')
+        self.assertEqual(results[0].distance, 1)
+        self.assertEqual(match('Germny', kind='country', max_distance=0), [])
+
+    def test_results_are_ordered(self):
+        """Test that exact matches come first and limit is honoured."""
+        results = match('Georgia', kind='state', country_code='US', limit=None)
+        self.assertEqual(results[0].distance, 0)
+        self.assertEqual(results, sorted(results, key=lambda m: m.distance))
+        self.assertEqual(len(match('new', kind='state', max_distance=3, limit=3)), 3)
+
+    def test_pruning_keeps_all_matches(self):
+        """Test that the trigram filter never drops a match a full scan finds."""
+        names = ['Mumbai', 'Mumbra', 'Mumbay', 'Pune', 'Nagpur', 'Numbai', 'Mbai', 'Aaaa']
+        index = TrigramIndex([City(name, 'IN', 'MH') for name in names])
+        for query in ('mumbay', 'numbai', 'aaab', 'pnue', 'x'):
+            for k in (1, 2):
+                expected = sorted(
+                    (edit_distance(query, n.lower(), k), n) for n in names
+                    if edit_distance(query, n.lower(), k) <= k
+                )
+                found = sorted((m.distance, m.record.name) for m in index.match(query, k, None))
+                self.assertEqual(found, expected)
+
+    def test_trigrams(self):
+        """Test padded trigram extraction."""
+        self.assertEqual(trigrams('ab'), {'  a', ' ab', 'ab ', 'b  '})
+
+
+if __name__ == '__main__':
+    unittest.main()
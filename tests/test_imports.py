@@ -0,0 +1,48 @@
+"""
+Tests for lazy imports of the package.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import country_state_city
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+
+def imported_modules(code):
+    """Run code in a fresh interpreter and list the modules it imported."""
+    script = code + "\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+    env = dict(os.environ, PYTHONPATH=SRC)
+    output = subprocess.run([sys.executable, '-c', script], env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return set(json.loads(output.splitlines()[-1]))
+
+
+class TestImports(unittest.TestCase):
+    def test_import_is_lazy(self):
+        """Test that importing the package imports no submodules or accelerators."""
+        modules = imported_modules('import country_state_city')
+        self.assertEqual({m for m in modules if m.startswith('country_state_city')},
+                         {'country_state_city'})
+        for heavy in ('mmap', 'numpy', 'country_state_city.binary'):
+            self.assertNotIn(heavy, modules)
+
+    def test_first_lookup_imports_only_what_it_needs(self):
+        """Test that a country lookup does not pull in search or spatial modules."""
+        modules = imported_modules(
+            "from country_state_city import Country\nCountry.get_country_by_code('US')")
+        self.assertIn('country_state_city.models', modules)
+        for name in ('autocomplete', 'fuzzy', 'spatial', 'batch', 'columns', 'warmup'):
+            self.assertNotIn(f'country_state_city.{name}', modules)
+
+    def test_lazy_attributes(self):
+        """Test that exported names resolve on access and are listed by dir()."""
+        from country_state_city.models import Country
+        self.assertIs(country_state_city.Country, Country)
+        self.assertIn('search', dir(country_state_city))
+        with self.assertRaises(AttributeError):
+            country_state_city.missing
@@ -0,0 +1,81 @@
+"""
+Tests for the instrumentation hooks.
+"""
+
+import os
+
+from country_state_city import City, Country, State, dataset, instrumentation
+from country_state_city.dataset import Registry
+from country_state_city.instrumentation import CallEvent, LoadEvent
+from tests import DataDirTestCase
+
+
+class TestInstrumentation(DataDirTestCase):
+    USE_ARTIFACT = False
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(instrumentation.disable)
+
+    def test_disabled_by_default(self):
+        """Test that no wrappers are installed until enabled."""
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertIsNone(instrumentation.get_metrics())
+        self.assertFalse(hasattr(State.get_states, '__wrapped__'))
+        self.assertEqual(Registry._get.__module__, dataset.__name__)
+
+    def test_loads_and_cache_access(self):
+        """Test load time, bytes, objects, hits and misses."""
+        metrics = instrumentation.enable()
+        State.get_states_of_country('US')
+        State.get_state_by_code('US', 'CA')
+        snapshot = metrics.snapshot()
+        load = snapshot['loads']['states']
+        self.assertEqual(load['count'], 1)
+        self.assertEqual(load['bytes'], os.path.getsize(os.path.join(self.data_dir, 'state.json')))
+        self.assertEqual(load['objects'], len(self.registry.states.records))
+        self.assertGreater(load['seconds'], 0)
+        self.assertEqual(snapshot['misses']['states'], 1)
+        self.assertGreaterEqual(snapshot['hits']['states'], 1)
+
+    def test_call_histograms(self):
+        """Test per-method latency histograms."""
+        metrics = instrumentation.enable()
+        for _ in range(3):
+            Country.get_country_by_code('US')
+        calls = metrics.snapshot()['calls']['Country.get_country_by_code']
+        self.assertEqual(calls['count'], 3)
+        self.assertEqual(calls['buckets'][float('inf')], 3)
+        self.assertTrue(hasattr(City.get_cities_of_state, '__wrapped__'))
+
+    def test_listeners(self):
+        """Test that listeners receive load and call events."""
+        events = []
+        instrumentation.enable(events.append)
+        State.get_states()
+        self.assertIsInstance(events[0], LoadEvent)
+        self.assertEqual(events[0].table, 'states')
+        self.assertEqual(events[0].source, 'json')
+        self.assertEqual(events[-1].method, 'State.get_states')
+        self.assertIsInstance(events[-1], CallEvent)
+
+    def test_disable_restores_originals(self):
+        """Test that disabling removes every wrapper."""
+        original = State.__dict__['get_states']
+        instrumentation.enable()
+        self.assertIsNot(State.__dict__['get_states'], original)
+        instrumentation.disable()
+        self.assertIs(State.__dict__['get_states'], original)
+        self.assertEqual(Registry._load.__module__, dataset.__name__)
+        self.assertEqual(Registry._get.__module__, dataset.__name__)
+
+    def test_prometheus_export(self):
+        """Test the text exposition format."""
+        metrics = instrumentation.enable()
+        State.get_states()
+        text = metrics.to_prometheus()
+        self.assertIn('# TYPE country_state_city_call_seconds histogram', text)
+        self.assertIn('country_state_city_loads_total{table="states"} 1', text)
+        self.assertIn('country_state_city_call_seconds_bucket{method="State.get_states",le="+Inf"} 1',
+                      text)
+        self.assertIn('country_state_city_call_seconds_count{method="State.get_states"} 1', text)
@@ -0,0 +1,122 @@
+"""
+Tests for lazy query objects.
+"""
+
+import unittest
+from unittest import mock
+
+from country_state_city import City, Country, State
+from country_state_city.autocomplete import PrefixIndex
+from country_state_city.query import Query
+from tests import CITIES, DataDirTestCase
+
+
+class TestQuery(unittest.TestCase):
+    def test_immutable(self):
+        """Test that builder methods return new queries."""
+        base = State.query().country('US')
+        limited = base.limit(3)
+        self.assertIsNot(base, limited)
+        self.assertEqual(base.count(), len(State.get_states_of_country('US')))
+        self.assertEqual(limited.count(), 3)
+        self.assertEqual(base.count(), len(State.get_states_of_country('US')))
+
+    def test_matches_static_methods(self):
+        """Test that queries return what the static methods return."""
+        self.assertEqual(State.query().country('US').all(), State.get_states_of_country('US'))
+        self.assertEqual(State.query().all(), State.get_states())
+        self.assertEqual(Country.query().all(), Country.get_countries())
+        self.assertEqual(Country.query().country('IN').all(), [Country.get_country_by_code('IN')])
+        self.assertEqual(State.query().country('XX').all(), [])
+
+    def test_name_prefix(self):
+        """Test prefix filtering, ignoring case and accents."""
+        names = [s.iso_code for s in State.query().country('US').name_prefix('NEW').all()]
+        self.assertEqual(names, ['NH', 'NJ', 'NM', 'NY'])
+        self.assertEqual(State.query().country('US').name_prefix('new').count(), 4)
+        self.assertEqual(Country.query().country('US').name_prefix('united').count(), 1)
+        self.assertEqual(Country.query().country('US').name_prefix('india').count(), 0)
+
+    def test_name_prefix_limit(self):
+        """Test that the prefix index stops at the limit."""
+        original = PrefixIndex.search
+        with mock.patch.object(PrefixIndex, 'search', autospec=True, side_effect=original) as search:
+            self.assertEqual(State.query().name_prefix('new').limit(2).count(), 2)
+            self.assertEqual(search.call_args[0][2], 2)
+            names = [s.name for s in State.query().country('US').name_prefix('new').limit(2)]
+            self.assertEqual(names, ['New Hampshire', 'New Jersey'])
+            self.assertEqual(search.call_args[0][2], 2)
+            query = State.query().country('US').name_prefix('new').order_by('name', reverse=True)
+            self.assertEqual(query.first().name, 'New York')
+            self.assertIsNone(search.call_args[0][2])
+
+    def test_order_and_limit(self):
+        """Test that top-k results equal a full sort."""
+        states = State.get_states_of_country('IN')
+        for field, reverse in (('latitude', False), ('latitude', True), ('name', True), ('iso_code', False)):
+            present = [s for s in states if getattr(s, field) is not None]
+            missing = [s for s in states if getattr(s, field) is None]
+            expected = (sorted(present, key=lambda s: getattr(s, field), reverse=reverse) + missing)[:5]
+            query = State.query().country('IN').order_by(field, reverse=reverse).limit(5)
+            self.assertEqual(query.all(), expected)
+        self.assertEqual(State.query().order_by('name').first(), min(State.get_states(), key=lambda s: s.name))
+        self.assertEqual(State.query().country('IN').limit(0).all(), [])
+
+    def test_missing_values_last(self):
+        """Test that records missing the field come last in both directions."""
+        states = State.get_states_of_country('GH')
+        missing = [s for s in states if s.latitude is None]
+        self.assertTrue(missing)
+        for reverse in (False, True):
+            self.assertIsNotNone(State.query().order_by('latitude', reverse=reverse).first().latitude)
+            query = State.query().country('GH').order_by('latitude', reverse=reverse)
+            self.assertTrue(all(s.latitude is not None for s in query.limit(3)))
+            self.assertEqual(query.all()[-len(missing):], missing)
+            self.assertEqual(query.limit(len(states)).all(), query.all())
+
+    def test_where(self):
+        """Test that predicates combine with "and"."""
+        query = Country.query().where(lambda c: c.currency == 'EUR').where(lambda c: c.name.startswith('A'))
+        expected = [c for c in Country.get_countries() if c.currency == 'EUR' and c.name.startswith('A')]
+        self.assertEqual(query.all(), expected)
+        self.assertEqual(query.count(), len(expected))
+        self.assertTrue(query.exists())
+        self.assertFalse(query.where(lambda c: False).exists())
+
+    def test_invalid(self):
+        """Test that invalid queries are rejected."""
+        with self.assertRaises(ValueError):
+            Query('planet')
+        with self.assertRaises(ValueError):
+            State.query().state('CA')
+        with self.assertRaises(ValueError):
+            State.query().order_by('population')
+        with self.assertRaises(ValueError):
+            State.query().limit(-1)
+
+
+class TestCityQuery(DataDirTestCase):
+    CITIES = CITIES
+
+    def test_state_query(self):
+        """Test cities of a state read from a single shard."""
+        query = City.query().country('US').state('CA')
+        self.assertEqual([c.name for c in query.order_by('name')], ['Fresno', 'Oakland'])
+        self.assertEqual(query.name_prefix('oak').all(), City.get_cities_of_state('US', 'CA')[1:])
+        self.assertEqual(query.count(), 2)
+        self.assertFalse(self.registry.is_loaded('cities'))
+
+    def test_state_requires_country(self):
+        """Test that a state filter needs a country."""
+        with self.assertRaises(ValueError):
+            City.query().state('CA').all()
+
+    def test_whole_table(self):
+        """Test ordering cities of all countries."""
+        query = City.query().order_by('longitude', reverse=True).limit(2)
+        self.assertEqual([c.name for c in query], ['Pune', 'Mumbai'])
+        self.assertEqual(City.query().count(), len(CITIES))
+
+
+if __name__ == '__main__':
+    unittest.main()
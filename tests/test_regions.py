@@ -0,0 +1,147 @@
+"""
+Tests for point-in-region lookups.
+"""
+
+import json
+import os
+import random
+import unittest
+
+from country_state_city import State
+from country_state_city.regions import (
+    RegionIndex, _contains, boundary_path, get_region_index, locate, locate_many,
+)
+from tests import DataDirTestCase
+
+# Rough boxes with a hole cut out of the United States
+COUNTRIES = [
+    ({'isoCode': 'US'}, {
+        'type': 'Polygon',
+        'coordinates': [
+            [[-125, 24], [-66, 24], [-66, 50], [-125, 50], [-125, 24]],
+            [[-100, 40], [-98, 40], [-98, 42], [-100, 42], [-100, 40]],
+        ],
+    }),
+    ({'isoCode': 'CA'}, {
+        'type': 'MultiPolygon',
+        'coordinates': [
+            [[[-140, 50], [-52, 50], [-52, 70], [-140, 70], [-140, 50]]],
+            [[[-120, 72], [-80, 72], [-80, 80], [-120, 80], [-120, 72]]],
+        ],
+    }),
+]
+
+# California and Nevada sharing a diagonal border
+STATES = [
+    ({'countryCode': 'US', 'isoCode': 'CA'}, {
+        'type': 'Polygon',
+        'coordinates': [[
+            [-124.5, 42], [-120, 42], [-120, 39], [-114, 34.5],
+            [-114.5, 32.5], [-117, 32.5], [-124.5, 40], [-124.5, 42],
+        ]],
+    }),
+    ({'countryCode': 'US', 'isoCode': 'NV'}, {
+        'type': 'Polygon',
+        'coordinates': [[[-120, 42], [-114, 42], [-114, 34.5], [-120, 39], [-120, 42]]],
+    }),
+]
+
+
+def write_boundaries(data_dir, kind, features):
+    path = boundary_path(data_dir, kind)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'type': 'FeatureCollection',
+            'features': [
+                {'type': 'Feature', 'properties': properties, 'geometry': geometry}
+                for properties, geometry in features
+            ],
+        }, f)
+
+
+class TestRegions(DataDirTestCase):
+    USE_ARTIFACT = False
+
+    def setUp(self):
+        super().setUp()
+        self.random = random.Random(42)
+
+    def codes(self, location):
+        return (
+            location.country.iso2 if location.country else None,
+            location.state.iso_code if location.state else None,
+            location.exact,
+        )
+
+    def test_locate_with_boundaries(self):
+        """Test interior, border, hole and ocean points."""
+        write_boundaries(self.data_dir, 'country', COUNTRIES)
+        write_boundaries(self.data_dir, 'state', STATES)
+        self.assertEqual(self.codes(locate(36.17, -115.14)), ('US', 'NV', True))
+        self.assertEqual(self.codes(locate(38.58, -121.49)), ('US', 'CA', True))
+        # Either side of the diagonal from (-120, 39) to (-114, 34.5)
+        self.assertEqual(self.codes(locate(36.6, -117)), ('US', 'CA', True))
+        self.assertEqual(self.codes(locate(36.9, -117)), ('US', 'NV', True))
+        self.assertEqual(self.codes(locate(40.7, -74.0)), ('US', None, True))
+        self.assertEqual(self.codes(locate(41, -99)), (None, None, True))
+        self.assertEqual(self.codes(locate(75, -100)), ('CA', None, True))
+        self.assertEqual(self.codes(locate(0, 0)), (None, None, True))
+        self.assertEqual(self.codes(locate(91, 0)), (None, None, True))
+
+    def test_index_matches_polygon_test(self):
+        """Test grid lookups against a direct test of every polygon."""
+        write_boundaries(self.data_dir, 'state', STATES)
+        index = get_region_index('state')
+        self.assertEqual(len(index), 2)
+        for _ in range(2000):
+            latitude = self.random.uniform(32, 43)
+            longitude = self.random.uniform(-125, -113)
+            expected = [
+                record for record, rings in zip(index.records, index.rings)
+                if _contains(rings, longitude, latitude)
+            ]
+            self.assertEqual(index.lookup(latitude, longitude), (expected or [None])[0])
+
+    def test_locate_many(self):
+        """Test that batch results equal single lookups."""
+        write_boundaries(self.data_dir, 'country', COUNTRIES)
+        write_boundaries(self.data_dir, 'state', STATES)
+        latitudes = [self.random.uniform(20, 60) for _ in range(200)]
+        longitudes = [self.random.uniform(-130, -60) for _ in range(200)]
+        expected = [locate(lat, lon) for lat, lon in zip(latitudes, longitudes)]
+        self.assertEqual(locate_many(latitudes, longitudes), expected)
+        self.assertEqual(locate_many([], []), [])
+
+    def test_fallback_to_centroids(self):
+        """Test the nearest centroid fallback without boundary data."""
+        self.assertEqual(len(get_region_index('country')), 0)
+        location = locate(36.17, -115.14)
+        nearest = State.nearest(36.17, -115.14)[0].record
+        self.assertEqual(location.state, nearest)
+        self.assertEqual(location.country, nearest.country)
+        self.assertFalse(location.exact)
+
+    def test_fallback_within_country(self):
+        """Test that states fall back to centroids inside the located country."""
+        write_boundaries(self.data_dir, 'country', COUNTRIES)
+        location = locate(36.17, -115.14)
+        self.assertEqual(location.country.iso2, 'US')
+        self.assertEqual(location.state.country_code, 'US')
+        self.assertFalse(location.exact)
+        self.assertEqual(self.codes(locate(0, 0)), (None, None, True))
+
+    def test_unknown_kind(self):
+        """Test that only country and state boundaries exist."""
+        with self.assertRaises(ValueError):
+            get_region_index('city')
+
+    def test_empty_index(self):
+        """Test that an index without regions finds nothing."""
+        index = RegionIndex([])
+        self.assertEqual(len(index), 0)
+        self.assertIsNone(index.lookup(10, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
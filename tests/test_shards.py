@@ -0,0 +1,91 @@
+"""
+Tests for the sharded city dataset.
+"""
+
+import unittest
+
+from country_state_city import City, dataset, lookup_many, shards
+from tests import CITIES, DataDirTestCase
+
+
+class TestShards(DataDirTestCase):
+    CITIES = CITIES
+
+    def test_write_shards(self):
+        """Test that cities are split per country and sorted by state and name."""
+        self.assertEqual(self.counts, {'IN': 2, 'US': 3})
+        self.assertEqual(shards.shard_countries(self.data_dir), ['IN', 'US'])
+        names = [c['name'] for c in shards.iter_shard(shards.shard_path(self.data_dir, 'US'))]
+        self.assertEqual(names, ['Fresno', 'Oakland', 'Albany'])
+
+    def test_iter_cities(self):
+        """Test streaming cities by country and state."""
+        self.assertEqual([c.name for c in City.iter_cities('US', 'CA')], ['Fresno', 'Oakland'])
+        self.assertEqual(len(list(City.iter_cities('IN'))), 2)
+        self.assertEqual(len(list(City.iter_cities())), 5)
+        self.assertEqual(list(City.iter_cities('XX')), [])
+        self.assertEqual(list(City.iter_cities('../US')), [])
+        self.assertFalse(self.registry.is_loaded('cities'))
+
+    def test_iter_cities_stops_after_state(self):
+        """Test that reading a shard stops once the state has been passed."""
+        path = shards.shard_path(self.data_dir, 'US')
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('not json\n')
+        self.assertEqual([c['name'] for c in shards.iter_shard(path, 'CA')], ['Fresno', 'Oakland'])
+
+    def test_listing_loads_single_shard(self):
+        """Test that listings read only the shard of the requested country."""
+        cities = City.get_cities_of_state('US', 'CA')
+        self.assertEqual([c.name for c in cities], ['Fresno', 'Oakland'])
+        self.assertEqual(
+            [c.name for c in City.get_cities_of_country('US')], ['Albany', 'Fresno', 'Oakland']
+        )
+        self.assertTrue(self.registry.is_loaded(('cities', 'US')))
+        self.assertFalse(self.registry.is_loaded(('cities', 'IN')))
+        self.assertFalse(self.registry.is_loaded('cities'))
+        self.assertEqual(City.get_cities_of_country('XX'), [])
+
+    def test_get_city_by_name(self):
+        """Test case-insensitive city lookup within one shard."""
+        self.assertEqual(City.get_city_by_name('US', 'OAKLAND').state_code, 'CA')
+        self.assertEqual(City.get_city_by_name('IN', 'mumbai', 'MH').name, 'Mumbai')
+        self.assertIsNone(City.get_city_by_name('IN', 'mumbai', 'KA'))
+        self.assertIsNone(City.get_city_by_name('XX', 'mumbai'))
+        self.assertFalse(self.registry.is_loaded('cities'))
+
+    def test_nearest_city(self):
+        """Test reverse geocoding against the sharded cities."""
+        result = City.nearest(37.79, -122.25, k=2, country_code='US')
+        self.assertEqual([n.record.name for n in result], ['Oakland', 'Fresno'])
+        self.assertEqual(
+            [n.record.name for n in City.within_radius(19.0, 73.0, 200)], ['Mumbai', 'Pune']
+        )
+
+    def test_lookup_many_cities(self):
+        """Test batch city lookups by name."""
+        result = lookup_many('city', [('US', 'oakland'), ('IN', 'Pune', 'MH'), ('IN', 'Pune', 'KA')])
+        self.assertEqual([c and c.name for c in result], ['Oakland', 'Pune', None])
+
+    def test_get_cities(self):
+        """Test that the full table is assembled from every shard."""
+        self.assertEqual(len(City.get_cities()), 5)
+        self.assertEqual([c.name for c in City.get_cities_of_state('IN', 'MH')], ['Mumbai', 'Pune'])
+
+    def test_navigation(self):
+        """Test navigating from cities to their state and country and back."""
+        pune = City.get_city_by_name('IN', 'Pune')
+        self.assertEqual(pune.state.name, 'Maharashtra')
+        self.assertEqual(pune.country.iso2, 'IN')
+        self.assertIs(pune.state.country, pune.country)
+        self.assertEqual([c.name for c in pune.state.cities], ['Mumbai', 'Pune'])
+
+        # A reload replaces the parent tables; stale rows are re-resolved
+        state = pune.state
+        dataset.clear()
+        self.assertIsNot(pune.state, state)
+        self.assertEqual(pune.state.iso_code, 'MH')
+
+
+if __name__ == '__main__':
+    unittest.main()
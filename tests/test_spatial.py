@@ -0,0 +1,74 @@
+"""
+Tests for nearest-place and radius queries.
+"""
+
+import random
+import unittest
+
+from country_state_city import City, State
+from country_state_city.spatial import KDTree, haversine
+
+
+class TestSpatial(unittest.TestCase):
+    def setUp(self):
+        self.states = [s for s in State.get_states() if s.latitude is not None]
+        self.random = random.Random(42)
+
+    def brute_force(self, latitude, longitude, states):
+        return sorted(
+            (haversine(latitude, longitude, s.latitude, s.longitude), s.name) for s in states
+        )
+
+    def test_haversine(self):
+        """Test great-circle distances against known values."""
+        self.assertAlmostEqual(haversine(0, 0, 0, 1), 111.195, places=2)
+        self.assertAlmostEqual(haversine(51.5074, -0.1278, 48.8566, 2.3522), 343.5, delta=1)
+        self.assertEqual(haversine(10, 20, 10, 20), 0)
+
+    def test_nearest_state(self):
+        """Test that a point in San Francisco resolves to California."""
+        result = State.nearest(37.7749, -122.4194, country_code='US')
+        self.assertEqual(result[0].record.iso_code, 'CA')
+        self.assertGreater(result[0].distance, 0)
+
+    def test_nearest_matches_brute_force(self):
+        """Test k-nearest results against a linear scan."""
+        for _ in range(25):
+            latitude = self.random.uniform(-90, 90)
+            longitude = self.random.uniform(-180, 180)
+            expected = self.brute_force(latitude, longitude, self.states)[:5]
+            result = State.nearest(latitude, longitude, k=5)
+            self.assertEqual(len(result), 5)
+            for (distance, _), neighbor in zip(expected, result):
+                self.assertAlmostEqual(neighbor.distance, distance, places=6)
+
+    def test_within_radius_matches_brute_force(self):
+        """Test radius results against a linear scan."""
+        for _ in range(25):
+            latitude = self.random.uniform(-60, 70)
+            longitude = self.random.uniform(-180, 180)
+            expected = [d for d, _ in self.brute_force(latitude, longitude, self.states) if d <= 800]
+            result = State.within_radius(latitude, longitude, 800)
+            self.assertEqual(len(result), len(expected))
+            self.assertEqual(
+                [n.distance for n in result], sorted(n.distance for n in result)
+            )
+
+    def test_country_filter(self):
+        """Test restricting queries to one country."""
+        result = State.nearest(49.0, -123.0, k=3, country_code='US')
+        self.assertTrue(all(n.record.country_code == 'US' for n in result))
+        self.assertEqual(State.nearest(0, 0, country_code='XX'), [])
+
+    def test_tree_skips_missing_coordinates(self):
+        """Test that records without coordinates are not indexed."""
+        tree = KDTree([City('A', 'US', 'CA', '1.0', '1.0'), City('B', 'US', 'CA')])
+        self.assertEqual(len(tree), 1)
+        self.assertEqual(tree.nearest(0, 0, k=5)[0].record.name, 'A')
+        self.assertEqual(KDTree([]).nearest(0, 0), [])
+        self.assertEqual(tree.within_radius(0, 0, 10), [])
+        self.assertEqual(len(tree.within_radius(0, 0, 200)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
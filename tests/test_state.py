@@ -3,7 +3,7 @@ Tests for the State module.
 """
 
 import unittest
-from country_state_city import State
+from country_state_city import Country, State
 
 
 class TestState(unittest.TestCase):
@@ -94,6 +94,46 @@ class TestState(unittest.TestCase):
         self.assertIn('latitude', state_dict)
         self.assertIn('longitude', state_dict)
 
+    
+    def test_compact_representation(self):
+        """Test slotted storage, numeric coordinates and interned codes."""
+        california = State.get_state_by_code('US', 'CA')
+        self.assertFalse(hasattr(california, '__dict__'))
+        self.assertIsInstance(california.latitude, float)
+        self.assertIsInstance(california.longitude, float)
+        
+        texas = State.get_state_by_code('US', 'TX')
+        self.assertIs(california.country_code, texas.country_code)
+        
+        # Coordinates keep the data file format in to_dict
+        state = State.from_dict({'name': 'X', 'countryCode': 'US', 'isoCode': 'X',
+                                 'latitude': '36.77826100', 'longitude': None})
+        self.assertEqual(state.latitude, 36.778261)
+        self.assertEqual(state.to_dict()['latitude'], '36.77826100')
+        self.assertIsNone(state.to_dict()['longitude'])
+
+    
+    def test_get_state_by_name(self):
+        """Test case- and accent-insensitive lookup by name."""
+        self.assertEqual(State.get_state_by_name('US', 'california').iso_code, 'CA')
+        self.assertEqual(State.get_state_by_name('BR', 'Sao Paulo').name, 'São Paulo')
+        self.assertEqual(State.get_state_by_name('CH', 'CANTON OF ZURICH').name, 'canton of Zürich')
+        self.assertIsNone(State.get_state_by_name('CA', 'California'))
+        self.assertIsNone(State.get_state_by_name(None, 'California'))
+    
+    def test_navigation(self):
+        """Test parent and child navigation between states and countries."""
+        california = State.get_state_by_code('US', 'CA')
+        us = california.country
+        self.assertIs(us, Country.get_country_by_code('US'))
+        self.assertIs(california.country, us)
+        self.assertIn(california, us.states)
+        self.assertEqual(us.states, State.get_states_of_country('US'))
+        
+        orphan = State('Nowhere', 'XX', 'NW')
+        self.assertIsNone(orphan.country)
+        self.assertIsNone(orphan.country)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -82,6 +82,43 @@ class TestTimezone(unittest.TestCase):
         self.assertEqual(timezone.abbreviation, '')  # Default value
         self.assertEqual(timezone.tz_name, '')  # Default value
 
+    
+    def test_timezones_are_shared(self):
+        """Test that equal timezones of different countries are one object."""
+        zones = {}
+        for country in Country.get_countries():
+            for timezone in country.timezones:
+                key = tuple(timezone.to_dict().values())
+                self.assertIs(zones.setdefault(key, timezone), timezone)
+
+    def test_get_timezones(self):
+        """Test the deduplicated list of all zones."""
+        timezones = Timezone.get_timezones()
+        self.assertEqual(len(timezones), len({id(tz) for tz in timezones}))
+        self.assertEqual([tz.name for tz in timezones], sorted(tz.name for tz in timezones))
+        self.assertIn(self.usa.timezones[0], timezones)
+
+    def test_get_by_name(self):
+        """Test lookup of a zone by name."""
+        new_york = Timezone.get_by_name('America/New_York')
+        self.assertEqual(new_york.gmt_offset, -18000)
+        self.assertIn(new_york, self.usa.timezones)
+        self.assertIsNone(Timezone.get_by_name('Mars/Olympus_Mons'))
+
+    def test_get_countries_for_zone(self):
+        """Test the countries using a zone."""
+        self.assertEqual([c.iso2 for c in Timezone.get_countries_for_zone('America/New_York')], ['US'])
+        self.assertEqual(Timezone.get_countries_for_zone('Mars/Olympus_Mons'), [])
+
+    def test_get_by_offset_and_abbreviation(self):
+        """Test the offset and abbreviation indexes."""
+        by_offset = Timezone.get_by_offset(-18000)
+        self.assertIn(Timezone.get_by_name('America/New_York'), by_offset)
+        self.assertTrue(all(tz.gmt_offset == -18000 for tz in by_offset))
+        self.assertEqual(Timezone.get_by_offset(12345), [])
+        cet = Timezone.get_by_abbreviation('CET')
+        self.assertIn('Europe/Zurich', [tz.name for tz in cet])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
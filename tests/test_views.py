@@ -0,0 +1,67 @@
+"""
+Tests for the zero-copy record views.
+"""
+
+import unittest
+
+from country_state_city import views
+from country_state_city.binary import compile_dataset
+from tests import CITIES, DataDirTestCase
+
+
+class TestViews(DataDirTestCase):
+    def setUp(self):
+        super().setUp()
+        # The cities of US only
+        self.write_json('city.json', CITIES[:3])
+        compile_dataset(self.data_dir)
+
+    def test_views_match_models(self):
+        """Test that views expose the same data as materialized records."""
+        self.assertEqual(
+            [s.to_dict() for s in views.get_states_of_country('US')],
+            [s.to_dict() for s in self.registry.states.by_country['US']],
+        )
+        self.assertEqual(
+            [c.to_dict() for c in views.get_cities()],
+            [c.to_dict() for c in self.registry.cities.records],
+        )
+
+    def test_listing(self):
+        """Test sorted listings, lengths and slicing."""
+        cities = views.get_cities_of_state('US', 'CA')
+        self.assertEqual(len(cities), 2)
+        self.assertEqual([c.name for c in cities], ['Fresno', 'Oakland'])
+        self.assertEqual(cities[-1].state_code, 'CA')
+        self.assertEqual(len(views.get_cities_of_country('US')[:2]), 2)
+        self.assertEqual(views.get_states_of_country('US')[0].country_code, 'US')
+
+    def test_counting_does_not_load_tables(self):
+        """Test that views never materialize the model tables."""
+        self.assertEqual(len(views.get_cities_of_country('US')), 3)
+        self.assertFalse(self.registry.is_loaded('cities'))
+        self.assertFalse(self.registry.is_loaded('states'))
+
+    def test_missing_keys(self):
+        """Test empty results for unknown or empty codes."""
+        self.assertEqual(len(views.get_cities_of_state('US', 'XX')), 0)
+        self.assertEqual(len(views.get_cities_of_country(None)), 0)
+        self.assertEqual(list(views.get_states_of_country('')), [])
+
+    def test_view_identity(self):
+        """Test that views of the same row compare equal."""
+        first = views.get_cities_of_state('US', 'NY')[0]
+        second = views.get_cities_of_country('US')[0]
+        self.assertEqual(first, second)
+        self.assertEqual(len({first, second}), 1)
+
+    def test_requires_artifact(self):
+        """Test that views fail clearly without a compiled artifact."""
+        self.registry.use_artifact = False
+        self.registry.clear()
+        with self.assertRaises(FileNotFoundError):
+            views.get_states()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Tests for pre-fork warmup.
+"""
+
+import gc
+import os
+import unittest
+from unittest import mock
+
+from country_state_city import memory_usage, preload, shards
+from tests import CITIES, DataDirTestCase
+
+
+class TestWarmup(DataDirTestCase):
+
+    def test_preload_tables_and_indexes(self):
+        """Test that preload loads every table and builds the indexes."""
+        shards.write_shards(CITIES, self.data_dir)
+        self.assertEqual(preload(freeze=False), ['country', 'state', 'city'])
+        for name in ('countries', 'states', 'cities'):
+            self.assertTrue(self.registry.is_loaded(name))
+        keys = set(self.registry.states.indexes)
+        self.assertTrue({'names', 'positions', ('prefix', None), ('trigram', None),
+                         ('kdtree', None)} <= keys)
+        self.assertIn(('kdtree', None), self.registry.cities.indexes)
+
+    def test_preload_links_parents(self):
+        """Test that navigating to parents after preload writes nothing."""
+        shards.write_shards(CITIES, self.data_dir)
+        preload(indexes=False, freeze=False)
+        self.assertIsNone(self.registry.artifact)
+        with mock.patch('country_state_city.models.setattr', create=True, side_effect=AssertionError):
+            for state in self.registry.states.records:
+                state.country
+            for city in self.registry.cities.records:
+                self.assertEqual(city.state.iso_code, city.state_code)
+                self.assertEqual(city.country.iso2, city.country_code)
+
+    def test_preload_without_cities(self):
+        """Test that missing city data is skipped."""
+        self.assertEqual(preload(indexes=False, freeze=False), ['country', 'state'])
+        self.assertFalse(self.registry.is_loaded('cities'))
+        self.assertEqual(self.registry.states.indexes, {})
+
+    @unittest.skipUnless(hasattr(gc, 'freeze'), "gc.freeze requires Python 3.7")
+    def test_preload_freezes(self):
+        """Test that loaded objects are moved to the permanent generation."""
+        self.addCleanup(gc.unfreeze)
+        preload(indexes=False)
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+    @unittest.skipUnless(os.path.exists('/proc/self/smaps_rollup'), "requires smaps_rollup")
+    def test_memory_usage(self):
+        """Test the unique and shared memory report."""
+        usage = memory_usage()
+        self.assertEqual(set(usage), {'rss', 'pss', 'shared', 'uss'})
+        self.assertGreater(usage['uss'], 0)
+        self.assertLessEqual(usage['uss'], usage['rss'])
+        self.assertEqual(memory_usage(os.getpid())['rss'] > 0, True)
+
+    def test_memory_usage_unsupported(self):
+        """Test that platforms without smaps_rollup report None."""
+        with mock.patch('builtins.open', side_effect=OSError):
+            self.assertIsNone(memory_usage())